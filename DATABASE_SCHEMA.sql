@@ -54,6 +54,38 @@ CREATE TABLE IF NOT EXISTS query_history (
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB;
 
+-- Analysis Jobs Table (asynchronous AI analysis queue)
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    user_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    query_type VARCHAR(50) NOT NULL,
+    request JSON NOT NULL,
+    progress_completed INT NOT NULL DEFAULT 0,
+    progress_total INT NOT NULL DEFAULT 0,
+    attempts INT NOT NULL DEFAULT 0,
+    result JSON,
+    error VARCHAR(1000),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_user_id (user_id),
+    INDEX idx_status (status)
+) ENGINE=InnoDB;
+
+-- Precomputed Insights Table (latest background-computed insight per ticker)
+CREATE TABLE IF NOT EXISTS precomputed_insights (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    ticker VARCHAR(20) NOT NULL,
+    analysis_type VARCHAR(20) NOT NULL,
+    insight JSON NOT NULL,
+    inputs JSON,
+    computed_at TIMESTAMP NOT NULL,
+    UNIQUE KEY uq_precomputed_ticker_type (ticker, analysis_type),
+    INDEX idx_computed_at (computed_at)
+) ENGINE=InnoDB;
+
 -- Sample Data (Optional for testing)
 -- INSERT INTO users (email, username, hashed_password, full_name, is_active)
 -- VALUES
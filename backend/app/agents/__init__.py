@@ -1,9 +1,20 @@
 from .market_agent import market_agent, MarketDataAgent
 from .news_agent import news_agent, NewsAndSentimentAgent
+from .synthesis_agent import synthesis_agent, DecisionSynthesisAgent
+from .local_analyzer import local_analyzer, LocalAnalyzer
+from .assistant_pool import AssistantPool, PoolExhaustedError
+from .base import PooledLLMAgent
 
 __all__ = [
     "market_agent",
     "MarketDataAgent",
     "news_agent",
-    "NewsAndSentimentAgent"
+    "NewsAndSentimentAgent",
+    "synthesis_agent",
+    "DecisionSynthesisAgent",
+    "local_analyzer",
+    "LocalAnalyzer",
+    "AssistantPool",
+    "PoolExhaustedError",
+    "PooledLLMAgent"
 ]
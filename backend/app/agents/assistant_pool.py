@@ -0,0 +1,216 @@
+from typing import Any, Callable, Dict, Iterator, List
+from contextlib import contextmanager
+import asyncio
+import logging
+import threading
+import time
+
+from phi.assistant import Assistant
+
+from ..services.resilience import CapacityError
+
+logger = logging.getLogger(__name__)
+
+
+class PoolExhaustedError(CapacityError):
+    """Raised when no pooled assistant becomes free before the checkout timeout."""
+
+
+class AssistantPool:
+    """
+    Fixed-size pool of reusable phidata assistants.
+
+    An ``Assistant`` is not safe to share between concurrent runs, so each LLM
+    call checks one out exclusively and returns it when done. Assistants are
+    built on first demand up to ``size`` and reset on check-in, so no chat
+    history, LLM messages or metrics carry over from one request to the next.
+
+    Checkout blocks the calling (worker) thread, which is where phidata runs.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Assistant], size: int, checkout_timeout: float):
+        self.name = name
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._factory = factory
+        self._idle: List[Assistant] = []
+        self._created = 0
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+        # Utilization metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._peak_in_use = 0
+
+    @contextmanager
+    def checkout(self) -> Iterator[Assistant]:
+        """
+        Check out an assistant for the duration of the block.
+
+        Raises:
+            PoolExhaustedError: If none is free within the checkout timeout
+        """
+        assistant = self._acquire()
+        try:
+            yield assistant
+        finally:
+            self._release(assistant)
+
+    def _acquire(self) -> Assistant:
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        build = False
+
+        with self._condition:
+            waited = False
+            while not self._idle and self._created >= self.size:
+                waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolExhaustedError(
+                        f"No '{self.name}' assistant free within {self.checkout_timeout}s"
+                    )
+                self._condition.wait(remaining)
+
+            if self._idle:
+                assistant = self._idle.pop()
+            else:
+                # Reserve a slot now and build outside the lock
+                self._created += 1
+                build = True
+
+            wait = time.monotonic() - started
+            self._checkouts += 1
+            self._waits += int(waited)
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+        if build:
+            try:
+                assistant = self._factory()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+
+        return assistant
+
+    def _release(self, assistant: Assistant):
+        reusable = False
+        try:
+            self._reset(assistant)
+            reusable = True
+        except Exception as e:
+            logger.warning(f"Dropping '{self.name}' assistant that failed to reset: {e}")
+        finally:
+            with self._condition:
+                if reusable:
+                    self._idle.append(assistant)
+                else:
+                    self._created -= 1  # Frees the slot for a freshly built assistant
+                self._in_use -= 1
+                self._condition.notify()
+
+    def record_timeout(self):
+        """Count a call shed before it reached the pool."""
+        with self._condition:
+            self._timeouts += 1
+
+    def _reset(self, assistant: Assistant):
+        """Drop everything a run accumulated on the assistant."""
+        assistant.memory.chat_history = []
+        assistant.memory.llm_messages = []
+        assistant.memory.references = []
+        assistant.llm.metrics = {}
+        assistant.llm.function_call_stack = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and utilization counters."""
+        with self._condition:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "utilization": round(self._in_use / self.size, 3) if self.size else 0.0,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 2) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2)
+            }
+
+
+class ModelPools:
+    """
+    Assistant pools keyed by model, created on first use.
+
+    Callers on the event loop ``reserve`` an assistant before handing a call
+    to a worker thread, so the wait for a free assistant happens on the loop
+    and the thread's checkout never blocks.
+    """
+
+    def __init__(self, name: str, factory: Callable[[str], Assistant], size: int, checkout_timeout: float):
+        self.name = name
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._factory = factory
+        self._pools: Dict[str, AssistantPool] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    async def reserve(self, model: str) -> Callable[[], None]:
+        """
+        Reserve an assistant running ``model`` for one call.
+
+        Returns:
+            Function that gives the reservation back; call it once the
+            checkout that used it has ended
+
+        Raises:
+            PoolExhaustedError: If none is free within the checkout timeout
+        """
+        slots = self._slots.get(model)
+        if slots is None:
+            slots = self._slots[model] = asyncio.Semaphore(self.size)
+
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.checkout_timeout)
+        except asyncio.TimeoutError:
+            self._pool(model).record_timeout()
+            raise PoolExhaustedError(
+                f"No '{self.name}:{model}' assistant free within {self.checkout_timeout}s"
+            ) from None
+        return slots.release
+
+    def checkout(self, model: str):
+        """Check out an assistant running ``model`` (see AssistantPool.checkout)."""
+        return self._pool(model).checkout()
+
+    def _pool(self, model: str) -> AssistantPool:
+        with self._lock:
+            pool = self._pools.get(model)
+            if pool is None:
+                pool = AssistantPool(
+                    name=f"{self.name}:{model}",
+                    factory=lambda: self._factory(model),
+                    size=self.size,
+                    checkout_timeout=self.checkout_timeout
+                )
+                self._pools[model] = pool
+            return pool
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Utilization per model pool."""
+        with self._lock:
+            pools = dict(self._pools)
+        return {model: pool.stats() for model, pool in pools.items()}
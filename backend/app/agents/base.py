@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from phi.assistant import Assistant
+from phi.llm.base import LLM
+
+from ..core.config import settings
+from ..services.resilience import CircuitBreaker, call_with_deadline
+from ..services.model_router import model_router
+from ..services.admission import admission_controller
+from ..services.telemetry import AgentCall
+from .assistant_pool import ModelPools
+from .gemini import build_gemini
+
+# Blocking LLM calls get their own threads, so calls stalled past their
+# deadline cannot starve the default executor used by the rest of the app.
+# Admission keeps the calls in flight within ADMISSION_MAX_CONCURRENT.
+llm_executor = ThreadPoolExecutor(max_workers=settings.ADMISSION_MAX_CONCURRENT, thread_name_prefix="llm")
+
+
+class PooledLLMAgent:
+    """
+    Base for the LLM agents: one circuit breaker and per-model assistant pools.
+
+    Subclasses implement ``_build_assistant``. Prompts go through
+    ``_complete``, which applies admission control, the LLM deadline and the
+    breaker, and runs ``_run_prompt`` on a pooled assistant in a worker thread.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            name=name,
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_BREAKER_RESET_SECONDS
+        )
+        self.pools = ModelPools(
+            name=name,
+            factory=self._build_assistant,
+            size=settings.AGENT_POOL_SIZE,
+            checkout_timeout=settings.AGENT_POOL_CHECKOUT_TIMEOUT_SECONDS
+        )
+
+    def _build_llm(self, model: str) -> LLM:
+        """LLM backing an assistant."""
+        return build_gemini(model)
+
+    def _build_assistant(self, model: str) -> Assistant:
+        """Build an assistant for the pool."""
+        raise NotImplementedError
+
+    def _run_prompt(self, prompt: str, model: str, call: AgentCall) -> str:
+        """Run a prompt on a pooled assistant for ``model`` and return the full response text (blocking)."""
+        requested = time.monotonic()
+        with self.pools.checkout(model) as assistant:
+            started = time.monotonic()
+            try:
+                response = assistant.run(prompt[:settings.LLM_MAX_PROMPT_CHARS], stream=False)
+            finally:
+                elapsed = time.monotonic() - started
+                model_router.record(model, elapsed)
+            call.record_llm(model, started - requested, elapsed, assistant.llm.metrics)
+        return response if isinstance(response, str) else str(response)
+
+    async def _complete(self, prompt: str, model: str, call: AgentCall) -> str:
+        """
+        Response to ``prompt`` from ``model``.
+
+        The admission slot and an assistant reservation are taken on the event
+        loop before the call goes to a worker thread, and both are held until
+        that thread returns, even after a missed deadline, so they bound the
+        LLM calls really in flight.
+
+        Raises:
+            Exception: Whatever stopped the call (admission or pool timeout, open
+                breaker, deadline, LLM error); agents fall back to local analysis
+        """
+        release_admission = await admission_controller.acquire()
+        try:
+            release_assistant = await self.pools.reserve(model)
+        except BaseException:
+            release_admission()
+            raise
+
+        def finished():
+            release_assistant()
+            release_admission()
+
+        return await call_with_deadline(
+            self.breaker,
+            self._run_prompt,
+            prompt,
+            model,
+            call,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            executor=llm_executor,
+            on_finished=finished
+        )
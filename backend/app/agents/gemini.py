@@ -0,0 +1,34 @@
+import threading
+
+import google.generativeai as genai
+from phi.llm.google import Gemini
+
+from ..core.config import settings
+
+_configure_lock = threading.Lock()
+_endpoint_configured = False
+
+
+def build_gemini(model: str) -> Gemini:
+    """
+    Gemini LLM for an agent assistant.
+
+    When GEMINI_API_ENDPOINT is set, requests go over REST to that host (for
+    example a local stand-in server). phidata calls ``genai.configure`` with
+    default options when it creates its own client, so a pre-built client is
+    handed to it instead.
+    """
+    if not settings.GEMINI_API_ENDPOINT:
+        return Gemini(model=model)
+
+    global _endpoint_configured
+    with _configure_lock:
+        if not _endpoint_configured:
+            genai.configure(
+                api_key=settings.GEMINI_API_KEY,
+                transport="rest",
+                client_options={"api_endpoint": settings.GEMINI_API_ENDPOINT}
+            )
+            _endpoint_configured = True
+
+    return Gemini(model=model, gemini_client=genai.GenerativeModel(model_name=model))
@@ -0,0 +1,194 @@
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from ..services.sentiment import score_articles
+
+logger = logging.getLogger(__name__)
+
+
+class LocalAnalyzer:
+    """
+    Deterministic, LLM-free analyzer used when the AI agents are unavailable.
+
+    Produces results in the same shape as the market and news agents from the
+    same inputs, flagged with ``degraded: True``.
+    """
+
+    def assess_risk(self, change_percent: float, volatility_pct: float) -> Tuple[str, str]:
+        """
+        Classify risk from daily change and intraday volatility.
+
+        Returns:
+            Tuple of (risk_level, risk_note)
+        """
+        if abs(change_percent) > 5 or volatility_pct > 5:
+            return "high", "High volatility detected. Consider careful position sizing."
+        elif abs(change_percent) > 2 or volatility_pct > 3:
+            return "medium", "Moderate price movement. Monitor closely."
+        else:
+            return "low", "Stable price action within normal range."
+
+    def analyze_price_action(
+        self,
+        ticker: str,
+        price_data: Dict[str, Any],
+        reason: str = "AI analysis unavailable"
+    ) -> Dict[str, Any]:
+        """
+        Compute trend, volatility and risk level from a price snapshot.
+
+        Args:
+            ticker: Stock ticker symbol
+            price_data: Current price data (as passed to the market agent)
+            reason: Why the local analyzer is being used
+
+        Returns:
+            Analysis results in the market agent's format
+        """
+        price = float(price_data.get("current_price") or 0)
+        open_price = float(price_data.get("open") or 0)
+        high = float(price_data.get("high") or 0)
+        low = float(price_data.get("low") or 0)
+        change_percent = float(price_data.get("change_percent") or 0)
+
+        volatility_pct = ((high - low) / open_price * 100) if open_price > 0 else 0.0
+        range_position = ((price - low) / (high - low)) if high > low else 0.5
+
+        if change_percent > 0.25 and price >= open_price:
+            trend = "bullish"
+        elif change_percent < -0.25 and price <= open_price:
+            trend = "bearish"
+        else:
+            trend = "neutral"
+
+        risk_level, risk_note = self.assess_risk(change_percent, volatility_pct)
+
+        analysis = (
+            f"**Local analysis for {ticker}** (AI analysis unavailable: {reason})\n\n"
+            f"- Price Trend: {trend.title()} ({change_percent:+.2f}% on the day, "
+            f"{'above' if price >= open_price else 'below'} the open of ${open_price:.2f})\n"
+            f"- Intraday Volatility: {volatility_pct:.2f}% range (${low:.2f} - ${high:.2f})\n"
+            f"- Range Position: trading at {range_position * 100:.0f}% of today's range\n"
+            f"- Risk Level: {risk_level.upper()} - {risk_note}"
+        )
+
+        return {
+            "agent_name": "Market Data Agent",
+            "ticker": ticker,
+            "analysis": analysis,
+            "confidence": 0.4,
+            "data_points_analyzed": len(price_data),
+            "reasoning": "Deterministic price, range and volatility rules (LLM fallback)",
+            "trend": trend,
+            "risk_level": risk_level,
+            "degraded": True
+        }
+
+    def analyze_news_sentiment(
+        self,
+        ticker: str,
+        articles: List[Dict[str, Any]],
+        reason: str = "AI analysis unavailable"
+    ) -> Dict[str, Any]:
+        """
+        Score news sentiment with the lexicon model.
+
+        Args:
+            ticker: Stock ticker symbol
+            articles: Articles that would have been sent to the news agent
+            reason: Why the local analyzer is being used
+
+        Returns:
+            Sentiment analysis in the news agent's format
+        """
+        scores = score_articles(articles)
+        average = sum(scores) / len(scores) if scores else 0.0
+
+        if average > 0.15:
+            sentiment = "bullish"
+        elif average < -0.15:
+            sentiment = "bearish"
+        else:
+            sentiment = "neutral"
+
+        positive = sum(1 for s in scores if s > 0)
+        negative = sum(1 for s in scores if s < 0)
+
+        summary = (
+            f"**Local sentiment for {ticker}** (AI analysis unavailable: {reason})\n\n"
+            f"- Overall Sentiment: {sentiment.title()} (lexicon score {average:+.2f})\n"
+            f"- Positive articles: {positive}, negative: {negative}, "
+            f"neutral: {len(scores) - positive - negative}"
+        )
+
+        return {
+            "agent_name": "News & Sentiment Agent",
+            "ticker": ticker,
+            "sentiment": sentiment,
+            "confidence": 0.35 if scores else 0.2,
+            "summary": summary,
+            "article_count": len(articles),
+            "reasoning": "Keyword lexicon scoring of recent headlines (LLM fallback)",
+            "degraded": True
+        }
+
+    def synthesize(
+        self,
+        ticker: str,
+        market: Optional[Dict[str, Any]],
+        news: Optional[Dict[str, Any]],
+        reason: str = "AI analysis unavailable"
+    ) -> Dict[str, Any]:
+        """
+        Combine price direction and news sentiment by simple voting.
+
+        Args:
+            ticker: Stock ticker symbol
+            market: Market analysis inputs (change_percent, risk_level), if available
+            news: News analysis inputs (sentiment), if available
+            reason: Why the local analyzer is being used
+
+        Returns:
+            Synthesis in the synthesis agent's format
+        """
+        signals = {"bullish": 1, "bearish": -1}
+        votes = []
+        lines = []
+
+        if market:
+            change_percent = float(market.get("change_percent") or 0)
+            price_signal = "bullish" if change_percent > 0.25 else "bearish" if change_percent < -0.25 else "neutral"
+            votes.append(signals.get(price_signal, 0))
+            lines.append(
+                f"- Price Action: {price_signal.title()} ({change_percent:+.2f}%), "
+                f"risk {str(market.get('risk_level', 'unknown')).upper()}"
+            )
+        if news:
+            sentiment = str(news.get("sentiment", "neutral")).lower()
+            votes.append(signals.get(sentiment, 0))
+            lines.append(f"- News Sentiment: {sentiment.title()} ({news.get('article_count', 0)} articles)")
+
+        total = sum(votes)
+        stance = "bullish" if total > 0 else "bearish" if total < 0 else "neutral"
+        agreement = len(votes) == 2 and votes[0] == votes[1] and votes[0] != 0
+
+        analysis = (
+            f"**Local synthesis for {ticker}** (AI analysis unavailable: {reason})\n\n"
+            + "\n".join(lines or ["- No market or news analysis available"])
+            + f"\n- Overall Stance: {stance.title()}"
+            + (" (price and news agree)" if agreement else "")
+        )
+
+        return {
+            "agent_name": "Decision Synthesis Agent",
+            "ticker": ticker,
+            "stance": stance,
+            "analysis": analysis,
+            "confidence": 0.45 if agreement else 0.3,
+            "reasoning": "Vote of price direction and news sentiment (LLM fallback)",
+            "degraded": True
+        }
+
+
+# Global instance
+local_analyzer = LocalAnalyzer()
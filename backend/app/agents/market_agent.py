@@ -1,26 +1,33 @@
 from typing import Dict, Any, List
 import logging
-import os
 
 from phi.assistant import Assistant
-from phi.llm.google import Gemini
 
-from ..core.config import settings
 from ..services.stock_stream import stock_stream_manager
+from ..services.model_router import model_router
+from ..services.telemetry import telemetry
+from .base import PooledLLMAgent
+from .local_analyzer import local_analyzer
 
 logger = logging.getLogger(__name__)
 
-# Set environment variable for Google Generativeai library
-os.environ['GOOGLE_API_KEY'] = settings.GEMINI_API_KEY
 
-
-class MarketDataAgent:
+class MarketDataAgent(PooledLLMAgent):
     """Agent for analyzing market data and price movements."""
 
     def __init__(self):
-        self.agent = Assistant(
+        super().__init__("market_agent")
+
+    def _build_assistant(self, model: str) -> Assistant:
+        """
+        Build an assistant for the pool.
+
+        phidata keeps chat history and LLM messages on the Assistant; the pool
+        resets them on check-in and history is never replayed into prompts.
+        """
+        return Assistant(
             name="Comprehensive Market Analyst",
-            llm=Gemini(model="gemini-2.0-flash-exp"),
+            llm=self._build_llm(model),
             description="Expert in comprehensive stock analysis including price action, technical indicators, volume analysis, and risk assessment",
             instructions=[
                 "Provide DETAILED analysis with specific insights and actionable information",
@@ -34,7 +41,11 @@ class MarketDataAgent:
                 "Focus on factual, data-driven analysis with comprehensive reasoning"
             ],
             markdown=True,
-            show_tool_calls=False
+            show_tool_calls=False,
+            # Never replay earlier runs into the prompt
+            add_chat_history_to_messages=False,
+            add_chat_history_to_prompt=False,
+            read_chat_history=False
         )
 
     async def analyze_price_action(
@@ -73,17 +84,17 @@ Provide a concise technical analysis including:
 Keep your response structured and under 200 words.
 """
 
-            response = self.agent.run(prompt)
+            model = model_router.select_model()
+            call = telemetry.agent_call("market_agent", ticker)
+            try:
+                response_text = await self._complete(prompt, model, call)
+            except Exception as e:
+                call.finish(error=e)
+                reason = type(e).__name__
+                logger.warning(f"Market agent LLM unavailable for {ticker} ({reason}), using local analysis")
+                return local_analyzer.analyze_price_action(ticker, price_data, reason=reason)
 
-            # Get response content (handle generator)
-            response_text = ""
-            if hasattr(response, 'content'):
-                response_text = response.content
-            else:
-                # Response is a generator, collect all chunks
-                for chunk in response:
-                    if hasattr(chunk, 'content'):
-                        response_text += chunk.content
+            call.finish()
 
             # Extract confidence from response or default
             confidence = self._extract_confidence(response_text)
@@ -94,7 +105,8 @@ Keep your response structured and under 200 words.
                 "analysis": response_text,
                 "confidence": confidence,
                 "data_points_analyzed": len(price_data),
-                "reasoning": "Technical analysis based on price, volume, and trend patterns"
+                "reasoning": "Technical analysis based on price, volume, and trend patterns",
+                "model": model
             }
 
         except Exception as e:
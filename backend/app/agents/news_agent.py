@@ -1,26 +1,105 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
-import os
+import re
 
 from phi.assistant import Assistant
-from phi.llm.google import Gemini
 
 from ..core.config import settings
 from ..services.news_service import news_service
+from ..services.sentiment import score_articles
+from ..services.article_clustering import ArticleCluster, article_fingerprint, cluster_articles, pack_clusters
+from ..services.model_router import model_router
+from ..services.telemetry import telemetry
+from .base import PooledLLMAgent
+from .local_analyzer import local_analyzer
 
 logger = logging.getLogger(__name__)
 
-# Set environment variable for Google Generativeai library
-os.environ['GOOGLE_API_KEY'] = settings.GEMINI_API_KEY
 
+# "SCORE <n>: <value>" lines requested from the LLM for per-article sentiment
+_SCORE_LINE = re.compile(r'^[\s*\-]*score\s*#?(\d+)\s*[:=]\s*\**\s*([+-]?\d*\.?\d+).*$', re.IGNORECASE | re.MULTILINE)
 
-class NewsAndSentimentAgent:
+
+def _parse_published_at(value: Optional[str]) -> datetime:
+    """Parse an ISO-8601 publish time, defaulting to now when missing or malformed."""
+    if value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+class TickerSentimentState:
+    """Per-ticker incremental sentiment: seen articles, their scores and the latest summary."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()  # Held only while reading or merging state, never across an LLM call
+        self.analyzing: Optional[asyncio.Future] = None  # Set while one request analyzes new articles
+        self.articles: Dict[str, Tuple[float, datetime]] = {}  # fingerprint -> (score, published_at)
+        self.summary: str = ""
+        self.summary_articles: int = 0  # Articles the summary was written from (the newest ones)
+        self.confidence: float = 0.65
+        self.model: Optional[str] = None  # Model that wrote the summary
+
+    def add(self, article: Dict[str, Any], score: float):
+        published_at = _parse_published_at(article.get("published_at") or article.get("publishedAt"))
+        self.articles[article_fingerprint(article)] = (score, published_at)
+
+    def prune(self, cutoff: datetime):
+        """Forget articles published before the look-back window."""
+        self.articles = {fp: entry for fp, entry in self.articles.items() if entry[1] >= cutoff}
+
+    def trim(self, max_articles: int):
+        """Keep only the most recently published articles."""
+        if len(self.articles) > max_articles:
+            newest = sorted(self.articles.items(), key=lambda item: item[1][1], reverse=True)[:max_articles]
+            self.articles = dict(newest)
+
+    def aggregate(self, now: datetime, half_life_hours: float) -> float:
+        """Exponentially time-decayed mean score (newer articles weigh more)."""
+        weighted_sum = 0.0
+        total_weight = 0.0
+        for score, published_at in self.articles.values():
+            age_hours = max((now - published_at).total_seconds() / 3600, 0.0)
+            weight = 0.5 ** (age_hours / half_life_hours)
+            weighted_sum += weight * score
+            total_weight += weight
+        return weighted_sum / total_weight if total_weight else 0.0
+
+
+class NewsAndSentimentAgent(PooledLLMAgent):
     """Agent for analyzing news and market sentiment."""
 
     def __init__(self):
-        self.agent = Assistant(
+        super().__init__("news_agent")
+        self._sentiment_state: "OrderedDict[str, TickerSentimentState]" = OrderedDict()
+
+    def _state_for(self, ticker: str) -> TickerSentimentState:
+        """A ticker's sentiment state; the least recently used beyond NEWS_SENTIMENT_MAX_TICKERS are dropped."""
+        state = self._sentiment_state.get(ticker)
+        if state is None:
+            state = self._sentiment_state[ticker] = TickerSentimentState()
+            while len(self._sentiment_state) > settings.NEWS_SENTIMENT_MAX_TICKERS:
+                self._sentiment_state.popitem(last=False)
+        else:
+            self._sentiment_state.move_to_end(ticker)
+        return state
+
+    def _build_assistant(self, model: str) -> Assistant:
+        """
+        Build an assistant for the pool.
+
+        phidata keeps chat history and LLM messages on the Assistant; the pool
+        resets them on check-in and history is never replayed into prompts.
+        """
+        return Assistant(
             name="News & Sentiment Analyst",
-            llm=Gemini(model="gemini-2.0-flash-exp"),
+            llm=self._build_llm(model),
             description="Specialized in analyzing financial news and market sentiment",
             instructions=[
                 "Provide COMPREHENSIVE news sentiment analysis with detailed insights",
@@ -35,42 +114,134 @@ class NewsAndSentimentAgent:
                 "Use clear, professional language with specific examples"
             ],
             markdown=True,
-            show_tool_calls=False
+            show_tool_calls=False,
+            # Never replay earlier runs into the prompt
+            add_chat_history_to_messages=False,
+            add_chat_history_to_prompt=False,
+            read_chat_history=False
         )
 
     async def analyze_news_sentiment(
         self,
         ticker: str,
-        days_back: int = 7
+        days_back: int = 7,
+        articles: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Analyze news sentiment for a ticker.
 
+        Sentiment is maintained incrementally per ticker: only articles not seen
+        on a previous run are sent to the LLM, their per-article scores are merged
+        into the ticker's state, and the reported sentiment is the time-decayed
+        aggregate over every article still inside the look-back window.
+
         Args:
             ticker: Stock ticker symbol
             days_back: Number of days to look back for news
+            articles: Already-fetched articles for the ticker (fetched when omitted)
 
         Returns:
             Sentiment analysis with key insights
         """
         try:
-            articles = await news_service.get_stock_news(ticker, days_back=days_back, max_articles=15)
+            return await self._analyze_incremental(ticker, days_back, articles)
 
-            if not articles:
-                return {
-                    "agent_name": "News & Sentiment Agent",
-                    "ticker": ticker,
-                    "sentiment": "neutral",
-                    "confidence": 0.3,
-                    "summary": "Insufficient news data for analysis",
-                    "article_count": 0
-                }
+        except Exception as e:
+            logger.error(f"News agent analysis error for {ticker}: {e}")
+            return {
+                "agent_name": "News & Sentiment Agent",
+                "ticker": ticker,
+                "sentiment": "neutral",
+                "confidence": 0.0,
+                "summary": f"Unable to perform analysis: {str(e)[:100]}",
+                "article_count": 0,
+                "reasoning": "Analysis failed due to an internal error",
+                "error": str(e)
+            }
 
-            # Prepare news summary for agent
-            news_summary = self._prepare_news_summary(articles)
+    async def _analyze_incremental(
+        self,
+        ticker: str,
+        days_back: int,
+        articles: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch news, analyze only unseen articles and update the ticker's state.
 
-            prompt = f"""
-Analyze the following recent news articles for {ticker}:
+        The state lock is taken to snapshot what was already seen and again to
+        merge the new scores, not around the LLM call. One request at a time
+        analyzes a ticker's new articles: a concurrent request waits for that
+        merge and then only sends what is still unseen, so the same articles
+        are never sent to the LLM twice.
+        """
+        now = datetime.now(timezone.utc)
+        state = self._state_for(ticker)
+
+        if articles is None:
+            articles = await news_service.get_ticker_news(ticker, days_back=days_back, max_articles=15)
+
+        while True:
+            async with state.lock:
+                state.prune(now - timedelta(days=days_back))
+                seen = set(state.articles)
+                known_articles = len(state.articles)
+                previous_score = state.aggregate(now, settings.NEWS_SENTIMENT_HALF_LIFE_HOURS)
+                new_articles = [a for a in articles if article_fingerprint(a) not in seen]
+                analyzing = state.analyzing
+                if new_articles and analyzing is None:
+                    state.analyzing = asyncio.get_running_loop().create_future()
+            if not new_articles or analyzing is None:
+                break
+            await asyncio.shield(analyzing)
+
+        if not articles and not known_articles:
+            return {
+                "agent_name": "News & Sentiment Agent",
+                "ticker": ticker,
+                "sentiment": "neutral",
+                "confidence": 0.3,
+                "summary": "Insufficient news data for analysis",
+                "article_count": 0,
+                "reasoning": "No recent news articles found"
+            }
+
+        if new_articles:
+            try:
+                return await self._analyze_new_articles(
+                    ticker, state, now, articles, new_articles, known_articles, previous_score
+                )
+            finally:
+                analyzing, state.analyzing = state.analyzing, None
+                analyzing.set_result(None)
+
+        logger.info(f"No new articles for {ticker}, serving incremental sentiment state")
+        telemetry.cache_hit("news_agent", ticker)
+        async with state.lock:
+            return self._state_result(ticker, state, now, 0)
+
+    async def _analyze_new_articles(
+        self,
+        ticker: str,
+        state: TickerSentimentState,
+        now: datetime,
+        articles: List[Dict[str, Any]],
+        new_articles: List[Dict[str, Any]],
+        known_articles: int,
+        previous_score: float
+    ) -> Dict[str, Any]:
+        """Send unseen articles to the LLM and merge their scores into the ticker's state."""
+        # Prepare news summary for agent
+        news_summary, packed_clusters = self._prepare_news_summary(new_articles)
+
+        previous = ""
+        if known_articles:
+            previous = (
+                f"Sentiment from {known_articles} earlier articles: "
+                f"{self._label_for_score(previous_score)} (score {previous_score:+.2f}).\n\n"
+            )
+
+        prompt = f"""
+{previous}Analyze the following new news articles for {ticker}:
 
 {news_summary}
 
@@ -82,71 +253,117 @@ Provide a sentiment analysis including:
 5. Notable concerns or opportunities
 
 Keep your response concise and actionable (under 250 words).
+Finish with one line per numbered article in the form "SCORE <number>: <sentiment from -1 to 1>".
 """
 
-            response = self.agent.run(prompt)
-
-            # Get response content (handle generator)
-            response_text = ""
-            if hasattr(response, 'content'):
-                response_text = response.content
-            else:
-                # Response is a generator, collect all chunks
-                for chunk in response:
-                    if hasattr(chunk, 'content'):
-                        response_text += chunk.content
-
-            sentiment = self._extract_sentiment(response_text)
-            confidence = self._extract_confidence(response_text)
+        model = model_router.select_model()
+        call = telemetry.agent_call("news_agent", ticker)
+        try:
+            response_text = await self._complete(prompt, model, call)
+        except Exception as e:
+            call.finish(error=e)
+            reason = type(e).__name__
+            logger.warning(f"News agent LLM unavailable for {ticker} ({reason}), using local sentiment")
+            return local_analyzer.analyze_news_sentiment(ticker, articles, reason=reason)
+
+        call.finish()
+
+        scores: List[Tuple[Dict[str, Any], float]] = []
+        llm_scores = self._extract_article_scores(response_text)
+        scored_by_llm = set()
+        for position, cluster in enumerate(packed_clusters, 1):
+            if position in llm_scores:
+                for article in cluster.members:
+                    scores.append((article, llm_scores[position]))
+                    scored_by_llm.add(article_fingerprint(article))
+
+        # Articles the LLM did not score (over budget or unparsed) get lexicon scores
+        unscored = [article for article in new_articles if article_fingerprint(article) not in scored_by_llm]
+        scores.extend(zip(unscored, score_articles(unscored)))
+
+        async with state.lock:
+            for article, article_score in scores:
+                state.add(article, article_score)
+            state.trim(settings.NEWS_SENTIMENT_MAX_ARTICLES)
+            state.summary = _SCORE_LINE.sub("", response_text).strip()
+            state.summary_articles = len(new_articles)
+            state.confidence = self._extract_confidence(response_text)
+            state.model = model
+            return self._state_result(ticker, state, now, len(new_articles))
+
+    def _state_result(self, ticker: str, state: TickerSentimentState, now: datetime, new_articles: int) -> Dict[str, Any]:
+        """Agent result from a ticker's sentiment state."""
+        score = state.aggregate(now, settings.NEWS_SENTIMENT_HALF_LIFE_HOURS)
+        summary = state.summary
+        if summary and state.summary_articles < len(state.articles):
+            # The summary only covers the newest articles; lead with the aggregate it is part of
+            summary = (
+                f"Overall sentiment across {len(state.articles)} recent articles: "
+                f"{self._label_for_score(score)} (score {score:+.2f}). "
+                f"Analysis of the {state.summary_articles} newest:\n\n{summary}"
+            )
+
+        return {
+            "agent_name": "News & Sentiment Agent",
+            "ticker": ticker,
+            "sentiment": self._label_for_score(score),
+            "sentiment_score": round(score, 4),
+            "confidence": state.confidence,
+            "summary": summary,
+            "article_count": len(state.articles),
+            "new_article_count": new_articles,
+            "reasoning": "Time-decayed aggregate of per-article sentiment from recent news",
+            "model": state.model
+        }
+
+    def _prepare_news_summary(self, articles: List[Dict[str, Any]]) -> Tuple[str, List[ArticleCluster]]:
+        """
+        Prepare a concise summary of articles for the agent.
 
-            return {
-                "agent_name": "News & Sentiment Agent",
-                "ticker": ticker,
-                "sentiment": sentiment,
-                "confidence": confidence,
-                "summary": response_text,
-                "article_count": len(articles),
-                "reasoning": "Analysis based on recent news articles and market narratives"
-            }
+        Near-duplicate (syndicated) articles are collapsed into one entry with a
+        source count, and distinct stories are packed up to the prompt token budget.
 
-        except Exception as e:
-            logger.error(f"News agent analysis error for {ticker}: {e}")
-            return {
-                "agent_name": "News & Sentiment Agent",
-                "ticker": ticker,
-                "sentiment": "neutral",
-                "confidence": 0.0,
-                "error": str(e)
-            }
+        Returns:
+            Tuple of (prompt text, clusters in numbered order)
+        """
+        clusters = cluster_articles(articles)
 
-    def _prepare_news_summary(self, articles: List[Dict[str, Any]]) -> str:
-        """Prepare a concise summary of articles for the agent."""
-        summaries = []
+        def render(position: int, cluster: ArticleCluster) -> str:
+            article = cluster.representative
+            title = article.get("title") or ""
+            description = article.get("description") or ""
+            sources = cluster.sources
 
-        for i, article in enumerate(articles[:10], 1):
-            title = article.get("title", "")
-            description = article.get("description", "")
-            source = article.get("source", "Unknown")
+            entry = f"{position}. [{sources[0]}] {title}"
+            if len(sources) > 1:
+                entry += f" (reported by {len(sources)} sources: {', '.join(sources[:5])})"
+            return f"{entry}\n   {description[:150]}..."
 
-            summaries.append(f"{i}. [{source}] {title}\n   {description[:150]}...")
+        packed = pack_clusters(clusters, settings.NEWS_PROMPT_TOKEN_BUDGET, render)
 
-        return "\n\n".join(summaries)
+        return "\n\n".join(entry for _, entry in packed), [cluster for cluster, _ in packed]
 
-    def _extract_sentiment(self, text: str) -> str:
-        """Extract sentiment label from agent response."""
-        text_lower = text.lower()
+    def _extract_article_scores(self, text: str) -> Dict[int, float]:
+        """Extract "SCORE <n>: <value>" lines from the agent response."""
+        scores = {}
+        for number, value in _SCORE_LINE.findall(text):
+            try:
+                scores[int(number)] = max(-1.0, min(1.0, float(value)))
+            except ValueError:
+                continue
+        return scores
 
-        if "bullish" in text_lower or "positive" in text_lower:
+    def _label_for_score(self, score: float) -> str:
+        """Map an aggregate sentiment score to a label."""
+        if score > 0.15:
             return "bullish"
-        elif "bearish" in text_lower or "negative" in text_lower:
+        elif score < -0.15:
             return "bearish"
         else:
             return "neutral"
 
     def _extract_confidence(self, text: str) -> float:
         """Extract confidence score from agent response."""
-        import re
-
         confidence_pattern = r'confidence[:\s]+([0-9.]+)'
         match = re.search(confidence_pattern, text.lower())
 
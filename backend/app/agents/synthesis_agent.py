@@ -0,0 +1,136 @@
+from typing import Dict, Any, Optional
+import logging
+import re
+
+from phi.assistant import Assistant
+
+from ..services.model_router import model_router
+from ..services.telemetry import telemetry
+from .base import PooledLLMAgent
+from .local_analyzer import local_analyzer
+
+logger = logging.getLogger(__name__)
+
+
+class DecisionSynthesisAgent(PooledLLMAgent):
+    """Agent combining market and news analyses into one decision view."""
+
+    def __init__(self):
+        super().__init__("synthesis_agent")
+
+    def _build_assistant(self, model: str) -> Assistant:
+        """Build an assistant for the pool."""
+        return Assistant(
+            name="Decision Synthesis Analyst",
+            llm=self._build_llm(model),
+            description="Combines technical and news-driven analysis into a single investment view",
+            instructions=[
+                "Weigh price action against news sentiment and call out where they disagree",
+                "State an overall stance (bullish, bearish or neutral) with the main reasons",
+                "Summarize the key risks and what would change the view",
+                "Be concise, specific and data-driven"
+            ],
+            markdown=True,
+            show_tool_calls=False,
+            # Never replay earlier runs into the prompt
+            add_chat_history_to_messages=False,
+            add_chat_history_to_prompt=False,
+            read_chat_history=False
+        )
+
+    async def synthesize(
+        self,
+        ticker: str,
+        market: Optional[Dict[str, Any]],
+        news: Optional[Dict[str, Any]],
+        focus: str = "decision"
+    ) -> Dict[str, Any]:
+        """
+        Synthesize market and news analyses for a ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            market: Market analysis (summary, risk_level, change_percent, trend), if available
+            news: News analysis (summary, sentiment, article_count), if available
+            focus: "decision" for an overall stance, "risk" for a risk assessment
+
+        Returns:
+            Synthesis with stance, confidence and analysis text
+        """
+        sections = []
+        if market:
+            sections.append(
+                f"TECHNICAL ANALYSIS (risk level {market.get('risk_level', 'unknown')}, "
+                f"day change {market.get('change_percent', 0):+.2f}%):\n{market.get('summary', '')[:1500]}"
+            )
+        if news:
+            sections.append(
+                f"NEWS SENTIMENT ({news.get('sentiment', 'neutral')}, "
+                f"{news.get('article_count', 0)} articles):\n{news.get('summary', '')[:1500]}"
+            )
+
+        if focus == "risk":
+            task = """Provide a risk assessment including:
+1. Overall risk level (low/medium/high) and why
+2. Price-driven risks
+3. News-driven risks and upcoming catalysts
+4. Confidence level (0-1)"""
+        else:
+            task = """Provide an investment view including:
+1. Overall stance (bullish/bearish/neutral)
+2. Where price action and news agree or conflict
+3. Key risks and what would change the view
+4. Confidence level (0-1)"""
+
+        prompt = f"""
+Combine the following analyses for {ticker}:
+
+{chr(10).join(sections) if sections else 'No analyses available.'}
+
+{task}
+
+Keep your response under 200 words.
+"""
+
+        model = model_router.select_model()
+        call = telemetry.agent_call("synthesis_agent", ticker)
+        try:
+            response_text = await self._complete(prompt, model, call)
+        except Exception as e:
+            call.finish(error=e)
+            reason = type(e).__name__
+            logger.warning(f"Synthesis agent LLM unavailable for {ticker} ({reason}), using local synthesis")
+            return local_analyzer.synthesize(ticker, market, news, reason=reason)
+
+        call.finish()
+
+        return {
+            "agent_name": "Decision Synthesis Agent",
+            "ticker": ticker,
+            "stance": self._extract_stance(response_text),
+            "analysis": response_text,
+            "confidence": self._extract_confidence(response_text),
+            "reasoning": "Synthesis of technical and news sentiment analyses",
+            "model": model
+        }
+
+    def _extract_stance(self, text: str) -> str:
+        """Extract the overall stance from the agent response."""
+        match = re.search(r'\b(bullish|bearish|neutral)\b', text.lower())
+        return match.group(1) if match else "neutral"
+
+    def _extract_confidence(self, text: str) -> float:
+        """Extract confidence score from agent response."""
+        match = re.search(r'confidence[:\s]+([0-9.]+)', text.lower())
+
+        if match:
+            try:
+                return max(0.0, min(1.0, float(match.group(1))))
+            except ValueError:
+                pass
+
+        return 0.65
+
+
+# Global instance
+synthesis_agent = DecisionSynthesisAgent()
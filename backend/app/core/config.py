@@ -25,6 +25,16 @@ class Settings(BaseSettings):
     MARKET_DATA_API_KEY: str  # Finnhub API Key
     NEWS_API_KEY: str
 
+    # Upstream API hosts (override to point at local stand-in servers)
+    FINNHUB_BASE_URL: str = "https://finnhub.io/api/v1"
+    NEWS_API_BASE_URL: str = "https://newsapi.org/v2"
+
+    # NewsAPI HTTP client (one keep-alive session shared by all news fetches)
+    NEWS_HTTP_POOL_SIZE: int = 20  # Concurrent connections to NewsAPI
+    NEWS_HTTP_KEEPALIVE_SECONDS: float = 30.0  # Idle time before a pooled connection is closed
+    NEWS_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    NEWS_HTTP_TIMEOUT_SECONDS: float = 15.0  # Total deadline for one NewsAPI request
+
     # Application
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
@@ -34,6 +44,125 @@ class Settings(BaseSettings):
     # CORS
     ALLOWED_ORIGINS: list[str] = ["http://localhost:8501", "http://localhost:3000"]
 
+    # LLM model tiers
+    GEMINI_FAST_MODEL: str = "gemini-2.0-flash-exp"  # Fast tier: large requests and SLO fallback
+    GEMINI_DEEP_MODEL: str = "gemini-1.5-pro"  # Deep tier: small synthesis requests and explicit deep depth
+    GEMINI_API_ENDPOINT: Optional[str] = None  # Override the Gemini API host (e.g. a local stand-in server)
+    MODEL_DEEP_MAX_TICKERS: int = 2  # Largest standard-depth request routed to the deep tier
+    MODEL_DEEP_SLO_P95_SECONDS: float = 12.0  # Deep tier p95 latency above which traffic shifts to fast
+    MODEL_LATENCY_WINDOW_SECONDS: float = 300.0  # Latency samples older than this are forgotten
+    MODEL_LATENCY_MIN_SAMPLES: int = 5  # Samples needed before the p95 is trusted
+
+    # LLM resilience
+    LLM_TIMEOUT_SECONDS: float = 20.0  # Per-call deadline before falling back to local analysis
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 3  # Consecutive failures that open an agent's breaker
+    LLM_BREAKER_RESET_SECONDS: float = 30.0  # How long an open breaker rejects calls
+    LLM_MAX_PROMPT_CHARS: int = 8000  # Hard cap on prompt size sent to an agent
+
+    # Agent assistant pools
+    AGENT_POOL_SIZE: int = 4  # Concurrent LLM calls per agent
+    AGENT_POOL_CHECKOUT_TIMEOUT_SECONDS: float = 10.0  # Wait for a free assistant before falling back
+
+    # LLM admission control (weighted fair queuing per user, by lane)
+    ADMISSION_MAX_CONCURRENT: int = 8  # LLM calls running at once across all agents
+    ADMISSION_PER_USER_MAX_CONCURRENT: int = 3  # LLM calls running at once for one user
+    ADMISSION_BACKGROUND_MAX_CONCURRENT: int = 2  # LLM calls running at once for precompute and prefetch
+    ADMISSION_LANE_WEIGHTS: dict[str, float] = {"interactive": 8.0, "streaming": 4.0, "background": 1.0}
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 15.0  # Wait for admission before falling back to local analysis
+
+    # Agent graph (market + news -> synthesis)
+    AGENT_DAG_NODE_TIMEOUT_SECONDS: float = 30.0  # Deadline for each node in a ticker's graph
+    AGENT_DAG_CACHE_TTL_SECONDS: float = 600.0  # Reuse a synthesis for identical market and news inputs
+
+    # Analysis request deduplication
+    ANALYSIS_DEDUP_GRACE_SECONDS: float = 5.0  # Reuse a just-finished identical analysis for this long
+
+    # Materiality gate for reusing cached insights
+    MATERIALITY_PRICE_MOVE_PCT: float = 0.5  # Price move (%) since the cached insight that forces recompute
+    MATERIALITY_VOLATILITY_CHANGE_PCT: float = 1.0  # Intraday volatility change (percentage points) that forces recompute
+    MATERIALITY_MIN_NEW_ARTICLES: int = 2  # Unseen articles that force a news recompute
+    MATERIALITY_MAX_AGE_MINUTES: int = 240  # Cached insights older than this are always recomputed
+
+    # Analysis job queue
+    ANALYSIS_WORKER_CONCURRENCY: int = 2  # Jobs processed concurrently per process
+    ANALYSIS_JOB_MAX_ATTEMPTS: int = 2  # Attempts before a job interrupted by a restart is failed
+
+    # Insight precomputation
+    PRECOMPUTE_ENABLED: bool = True
+    PRECOMPUTE_INTERVAL_MINUTES: int = 30  # How often the scheduler wakes up
+    PRECOMPUTE_OFFPEAK_HOURS_UTC: list[int] = list(range(0, 13))  # Hours in which precompute runs may start
+    PRECOMPUTE_TOP_TICKERS: int = 20  # Most-watched tickers to precompute
+    PRECOMPUTE_LLM_BUDGET: int = 40  # Max agent analyses per precompute run
+    PRECOMPUTE_MAX_AGE_MINUTES: int = 180  # Precomputed insights older than this are not served
+
+    # Upstream data caches
+    QUOTE_CACHE_TTL_SECONDS: float = 10.0  # Reuse a fetched quote for this long
+    NEWS_CACHE_TTL_SECONDS: float = 300.0  # Serve cached news without refreshing for this long
+    NEWS_CACHE_STALE_SECONDS: float = 21600.0  # Serve older news while refreshing it in the background, up to this age
+    NEWS_CACHE_MAX_STALE_SECONDS: float = 172800.0  # Oldest news served when the quota is spent or NewsAPI fails
+    NEWS_CACHE_MAX_ENTRIES: int = 500
+
+    # Local news search index (SQLite FTS5)
+    NEWS_INDEX_ENABLED: bool = True
+    NEWS_INDEX_PATH: str = "./news_index.db"
+    NEWS_INDEX_MIN_RESULTS: int = 10  # Local matches needed to answer a search without NewsAPI
+    NEWS_INDEX_RETENTION_DAYS: int = 30  # Older articles are dropped from the index
+    NEWS_INDEX_PRUNE_INTERVAL_HOURS: float = 24.0  # How often ingestion drops articles past retention
+
+    # Background news ingestion into the local article store
+    NEWS_INGEST_ENABLED: bool = True
+    NEWS_INGEST_INTERVAL_MINUTES: int = 60
+    NEWS_INGEST_QUOTA_SHARE: float = 0.5  # Fraction of the daily NewsAPI quota ingestion may spend
+    NEWS_INGEST_CATEGORIES: list[str] = ["business"]  # Top-headline categories fetched every cycle
+    NEWS_INGEST_TOP_TICKERS: int = 20  # Most-watched tickers whose news is ingested
+    NEWS_INGEST_DAYS_BACK: int = 7
+    NEWS_INGEST_PAGE_SIZE: int = 100  # Articles per NewsAPI request (one request, one quota unit)
+    NEWS_INGEST_BATCH_SIZE: int = 200  # Articles written per transaction
+    NEWS_STORE_MIN_ARTICLES: int = 5  # Stored articles needed to answer ticker news without NewsAPI
+    NEWS_STORE_MAX_AGE_MINUTES: int = 240  # Ticker news refreshed longer ago than this is refetched
+
+    # Lexicon sentiment scoring
+    SENTIMENT_LEXICON_PATH: str = ""  # word,polarity CSV or Loughran-McDonald master dictionary; empty uses the bundled list
+    SENTIMENT_NEGATION_WINDOW: int = 3  # Sentiment words up to this many tokens after "not", "no", ... are flipped
+
+    # Ticker extraction from article text
+    SYMBOL_MASTER_PATH: str = ""  # symbol,name,aliases,ambiguous CSV; empty uses the bundled app/data/symbols.csv
+
+    # NewsAPI quota
+    NEWS_API_DAILY_QUOTA: int = 100  # Requests allowed per rolling 24 hours (developer plan)
+    NEWS_API_QUOTA_RESERVE: int = 10  # Requests kept for cache misses; background refreshes stop here
+    NEWS_API_RATE_LIMIT_BACKOFF_SECONDS: float = 3600.0  # Cached news only after NewsAPI answers 429
+    NEWS_API_MAX_QUERY_LENGTH: int = 500  # NewsAPI limit on the q parameter
+
+    # Precomputed topic feeds (/api/news/topics)
+    TOPIC_FEEDS_ENABLED: bool = True
+    TOPIC_FEED_REFRESH_MINUTES: float = 30.0
+    TOPIC_FEED_QUOTA_SHARE: float = 0.2  # Fraction of the daily NewsAPI quota topic feeds may spend
+    TOPIC_FEED_DAYS_BACK: int = 7  # Requests for other windows are searched live
+    TOPIC_FEED_MAX_ARTICLES: int = 50  # Requests for more articles are searched live
+
+    # Multi-ticker news batching
+    NEWS_BATCH_WINDOW_MS: float = 25.0  # Ticker news requests arriving this close together share NewsAPI queries
+    NEWS_BATCH_MAX_TICKERS: int = 10  # Tickers packed into one OR query (1 disables batching)
+
+    # Watchlist prefetch
+    PREFETCH_ON_WATCHLIST_ADD: bool = True  # Warm quote, news and market insight for newly added tickers
+    PREFETCH_CONCURRENCY: int = 2  # Tickers prefetched at the same time
+    PREFETCH_MAX_PENDING: int = 20  # Prefetches queued beyond this are dropped
+    PREFETCH_NEWS_ARTICLES: int = 20  # Articles fetched per ticker (covers the dashboard and the news agent)
+    PREFETCH_QUOTE_TTL_SECONDS: float = 120.0  # Prefetched quotes outlive QUOTE_CACHE_TTL_SECONDS until the dashboard loads
+
+    # News analysis
+    NEWS_PROMPT_TOKEN_BUDGET: int = 1200  # Max estimated tokens of article text per sentiment prompt
+    NEWS_DEDUP_MAX_HAMMING: int = 6  # SimHash bit distance for near-duplicate articles
+    NEWS_STORY_MIN_SIMILARITY: float = 0.5  # Estimated title shingle Jaccard that puts two articles in one story
+    NEWS_STORY_SHINGLE_CHARS: int = 5  # Characters per title shingle
+    NEWS_STORY_MINHASH_PERMUTATIONS: int = 64  # MinHash signature length
+    NEWS_STORY_LSH_BANDS: int = 16  # LSH bands per signature (more bands catch less similar titles)
+    NEWS_SENTIMENT_HALF_LIFE_HOURS: float = 24.0  # Age at which an article's sentiment weight halves
+    NEWS_SENTIMENT_MAX_ARTICLES: int = 500  # Per-ticker scored articles kept in incremental sentiment state
+    NEWS_SENTIMENT_MAX_TICKERS: int = 1000  # Tickers whose incremental sentiment state is kept (least recently used dropped)
+
     class Config:
         env_file = str(ENV_FILE)
         case_sensitive = True
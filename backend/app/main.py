@@ -1,10 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 import logging
 
 from .core.config import settings
 from .core.database import init_db
+from .services.job_queue import analysis_job_queue
+from .services.precompute import insight_precompute_scheduler
+from .services.model_router import model_router
+from .services.admission import admission_controller
+from .services.prefetch import watchlist_prefetcher
+from .services.telemetry import telemetry
+from .services.news_service import news_service
+from .services.news_index import news_index
+from .services.news_ingestion import news_ingestion_worker
+from .services.topic_feeds import topic_feed_materializer
+from .agents import market_agent, news_agent, synthesis_agent
 from .routes import auth_router, market_router, insights_router, news_router
 
 logging.basicConfig(
@@ -23,10 +35,23 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
+    await analysis_job_queue.start()
+    await insight_precompute_scheduler.start()
+    await news_ingestion_worker.start()
+    await topic_feed_materializer.start()
+
     yield
 
     logger.info("Shutting down Financial AI Agent Platform...")
 
+    await watchlist_prefetcher.stop()
+    await topic_feed_materializer.stop()
+    await news_ingestion_worker.stop()
+    await insight_precompute_scheduler.stop()
+    await analysis_job_queue.stop()
+    await news_service.close()
+    news_index.close()
+
 
 app = FastAPI(
     title="Financial AI Agent Platform",
@@ -41,6 +66,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth_router)
@@ -67,10 +93,26 @@ async def health_check():
         "status": "healthy",
         "database": "connected",
         "ai_agents": "operational",
-        "market_data": "streaming"
+        "market_data": "streaming",
+        "agent_pools": {
+            "market_agent": market_agent.pools.stats(),
+            "news_agent": news_agent.pools.stats(),
+            "synthesis_agent": synthesis_agent.pools.stats()
+        },
+        "model_routing": model_router.stats(),
+        "llm_admission": admission_controller.stats(),
+        "news": news_service.stats(),
+        "news_ingestion": news_ingestion_worker.stats(),
+        "topic_feeds": topic_feed_materializer.stats()
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Agent and upstream telemetry in the Prometheus text format."""
+    return PlainTextResponse(telemetry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
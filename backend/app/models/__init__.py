@@ -1,4 +1,6 @@
 from .user import User
 from .watchlist import Watchlist, QueryHistory
+from .analysis_job import AnalysisJob
+from .insight import PrecomputedInsight
 
-__all__ = ["User", "Watchlist", "QueryHistory"]
+__all__ = ["User", "Watchlist", "QueryHistory", "AnalysisJob", "PrecomputedInsight"]
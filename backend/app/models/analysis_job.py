@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class AnalysisJob(Base):
+    """Asynchronous AI analysis job processed by the worker pool."""
+
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String(36), primary_key=True)  # UUID
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    status = Column(String(20), nullable=False, index=True)  # queued, running, completed, failed
+    query_type = Column(String(50), nullable=False)
+    request = Column(JSON, nullable=False)  # Serialized AIQueryRequest
+
+    progress_completed = Column(Integer, default=0, nullable=False)
+    progress_total = Column(Integer, default=0, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+
+    result = Column(JSON)  # Serialized AIQueryResponse
+    error = Column(String(1000))
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    # Relationships
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<AnalysisJob(id={self.id}, user_id={self.user_id}, status={self.status})>"
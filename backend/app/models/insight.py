@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+
+from ..core.database import Base
+
+
+class PrecomputedInsight(Base):
+    """Latest precomputed agent insight per ticker and analysis type."""
+
+    __tablename__ = "precomputed_insights"
+    __table_args__ = (
+        UniqueConstraint("ticker", "analysis_type", name="uq_precomputed_ticker_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String(20), nullable=False, index=True)
+    analysis_type = Column(String(20), nullable=False)  # market, news
+
+    insight = Column(JSON, nullable=False)  # Serialized AgentInsight
+    inputs = Column(JSON)  # Market/news inputs the insight was computed from
+
+    computed_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<PrecomputedInsight(ticker={self.ticker}, analysis_type={self.analysis_type})>"
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 from typing import List
@@ -8,8 +9,10 @@ from ..core.database import get_db
 from ..core.security import get_current_active_user
 from ..models.user import User
 from ..models.watchlist import QueryHistory
-from ..schemas.market import AIQueryRequest, AIQueryResponse
-from ..services.agent_service import agent_orchestration_service
+from ..schemas.market import AIQueryRequest, AIQueryResponse, AnalysisJobResponse
+from ..services.agent_service import agent_orchestration_service, build_query_history
+from ..services.job_queue import analysis_job_queue
+from ..services.admission import admission_controller, LANE_INTERACTIVE
 
 logger = logging.getLogger(__name__)
 
@@ -39,25 +42,10 @@ async def analyze_stocks(
             f"analysis for {query_request.tickers}"
         )
 
-        response = await agent_orchestration_service.execute_query(query_request)
-
-        query_history = QueryHistory(
-            user_id=current_user.id,
-            query_type=query_request.query_type.value,
-            query_params={
-                "tickers": query_request.tickers,
-                "additional_context": query_request.additional_context
-            },
-            agent_response={
-                "query_id": response.query_id,
-                "risk_level": response.risk_level,
-                "insights_count": len(response.insights)
-            },
-            response_summary=response.synthesis[:1000],
-            execution_time_ms=response.execution_time_ms
-        )
+        with admission_controller.context(current_user.id, LANE_INTERACTIVE):
+            response = await agent_orchestration_service.execute_query(query_request)
 
-        db.add(query_history)
+        db.add(build_query_history(current_user.id, query_request, response))
         await db.commit()
 
         logger.info(
@@ -75,6 +63,86 @@ async def analyze_stocks(
         )
 
 
+@router.post("/jobs", response_model=AnalysisJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_analysis_job(
+    query_request: AIQueryRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Submit an AI analysis to the background worker pool.
+
+    Returns immediately with a job id; poll ``/jobs/{job_id}`` or subscribe to
+    ``/jobs/{job_id}/events`` for progress and the final result.
+
+    Args:
+        query_request: Query parameters including tickers and query type
+        current_user: Authenticated user
+
+    Returns:
+        The queued job
+    """
+    logger.info(
+        f"User {current_user.username} submitted {query_request.query_type} "
+        f"analysis job for {query_request.tickers}"
+    )
+
+    return await analysis_job_queue.submit(current_user.id, query_request)
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get status, progress and result of an analysis job.
+
+    Args:
+        job_id: Job identifier returned on submission
+        current_user: Authenticated user
+
+    Returns:
+        Current job state
+    """
+    job = await analysis_job_queue.get_job(job_id, current_user.id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_analysis_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Subscribe to an analysis job as a Server-Sent Events stream.
+
+    Each event carries the full job state; the stream ends once the job has
+    completed or failed.
+
+    Args:
+        job_id: Job identifier returned on submission
+        current_user: Authenticated user
+    """
+    if not await analysis_job_queue.get_job(job_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    async def event_stream():
+        async for snapshot in analysis_job_queue.subscribe(job_id, current_user.id):
+            yield f"event: {snapshot.status.value}\ndata: {snapshot.model_dump_json()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/history", response_model=List[dict])
 async def get_query_history(
     limit: int = 20,
@@ -16,6 +16,7 @@ from ..schemas.market import (
     StockPrice
 )
 from ..services.stock_stream import stock_stream_manager
+from ..services.prefetch import watchlist_prefetcher
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +94,9 @@ async def add_to_watchlist(
 
     logger.info(f"User {current_user.username} added {watchlist_item.ticker} to watchlist")
 
+    # The dashboard or an analysis of the new ticker usually follows
+    watchlist_prefetcher.schedule(new_watchlist.ticker)
+
     return new_watchlist
 
 
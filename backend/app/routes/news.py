@@ -1,33 +1,186 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+import json
 import logging
 
+from ..core.config import settings
 from ..core.security import get_current_active_user
 from ..models.user import User
+from ..services.article_clustering import story_entries
 from ..services.news_service import news_service
+from ..services.news_pagination import (
+    NDJSON_MEDIA_TYPE, InvalidCursorError, decode_cursor, ndjson_lines, page_from_window, page_range, paginate,
+    query_fingerprint, source_window
+)
+from ..services.topic_feeds import TOPIC_QUERIES, TopicFeed, topic_feed_materializer
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/news", tags=["News"])
 
+LIMIT_QUERY = Query(default=None, ge=1, le=100, description="Articles per page (default: all of max_articles)")
+CURSOR_QUERY = Query(default=None, description="Cursor from the previous page's X-Next-Cursor")
+FORMAT_QUERY = Query(default="json", alias="format", pattern="^(json|ndjson)$", description="json array or ndjson stream")
+STORIES_QUERY = Query(default=False, description="Group articles into stories: a lead article plus alternates from other outlets")
+
+
+def _check_cursor(cursor: Optional[str], fingerprint: str):
+    """Reject a malformed or foreign cursor before any news is fetched."""
+    if cursor:
+        try:
+            decode_cursor(cursor, fingerprint)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+async def _grouped(articles: List[Dict[str, Any]], stories: bool) -> List[Dict[str, Any]]:
+    """Articles, or story entries (see ``story_entries``) when ``stories`` is set."""
+    if not stories:
+        return articles
+    return await asyncio.to_thread(story_entries, articles)
+
+
+def _paged_response(
+    articles: List[Dict[str, Any]],
+    fingerprint: str,
+    cursor: Optional[str],
+    limit: int,
+    output_format: str,
+    response: Response
+):
+    """
+    One page of an already fetched result list.
+
+    Only for sources that cannot be read by position: NewsAPI responses and
+    story grouping, which needs every article. Each page then fetches (from
+    the news cache) and, with ``stories``, groups up to ``max_articles``
+    (at most 100) articles before slicing. Local index searches are paged at
+    the source instead (see ``_indexed_search_page``).
+    """
+    page, next_cursor = paginate(articles, fingerprint, cursor, limit)
+    return _page_response(page, next_cursor, output_format, response)
+
+
+def _page_response(
+    page: List[Dict[str, Any]],
+    next_cursor: Optional[str],
+    output_format: str,
+    response: Response
+):
+    """
+    A page as a JSON array or an NDJSON stream.
+
+    The next page's cursor is returned in the X-Next-Cursor header (and, for
+    NDJSON, as the final ``{"next_cursor": ...}`` line).
+    """
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if output_format == "ndjson":
+        return StreamingResponse(ndjson_lines(page, next_cursor), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    response.headers.update(headers)
+    return page
+
+
+async def _indexed_search_page(
+    query: str,
+    days_back: int,
+    max_articles: int,
+    fingerprint: str,
+    cursor: Optional[str],
+    limit: int
+):
+    """
+    One page of a search answered by the local index, read with LIMIT/OFFSET.
+
+    Returns:
+        (page, next cursor), or None when the index does not answer the search
+        or the results shifted since the cursor was issued
+    """
+    start, count = source_window(cursor, fingerprint, limit)
+    window = await news_service.search_news_window(query, days_back, max_articles, start, count)
+    if window is None:
+        return None
+    return page_from_window(window, fingerprint, cursor, limit)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header lists ``etag``.
+
+    The header is a comma-separated list of entity tags or ``*``; tags are
+    compared exactly after dropping a weak ``W/`` prefix.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+
+
+def _feed_response(
+    request: Request,
+    feed: TopicFeed,
+    fingerprint: str,
+    cursor: Optional[str],
+    max_articles: int,
+    limit: int,
+    output_format: str,
+    stories: bool
+) -> Response:
+    """
+    One page of a materialized topic feed, answering If-None-Match with 304.
+
+    The body is joined from the feed's pre-encoded articles (or stories); the
+    ETag covers the feed content and the requested page.
+    """
+    variant = f"{feed.etag}|{fingerprint}|{cursor}|{limit}|{output_format}"
+    etag = f'"{hashlib.sha1(variant.encode("utf-8")).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(settings.TOPIC_FEED_REFRESH_MINUTES * 60)}"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    items, encoded = feed.view(max_articles, stories)
+    start, end, next_cursor = page_range(items, fingerprint, cursor, limit)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    lines = encoded[start:end]
+    if output_format == "ndjson":
+        body = "".join(f"{line}\n" for line in lines) + json.dumps({"next_cursor": next_cursor}) + "\n"
+        return Response(body, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    return Response(f"[{','.join(lines)}]", media_type="application/json", headers=headers)
+
 
 @router.get("/financial", response_model=List[Dict[str, Any]])
 async def get_financial_news(
+    response: Response,
     category: Optional[str] = Query(default="business", description="News category: business, technology, etc."),
     max_articles: int = Query(default=30, le=100, description="Maximum articles to fetch"),
+    limit: Optional[int] = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    output_format: str = FORMAT_QUERY,
+    stories: bool = STORIES_QUERY,
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get general financial and business news.
 
     Args:
+        response: Outgoing response (carries the X-Next-Cursor header)
         category: News category (business, technology, etc.)
         max_articles: Maximum number of articles to return
+        limit: Articles per page
+        cursor: Cursor of the page to return
+        output_format: Response format (json or ndjson)
+        stories: Group articles into story clusters (pages then count stories)
         current_user: Authenticated user
 
     Returns:
         List of financial news articles
     """
+    fingerprint = query_fingerprint("financial", category, max_articles, stories)
+    _check_cursor(cursor, fingerprint)
     try:
         articles = await news_service.get_market_news(
             category=category,
@@ -35,92 +188,184 @@ async def get_financial_news(
         )
 
         logger.info(f"User {current_user.username} fetched {len(articles)} financial news articles")
-        return articles
 
     except Exception as e:
         logger.error(f"Error fetching financial news: {e}")
-        return []
+        articles = []
+
+    articles = await _grouped(articles, stories)
+    return _paged_response(articles, fingerprint, cursor, limit or max_articles, output_format, response)
 
 
 @router.get("/search", response_model=List[Dict[str, Any]])
 async def search_news(
+    response: Response,
     query: str = Query(..., description="Search query (stock ticker, company name, topic)"),
     days_back: int = Query(default=7, le=30, description="Days to look back"),
     max_articles: int = Query(default=20, le=100, description="Maximum articles to fetch"),
+    refresh: bool = Query(default=False, description="Fetch from NewsAPI instead of the local index"),
+    limit: Optional[int] = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    output_format: str = FORMAT_QUERY,
+    stories: bool = STORIES_QUERY,
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Search for news articles by query (ticker, company, topic).
 
+    When the local index answers the search, each page is read from it with
+    LIMIT/OFFSET; NewsAPI results and story groupings are paged from the
+    fetched list.
+
     Args:
+        response: Outgoing response (carries the X-Next-Cursor header)
         query: Search query (e.g., "AAPL", "Tesla", "cryptocurrency")
         days_back: Number of days to look back
         max_articles: Maximum number of articles to return
+        refresh: Bypass the local index and cached results
+        limit: Articles per page
+        cursor: Cursor of the page to return
+        output_format: Response format (json or ndjson)
+        stories: Group articles into story clusters (pages then count stories)
         current_user: Authenticated user
 
     Returns:
         List of news articles matching the query
     """
+    fingerprint = query_fingerprint("search", query, days_back, max_articles, stories)
+    _check_cursor(cursor, fingerprint)
+
+    if not refresh and not stories:
+        try:
+            indexed = await _indexed_search_page(query, days_back, max_articles, fingerprint, cursor, limit or max_articles)
+        except Exception as e:
+            logger.error(f"Error paging local news search for '{query}': {e}")
+            indexed = None
+        if indexed is not None:
+            page, next_cursor = indexed
+            logger.info(f"User {current_user.username} read {len(page)} indexed articles for '{query}'")
+            return _page_response(page, next_cursor, output_format, response)
+
     try:
-        articles = await news_service.get_stock_news(
-            ticker=query,
+        articles = await news_service.search_news(
+            query=query,
             days_back=days_back,
-            max_articles=max_articles
+            max_articles=max_articles,
+            refresh=refresh
         )
 
         logger.info(f"User {current_user.username} searched news for '{query}': {len(articles)} results")
-        return articles
 
     except Exception as e:
         logger.error(f"Error searching news for {query}: {e}")
-        return []
+        articles = []
+
+    articles = await _grouped(articles, stories)
+    return _paged_response(articles, fingerprint, cursor, limit or max_articles, output_format, response)
 
 
 @router.get("/topics/{topic}", response_model=List[Dict[str, Any]])
 async def get_topic_news(
+    request: Request,
+    response: Response,
     topic: str,
     days_back: int = Query(default=7, le=30, description="Days to look back"),
     max_articles: int = Query(default=20, le=100, description="Maximum articles to fetch"),
+    refresh: bool = Query(default=False, description="Fetch from NewsAPI instead of the local index"),
+    limit: Optional[int] = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    output_format: str = FORMAT_QUERY,
+    stories: bool = STORIES_QUERY,
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get news for specific topics (stocks, crypto, forex, commodities).
 
+    The fixed topics are served from feeds materialized in the background
+    (see ``TopicFeedMaterializer``) with an ETag, unless the request asks
+    for a refresh, a different look-back window or more articles than a
+    feed holds.
+
     Args:
+        request: Incoming request (If-None-Match is honoured for feeds)
+        response: Outgoing response (carries the X-Next-Cursor header)
         topic: Topic (stocks, crypto, bitcoin, ethereum, gold, oil, etc.)
         days_back: Number of days to look back
         max_articles: Maximum number of articles to return
+        refresh: Bypass the local index and cached results
+        limit: Articles per page
+        cursor: Cursor of the page to return
+        output_format: Response format (json or ndjson)
+        stories: Group articles into story clusters (pages then count stories)
         current_user: Authenticated user
 
     Returns:
         List of news articles for the topic
     """
+    fingerprint = query_fingerprint("topics", topic.lower(), days_back, max_articles, stories)
+    _check_cursor(cursor, fingerprint)
+
+    feed = None if refresh else topic_feed_materializer.get(topic, days_back, max_articles)
+    if feed is not None:
+        return _feed_response(request, feed, fingerprint, cursor, max_articles, limit or max_articles, output_format, stories)
+
     try:
-        # Map topics to search queries
-        topic_queries = {
-            "stocks": "stock market",
-            "crypto": "cryptocurrency bitcoin ethereum",
-            "bitcoin": "bitcoin BTC",
-            "ethereum": "ethereum ETH",
-            "forex": "forex currency exchange",
-            "commodities": "commodities gold oil",
-            "gold": "gold commodity",
-            "oil": "crude oil",
-            "tech": "technology stocks",
-            "finance": "finance financial markets"
-        }
-
-        search_query = topic_queries.get(topic.lower(), topic)
-
-        articles = await news_service.get_stock_news(
-            ticker=search_query,
+        search_query = TOPIC_QUERIES.get(topic.lower(), topic)
+
+        articles = await news_service.search_news(
+            query=search_query,
             days_back=days_back,
-            max_articles=max_articles
+            max_articles=max_articles,
+            refresh=refresh
         )
 
         logger.info(f"User {current_user.username} fetched {len(articles)} articles for topic '{topic}'")
-        return articles
 
     except Exception as e:
         logger.error(f"Error fetching news for topic {topic}: {e}")
+        articles = []
+
+    articles = await _grouped(articles, stories)
+    return _paged_response(articles, fingerprint, cursor, limit or max_articles, output_format, response)
+
+
+@router.get("/sentiment", response_model=List[Dict[str, Any]])
+async def get_news_sentiment(
+    tickers: str = Query(..., description="Comma-separated stock ticker symbols"),
+    days_back: int = Query(default=7, le=30, description="Days to look back"),
+    bucket_hours: int = Query(default=24, ge=1, le=168, description="Hours per time bucket"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Lexicon news sentiment per ticker and time bucket.
+
+    Args:
+        tickers: Comma-separated ticker symbols (e.g., "AAPL,MSFT")
+        days_back: Number of days to look back
+        bucket_hours: Width of each time bucket in hours
+        current_user: Authenticated user
+
+    Returns:
+        Article counts and mean sentiment per ticker and bucket
+    """
+    symbols = sorted({t.strip().upper() for t in tickers.split(",") if t.strip()})[:20]
+    try:
+        return await news_service.ticker_sentiment(symbols, days_back=days_back, bucket_hours=bucket_hours)
+
+    except Exception as e:
+        logger.error(f"Error computing news sentiment for {symbols}: {e}")
         return []
+
+
+@router.get("/stats", response_model=Dict[str, Any])
+async def get_news_stats(current_user: User = Depends(get_current_active_user)):
+    """
+    News cache hit rate and remaining NewsAPI quota.
+
+    Args:
+        current_user: Authenticated user
+
+    Returns:
+        Cache, quota and HTTP client statistics
+    """
+    return news_service.stats()
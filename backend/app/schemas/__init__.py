@@ -12,9 +12,12 @@ from .market import (
     WatchlistCreate,
     WatchlistResponse,
     QueryType,
+    AnalysisDepth,
     AIQueryRequest,
     AgentInsight,
-    AIQueryResponse
+    AIQueryResponse,
+    AnalysisJobStatus,
+    AnalysisJobResponse
 )
 
 __all__ = [
@@ -29,7 +32,10 @@ __all__ = [
     "WatchlistCreate",
     "WatchlistResponse",
     "QueryType",
+    "AnalysisDepth",
     "AIQueryRequest",
     "AgentInsight",
-    "AIQueryResponse"
+    "AIQueryResponse",
+    "AnalysisJobStatus",
+    "AnalysisJobResponse"
 ]
@@ -49,11 +49,19 @@ class QueryType(str, Enum):
     DECISION_SYNTHESIS = "decision_synthesis"
 
 
+class AnalysisDepth(str, Enum):
+    """How much model capacity to spend on an analysis."""
+    QUICK = "quick"
+    STANDARD = "standard"
+    DEEP = "deep"
+
+
 class AIQueryRequest(BaseModel):
     """Request for AI agent analysis."""
     tickers: List[str] = Field(..., min_items=1, max_items=10)
     query_type: QueryType
     additional_context: Optional[str] = None
+    depth: AnalysisDepth = AnalysisDepth.STANDARD
 
 
 class AgentInsight(BaseModel):
@@ -75,3 +83,27 @@ class AIQueryResponse(BaseModel):
     risk_level: str  # low, medium, high
     execution_time_ms: int
     timestamp: datetime
+    degraded: bool = False  # True when any insight came from the local fallback analyzer
+    telemetry: Optional[Dict[str, Any]] = None  # Per agent call queue wait, LLM latency, tokens, cache and errors
+
+
+class AnalysisJobStatus(str, Enum):
+    """Lifecycle states of an asynchronous analysis job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AnalysisJobResponse(BaseModel):
+    """Status, progress and (when finished) result of an analysis job."""
+    job_id: str
+    status: AnalysisJobStatus
+    query_type: QueryType
+    tickers: List[str]
+    progress_completed: int = 0
+    progress_total: int = 0
+    result: Optional[AIQueryResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -1,12 +1,43 @@
 from .stock_stream import stock_stream_manager, StockStreamManager
 from .news_service import news_service, NewsService
+from .sentiment import sentiment_engine, LexiconSentimentEngine
+from .ticker_index import ticker_index, TickerIndex
+from .model_router import model_router, ModelRouter
+from .admission import admission_controller, AdmissionController, AdmissionTimeoutError
 from .agent_service import agent_orchestration_service, AgentOrchestrationService
+from .job_queue import analysis_job_queue, AnalysisJobQueue
+from .insight_store import insight_store, InsightStore
+from .precompute import insight_precompute_scheduler, InsightPrecomputeScheduler
+from .prefetch import watchlist_prefetcher, WatchlistPrefetcher
+from .news_ingestion import news_ingestion_worker, NewsIngestionWorker
+from .topic_feeds import topic_feed_materializer, TopicFeedMaterializer
 
 __all__ = [
     "stock_stream_manager",
     "StockStreamManager",
     "news_service",
     "NewsService",
+    "sentiment_engine",
+    "LexiconSentimentEngine",
+    "ticker_index",
+    "TickerIndex",
+    "model_router",
+    "ModelRouter",
+    "admission_controller",
+    "AdmissionController",
+    "AdmissionTimeoutError",
     "agent_orchestration_service",
-    "AgentOrchestrationService"
+    "AgentOrchestrationService",
+    "analysis_job_queue",
+    "AnalysisJobQueue",
+    "insight_store",
+    "InsightStore",
+    "insight_precompute_scheduler",
+    "InsightPrecomputeScheduler",
+    "watchlist_prefetcher",
+    "WatchlistPrefetcher",
+    "news_ingestion_worker",
+    "NewsIngestionWorker",
+    "topic_feed_materializer",
+    "TopicFeedMaterializer"
 ]
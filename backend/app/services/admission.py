@@ -0,0 +1,217 @@
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+import asyncio
+import functools
+import logging
+import time
+
+from ..core.config import settings
+from .resilience import CapacityError
+from .telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+LANE_INTERACTIVE = "interactive"
+LANE_STREAMING = "streaming"
+LANE_BACKGROUND = "background"
+LANES = (LANE_INTERACTIVE, LANE_STREAMING, LANE_BACKGROUND)
+
+# (user id, lane) of the work being processed; read when an agent asks for admission
+_current_principal: ContextVar[Tuple[Optional[int], str]] = ContextVar(
+    "admission_principal", default=(None, LANE_INTERACTIVE)
+)
+
+
+class AdmissionTimeoutError(CapacityError):
+    """Raised when an LLM call waits longer than the admission queue timeout."""
+
+
+class _Waiter:
+    """An LLM call queued for admission."""
+
+    __slots__ = ("user_id", "lane", "start_tag", "enqueued_at", "future")
+
+    def __init__(self, user_id: Optional[int], lane: str, start_tag: float, future: asyncio.Future):
+        self.user_id = user_id
+        self.lane = lane
+        self.start_tag = start_tag
+        self.enqueued_at = time.monotonic()
+        self.future = future
+
+
+class AdmissionController:
+    """
+    Admits agent LLM calls with weighted fair queuing across users and lanes.
+
+    Each (lane, user) pair is a flow. Queued calls are served in order of
+    their start tag (start-time fair queuing): a flow's next call starts one
+    ``1 / lane weight`` step after its previous one, but never behind the
+    current virtual time. A user firing many calls therefore only delays their
+    own later calls, and the interactive lane gets a larger share than
+    streaming jobs or background precompute.
+
+    At most ADMISSION_MAX_CONCURRENT calls run at once, each user is capped at
+    ADMISSION_PER_USER_MAX_CONCURRENT, and the background lane at
+    ADMISSION_BACKGROUND_MAX_CONCURRENT. Calls that wait longer than
+    ADMISSION_QUEUE_TIMEOUT_SECONDS are shed with ``AdmissionTimeoutError``
+    (a CapacityError, so agents fall back without tripping their breakers).
+    """
+
+    def __init__(self):
+        self._queue: List[_Waiter] = []
+        self._virtual_time = 0.0
+        self._last_start: Dict[Tuple[str, Optional[int]], float] = {}
+        self._active = 0
+        self._active_by_user: Dict[int, int] = {}
+        self._active_by_lane: Dict[str, int] = {lane: 0 for lane in LANES}
+        self._lane_stats = {lane: {"admitted": 0, "timeouts": 0, "wait_total": 0.0, "max_wait": 0.0} for lane in LANES}
+
+    @contextmanager
+    def context(self, user_id: Optional[int], lane: str = LANE_INTERACTIVE) -> Iterator[None]:
+        """Attribute LLM calls made inside the block to ``user_id`` in ``lane``."""
+        token = _current_principal.set((user_id, lane))
+        try:
+            yield
+        finally:
+            _current_principal.reset(token)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for one LLM call of the current principal.
+
+        Raises:
+            AdmissionTimeoutError: If no slot was granted within the queue timeout
+        """
+        release = await self.acquire()
+        try:
+            yield
+        finally:
+            release()
+
+    async def acquire(self) -> Callable[[], None]:
+        """
+        Take an admission slot for one LLM call of the current principal.
+
+        Unlike ``admit``, the slot is not tied to a block: it is held until the
+        returned function is called, e.g. once a worker thread really finishes.
+
+        Raises:
+            AdmissionTimeoutError: If no slot was granted within the queue timeout
+        """
+        user_id, lane = _current_principal.get()
+        await self._acquire(user_id, lane)
+        return functools.partial(self._release, user_id, lane)
+
+    async def _acquire(self, user_id: Optional[int], lane: str):
+        flow = (lane, user_id)
+        start_tag = max(self._virtual_time, self._last_start.get(flow, 0.0))
+        self._last_start[flow] = start_tag + 1.0 / settings.ADMISSION_LANE_WEIGHTS.get(lane, 1.0)
+
+        if not self._queue and self._can_run(user_id, lane):
+            self._virtual_time = start_tag
+            self._grant(user_id, lane, 0.0)
+            return
+
+        waiter = _Waiter(user_id, lane, start_tag, asyncio.get_running_loop().create_future())
+        self._queue.append(waiter)
+        # Waiters held back only by their own user's cap must not block this one
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                self._queue.remove(waiter)
+                self._record_timeout(lane, time.monotonic() - waiter.enqueued_at)
+                raise AdmissionTimeoutError(
+                    f"LLM admission queue timeout ({lane}, user {user_id})"
+                ) from None
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                self._release(user_id, lane)
+            else:
+                self._queue.remove(waiter)
+            raise
+
+    def _can_run(self, user_id: Optional[int], lane: str) -> bool:
+        if self._active >= settings.ADMISSION_MAX_CONCURRENT:
+            return False
+        if user_id is not None and self._active_by_user.get(user_id, 0) >= settings.ADMISSION_PER_USER_MAX_CONCURRENT:
+            return False
+        if lane == LANE_BACKGROUND and self._active_by_lane[lane] >= settings.ADMISSION_BACKGROUND_MAX_CONCURRENT:
+            return False
+        return True
+
+    def _grant(self, user_id: Optional[int], lane: str, waited: float):
+        self._active += 1
+        self._active_by_lane[lane] = self._active_by_lane.get(lane, 0) + 1
+        if user_id is not None:
+            self._active_by_user[user_id] = self._active_by_user.get(user_id, 0) + 1
+
+        stats = self._lane_stats.setdefault(lane, {"admitted": 0, "timeouts": 0, "wait_total": 0.0, "max_wait": 0.0})
+        stats["admitted"] += 1
+        stats["wait_total"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+        telemetry.admission(lane, waited, admitted=True)
+
+    def _record_timeout(self, lane: str, waited: float):
+        self._lane_stats[lane]["timeouts"] += 1
+        telemetry.admission(lane, waited, admitted=False)
+        logger.warning(f"LLM admission timed out after {waited:.1f}s in the {lane} lane")
+
+    def _release(self, user_id: Optional[int], lane: str):
+        self._active -= 1
+        self._active_by_lane[lane] -= 1
+        if user_id is not None:
+            remaining = self._active_by_user.get(user_id, 1) - 1
+            if remaining:
+                self._active_by_user[user_id] = remaining
+            else:
+                self._active_by_user.pop(user_id, None)
+        self._dispatch()
+
+    def _dispatch(self):
+        """Grant free slots to eligible waiters in start-tag order."""
+        while self._queue and self._active < settings.ADMISSION_MAX_CONCURRENT:
+            eligible = [waiter for waiter in self._queue if self._can_run(waiter.user_id, waiter.lane)]
+            if not eligible:
+                break
+
+            waiter = min(eligible, key=lambda w: w.start_tag)
+            self._queue.remove(waiter)
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            self._grant(waiter.user_id, waiter.lane, time.monotonic() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+        # Flows that fell behind the virtual time carry no state worth keeping
+        if len(self._last_start) > 1000:
+            self._last_start = {
+                flow: start for flow, start in self._last_start.items() if start > self._virtual_time
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """Active and queued calls, plus admission counters per lane."""
+        lanes = {}
+        for lane, stats in self._lane_stats.items():
+            admitted = stats["admitted"]
+            lanes[lane] = {
+                "active": self._active_by_lane.get(lane, 0),
+                "queued": sum(1 for waiter in self._queue if waiter.lane == lane),
+                "admitted": admitted,
+                "timeouts": stats["timeouts"],
+                "avg_wait_ms": round(stats["wait_total"] / admitted * 1000, 1) if admitted else 0.0,
+                "max_wait_ms": round(stats["max_wait"] * 1000, 1)
+            }
+
+        return {
+            "capacity": settings.ADMISSION_MAX_CONCURRENT,
+            "active": self._active,
+            "queued": len(self._queue),
+            "active_users": len(self._active_by_user),
+            "lanes": lanes
+        }
+
+
+# Global instance
+admission_controller = AdmissionController()
@@ -0,0 +1,164 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+from .telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+NodeFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+NodeFallback = Callable[[Dict[str, Any], Exception], Any]
+NodeCacheKey = Callable[[Dict[str, Any]], Optional[str]]
+
+
+class DagNode:
+    """
+    One step of an agent graph.
+
+    ``func`` receives the results of its dependencies keyed by node name and
+    starts as soon as all of them have finished. A failed or timed-out
+    dependency contributes ``None``.
+
+    Args:
+        name: Unique node name within the graph
+        func: Coroutine function computing the node's result
+        deps: Names of nodes whose results this node needs
+        timeout: Deadline in seconds for this node (None for no deadline)
+        fallback: Called with (dependency results, error) when func fails or times out
+        cache_key: Derives a cache key from dependency results; None disables caching
+        cache_ttl: How long a cached result stays valid, in seconds
+        agent: Agent whose LLM call the node makes (cache hits are counted against it)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: NodeFunc,
+        deps: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        fallback: Optional[NodeFallback] = None,
+        cache_key: Optional[NodeCacheKey] = None,
+        cache_ttl: float = 0.0,
+        agent: Optional[str] = None
+    ):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.fallback = fallback
+        self.cache_key = cache_key
+        self.cache_ttl = cache_ttl
+        self.agent = agent
+
+
+class AgentDagExecutor:
+    """
+    Runs a graph of agent nodes with maximum concurrency.
+
+    Independent nodes run concurrently, so a graph of market and news nodes
+    feeding a synthesis node costs max(market, news) + synthesis. Node results
+    can be cached across runs by a key derived from their inputs.
+    """
+
+    def __init__(self):
+        self._cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}  # (node, key) -> (expires_at, result)
+
+    async def run(self, nodes: List[DagNode]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Execute a graph.
+
+        Args:
+            nodes: Graph nodes; dependencies must name nodes in the same list
+
+        Returns:
+            Tuple of (results by node name, elapsed milliseconds by node name)
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+        """
+        by_name = {node.name: node for node in nodes}
+        self._validate(by_name)
+
+        tasks: Dict[str, asyncio.Task] = {}
+        timings: Dict[str, float] = {}
+
+        async def run_node(node: DagNode) -> Any:
+            inputs = {}
+            for dep in node.deps:
+                inputs[dep] = await tasks[dep]
+
+            started = time.monotonic()
+            try:
+                return await self._run_node(node, inputs)
+            finally:
+                timings[node.name] = round((time.monotonic() - started) * 1000, 1)
+
+        # Tasks are created in dependency order so every dependency task exists
+        for name in self._topological_order(by_name):
+            tasks[name] = asyncio.create_task(run_node(by_name[name]), name=f"dag-{name}")
+
+        try:
+            values = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        return dict(zip(tasks.keys(), values)), timings
+
+    async def _run_node(self, node: DagNode, inputs: Dict[str, Any]) -> Any:
+        """Run one node with its cache, deadline and fallback."""
+        key = node.cache_key(inputs) if node.cache_key else None
+        if key is not None:
+            cached = self._cache.get((node.name, key))
+            if cached and time.monotonic() < cached[0]:
+                if node.agent:
+                    telemetry.cache_hit(node.agent)
+                return cached[1]
+
+        try:
+            if node.timeout is not None:
+                result = await asyncio.wait_for(node.func(inputs), timeout=node.timeout)
+            else:
+                result = await node.func(inputs)
+        except Exception as e:
+            logger.warning(f"DAG node '{node.name}' failed ({type(e).__name__})")
+            return node.fallback(inputs, e) if node.fallback else None
+
+        if key is not None and result is not None:
+            now = time.monotonic()
+            self._cache = {k: entry for k, entry in self._cache.items() if entry[0] > now}
+            self._cache[(node.name, key)] = (now + node.cache_ttl, result)
+
+        return result
+
+    def _validate(self, by_name: Dict[str, DagNode]):
+        for node in by_name.values():
+            for dep in node.deps:
+                if dep not in by_name:
+                    raise ValueError(f"DAG node '{node.name}' depends on unknown node '{dep}'")
+
+    def _topological_order(self, by_name: Dict[str, DagNode]) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"DAG has a cycle through '{name}'")
+            state[name] = "visiting"
+            for dep in by_name[name].deps:
+                visit(dep)
+            state[name] = "done"
+            order.append(name)
+
+        for name in by_name:
+            visit(name)
+
+        return order
+
+
+# Global instance
+agent_dag_executor = AgentDagExecutor()
@@ -1,42 +1,209 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+import asyncio
+import hashlib
+import json
 import logging
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from ..agents import market_agent, news_agent
+from ..agents import market_agent, news_agent, synthesis_agent, local_analyzer
+from ..core.config import settings
+from ..models.watchlist import QueryHistory
 from ..schemas.market import AIQueryRequest, AIQueryResponse, AgentInsight, QueryType
 from .stock_stream import stock_stream_manager
+from .news_service import news_service
+from .article_clustering import article_fingerprint
+from .insight_store import insight_store, ANALYSIS_MARKET, ANALYSIS_NEWS
+from .agent_dag import DagNode, agent_dag_executor
+from .model_router import model_router
+from .telemetry import telemetry
 
 logger = logging.getLogger(__name__)
 
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+SYNTHESIS_AGENT_NAME = "Decision Synthesis Analyst"
+
+
+class _InflightQuery:
+    """A running analysis shared by every caller with the same fingerprint."""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.progress_callbacks: List[ProgressCallback] = []
+
+    async def report_progress(self, completed: int, total: int):
+        for callback in list(self.progress_callbacks):
+            try:
+                await callback(completed, total)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+
+class CachedInsight:
+    """An insight together with the market/news inputs it was computed from."""
+
+    def __init__(self, insight: AgentInsight, inputs: Dict[str, Any], computed_at: datetime):
+        self.insight = insight
+        self.inputs = inputs
+        self.computed_at = computed_at
+
+    def reused_insight(self) -> AgentInsight:
+        """Copy of the insight flagged as reused, with its original computation time."""
+        insight = self.insight.model_copy(deep=True)
+        insight.details = {
+            **insight.details,
+            "reused": True,
+            "computed_at": self.computed_at.isoformat()
+        }
+        return insight
+
 
 class AgentOrchestrationService:
     """Optimized service for fast financial analysis with detailed responses."""
 
-    async def execute_query(self, query_request: AIQueryRequest) -> AIQueryResponse:
+    def __init__(self):
+        self._inflight: Dict[str, _InflightQuery] = {}
+        self._recent: Dict[str, Tuple[float, AIQueryResponse]] = {}
+        self._insight_cache: Dict[Tuple[str, str, Optional[str]], CachedInsight] = {}  # (type, ticker, model)
+        self._last_query_id = 0
+
+    async def execute_query(
+        self,
+        query_request: AIQueryRequest,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> AIQueryResponse:
         """
         Execute an AI query with optimized performance.
 
+        Identical requests (same tickers and query type) that arrive while one is
+        running attach to the running computation, and a result finished within
+        the last ANALYSIS_DEDUP_GRACE_SECONDS is reused. Every caller receives its
+        own copy of the response with its own query id, tickers as requested and
+        execution time, so each caller's history records its own query.
+
         Args:
             query_request: The query request with tickers and query type
+            progress_callback: Optional coroutine called with (completed, total) tickers
 
         Returns:
             Comprehensive AI query response
         """
         start_time = time.time()
+        fingerprint = self._fingerprint(query_request)
+
+        recent = self._recent.get(fingerprint)
+        if recent and time.monotonic() - recent[0] <= settings.ANALYSIS_DEDUP_GRACE_SECONDS:
+            logger.info(f"Reusing analysis finished {time.monotonic() - recent[0]:.1f}s ago for {query_request.tickers}")
+            response = recent[1]
+            if progress_callback:
+                await progress_callback(len(response.tickers), len(response.tickers))
+        else:
+            inflight = self._inflight.get(fingerprint)
+            if inflight is None:
+                inflight = _InflightQuery()
+                inflight.task = asyncio.create_task(self._run_shared_query(fingerprint, query_request, inflight))
+                self._inflight[fingerprint] = inflight
+            else:
+                logger.info(f"Attaching to in-flight analysis for {query_request.tickers}")
+
+            if progress_callback:
+                inflight.progress_callbacks.append(progress_callback)
+            try:
+                response = await asyncio.shield(inflight.task)
+            finally:
+                if progress_callback in inflight.progress_callbacks:
+                    inflight.progress_callbacks.remove(progress_callback)
+
+        return response.model_copy(
+            deep=True,
+            update={
+                "query_id": self._next_query_id(),
+                "tickers": list(query_request.tickers),
+                "execution_time_ms": int((time.time() - start_time) * 1000)
+            }
+        )
+
+    def _next_query_id(self) -> int:
+        """Millisecond timestamp, bumped so that no two responses share an id."""
+        self._last_query_id = max(int(time.time() * 1000), self._last_query_id + 1)
+        return self._last_query_id
+
+    def _fingerprint(self, query_request: AIQueryRequest) -> str:
+        """
+        Identity of a request for deduplication (additional_context is not used by the agents).
+
+        Tickers are compared as a set, so the same tickers in another order or
+        case share one analysis. The model tier is part of the identity, so a
+        request is never answered by an analysis made for another tier.
+        """
+        tier = model_router.choose_tier(len(query_request.tickers), query_request.query_type, query_request.depth)
+        key = json.dumps({
+            "tickers": sorted({ticker.upper() for ticker in query_request.tickers}),
+            "query_type": query_request.query_type.value,
+            "depth": query_request.depth.value,
+            "tier": tier
+        })
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    async def _run_shared_query(
+        self,
+        fingerprint: str,
+        query_request: AIQueryRequest,
+        inflight: _InflightQuery
+    ) -> AIQueryResponse:
+        """Run a query once on behalf of all attached callers."""
+        try:
+            response = await self._execute_query(query_request, inflight.report_progress)
+        finally:
+            self._inflight.pop(fingerprint, None)
+
+        now = time.monotonic()
+        self._recent = {
+            key: entry for key, entry in self._recent.items()
+            if now - entry[0] <= settings.ANALYSIS_DEDUP_GRACE_SECONDS
+        }
+        if not response.degraded:
+            self._recent[fingerprint] = (now, response)
+
+        return response
+
+    async def _execute_query(
+        self,
+        query_request: AIQueryRequest,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> AIQueryResponse:
+        """Run the agents for a query (no deduplication)."""
+        tier = model_router.choose_tier(len(query_request.tickers), query_request.query_type, query_request.depth)
+        with model_router.use_tier(tier), telemetry.collect() as request_telemetry:
+            response = await self._run_agents(query_request, progress_callback)
+
+        response.telemetry = request_telemetry.summary()
+        return response
+
+    async def _run_agents(
+        self,
+        query_request: AIQueryRequest,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> AIQueryResponse:
+        """Run the agents for a query within the current model tier."""
+        start_time = time.time()
 
         try:
             insights = []
             tickers = query_request.tickers
 
             try:
-                # Simplified: Only 2 query types for faster performance
-                if query_request.query_type in [QueryType.MARKET_ANALYSIS, QueryType.RISK_ASSESSMENT, QueryType.DECISION_SYNTHESIS]:
+                if query_request.query_type == QueryType.MARKET_ANALYSIS:
                     # Combined market + risk analysis in one call
-                    insights = await self._run_comprehensive_market_analysis(tickers)
+                    insights = await self._run_comprehensive_market_analysis(tickers, progress_callback)
+
+                elif query_request.query_type in [QueryType.RISK_ASSESSMENT, QueryType.DECISION_SYNTHESIS]:
+                    focus = "risk" if query_request.query_type == QueryType.RISK_ASSESSMENT else "decision"
+                    insights = await self._run_synthesis_analysis(tickers, focus, progress_callback)
 
                 elif query_request.query_type == QueryType.NEWS_SENTIMENT:
-                    insights = await self._run_news_sentiment_analysis(tickers)
+                    insights = await self._run_news_sentiment_analysis(tickers, progress_callback)
 
             except Exception as e:
                 logger.error(f"Agent execution error: {e}")
@@ -48,13 +215,21 @@ class AgentOrchestrationService:
                     synthesis=f"AI Analysis temporarily unavailable. Please check your API quota or try again later.",
                     risk_level="unknown",
                     execution_time_ms=int((time.time() - start_time) * 1000),
-                    timestamp=datetime.utcnow()
+                    timestamp=datetime.utcnow(),
+                    degraded=True
                 )
 
             execution_time_ms = int((time.time() - start_time) * 1000)
 
-            synthesis = insights[-1].summary if insights else "No insights generated"
+            synthesized = [insight for insight in insights if insight.agent_name == SYNTHESIS_AGENT_NAME]
+            if len(synthesized) > 1:
+                synthesis = "\n\n".join(f"**{insight.details['ticker']}**: {insight.summary}" for insight in synthesized)
+            elif synthesized:
+                synthesis = synthesized[0].summary
+            else:
+                synthesis = insights[-1].summary if insights else "No insights generated"
             risk_level = self._determine_overall_risk(insights)
+            degraded = any(insight.details.get("degraded") for insight in insights)
 
             return AIQueryResponse(
                 query_id=int(time.time()),
@@ -64,111 +239,380 @@ class AgentOrchestrationService:
                 synthesis=synthesis,
                 risk_level=risk_level,
                 execution_time_ms=execution_time_ms,
-                timestamp=datetime.utcnow()
+                timestamp=datetime.utcnow(),
+                degraded=degraded
             )
 
         except Exception as e:
             logger.error(f"Agent orchestration error: {e}")
             raise
 
-    async def _run_comprehensive_market_analysis(self, tickers: List[str]) -> List[AgentInsight]:
+    async def _analyze_tickers(
+        self,
+        tickers: List[str],
+        analyze: Callable[[str], Awaitable[Any]],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[Any]:
+        """
+        Analyze tickers concurrently, reporting progress as each one finishes.
+
+        Concurrency is bounded by the agents' assistant pools.
+
+        Returns:
+            Results in ticker order
+        """
+        completed = 0
+
+        async def run(ticker: str) -> Any:
+            nonlocal completed
+            insight = await analyze(ticker)
+            completed += 1
+            if progress_callback:
+                await progress_callback(completed, len(tickers))
+            return insight
+
+        return list(await asyncio.gather(*(run(ticker) for ticker in tickers)))
+
+    async def _run_comprehensive_market_analysis(
+        self,
+        tickers: List[str],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[AgentInsight]:
         """
         Run comprehensive market + risk analysis in one call (OPTIMIZED).
         Combines market analysis and risk assessment for better performance.
         """
-        insights = []
+        insights = await self._analyze_tickers(tickers, self.analyze_market_ticker, progress_callback)
+        return [insight for insight in insights if insight]
+
+    async def analyze_market_ticker(
+        self,
+        ticker: str,
+        use_cache: bool = True
+    ) -> Optional[AgentInsight]:
+        """
+        Market + risk insight for one ticker.
+
+        A cached or precomputed insight is reused unless the market moved
+        materially since it was computed (see ``_market_change_is_material``).
 
-        for ticker in tickers:
+        Args:
+            ticker: Stock ticker symbol
+            use_cache: Allow reusing a cached or precomputed insight
+
+        Returns:
+            The insight, or None if no quote is available
+        """
+        with telemetry.fetch("quote"):
             quote = await stock_stream_manager.get_quote(ticker)
 
-            if quote:
-                # Enhanced price data with risk indicators
-                price_data = {
-                    "current_price": quote.price,
-                    "volume": quote.volume,
-                    "change": quote.change,
-                    "change_percent": quote.change_percent,
-                    "open": quote.open,
-                    "high": quote.high,
-                    "low": quote.low,
-                    # Calculate additional metrics
-                    "price_range": quote.high - quote.low,
-                    "volatility_pct": ((quote.high - quote.low) / quote.open * 100) if quote.open > 0 else 0,
-                    "intraday_trend": "bullish" if quote.price > quote.open else "bearish",
-                }
-
-                # Single comprehensive prompt for detailed analysis
-                result = await market_agent.analyze_price_action(ticker, price_data)
-
-                # Enhanced reasoning with risk assessment
-                enhanced_reasoning = f"{result['reasoning']}\n\n"
-                enhanced_reasoning += f"**Risk Indicators:**\n"
-                enhanced_reasoning += f"- Price Volatility: {price_data['volatility_pct']:.2f}%\n"
-                enhanced_reasoning += f"- Intraday Trend: {price_data['intraday_trend'].title()}\n"
-                enhanced_reasoning += f"- Price Change: {quote.change_percent:+.2f}%\n"
-
-                # Determine risk level based on volatility and change
-                if abs(quote.change_percent) > 5 or price_data['volatility_pct'] > 5:
-                    risk_level = "high"
-                    risk_note = "High volatility detected. Consider careful position sizing."
-                elif abs(quote.change_percent) > 2 or price_data['volatility_pct'] > 3:
-                    risk_level = "medium"
-                    risk_note = "Moderate price movement. Monitor closely."
-                else:
-                    risk_level = "low"
-                    risk_note = "Stable price action within normal range."
-
-                enhanced_reasoning += f"- Risk Level: {risk_level.upper()}\n- {risk_note}"
-
-                insights.append(AgentInsight(
-                    agent_name="Comprehensive Market Analyst",
-                    confidence=result["confidence"],
-                    summary=result["analysis"],
-                    details={
-                        "ticker": ticker,
-                        "price_data": price_data,
-                        "risk_level": risk_level
-                    },
-                    reasoning=enhanced_reasoning
-                ))
-
-        return insights
-
-    async def _run_news_sentiment_analysis(self, tickers: List[str]) -> List[AgentInsight]:
+        if not quote:
+            return None
+
+        # Enhanced price data with risk indicators
+        price_data = {
+            "current_price": quote.price,
+            "volume": quote.volume,
+            "change": quote.change,
+            "change_percent": quote.change_percent,
+            "open": quote.open,
+            "high": quote.high,
+            "low": quote.low,
+            # Calculate additional metrics
+            "price_range": quote.high - quote.low,
+            "volatility_pct": ((quote.high - quote.low) / quote.open * 100) if quote.open > 0 else 0,
+            "intraday_trend": "bullish" if quote.price > quote.open else "bearish",
+        }
+        inputs = {
+            "price": price_data["current_price"],
+            "volatility_pct": price_data["volatility_pct"]
+        }
+
+        if use_cache:
+            baseline = await self._get_baseline(ticker, ANALYSIS_MARKET)
+            if baseline and not self._market_change_is_material(baseline.inputs, inputs):
+                telemetry.cache_hit("market_agent", ticker)
+                return baseline.reused_insight()
+
+        # Single comprehensive prompt for detailed analysis
+        result = await market_agent.analyze_price_action(ticker, price_data)
+
+        # Enhanced reasoning with risk assessment
+        enhanced_reasoning = f"{result['reasoning']}\n\n"
+        enhanced_reasoning += f"**Risk Indicators:**\n"
+        enhanced_reasoning += f"- Price Volatility: {price_data['volatility_pct']:.2f}%\n"
+        enhanced_reasoning += f"- Intraday Trend: {price_data['intraday_trend'].title()}\n"
+        enhanced_reasoning += f"- Price Change: {quote.change_percent:+.2f}%\n"
+
+        # Determine risk level based on volatility and change
+        risk_level, risk_note = local_analyzer.assess_risk(
+            quote.change_percent, price_data['volatility_pct']
+        )
+
+        enhanced_reasoning += f"- Risk Level: {risk_level.upper()}\n- {risk_note}"
+
+        insight = AgentInsight(
+            agent_name="Comprehensive Market Analyst",
+            confidence=result["confidence"],
+            summary=result["analysis"],
+            details={
+                "ticker": ticker,
+                "price_data": price_data,
+                "risk_level": risk_level,
+                "degraded": result.get("degraded", False),
+                "model": result.get("model")
+            },
+            reasoning=enhanced_reasoning
+        )
+        self._remember(ticker, ANALYSIS_MARKET, insight, inputs)
+
+        return insight
+
+    async def _run_news_sentiment_analysis(
+        self,
+        tickers: List[str],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[AgentInsight]:
         """Run comprehensive news sentiment analysis."""
-        insights = []
-
-        for ticker in tickers:
-            result = await news_agent.analyze_news_sentiment(ticker, days_back=7)
-
-            # Enhanced summary with more detail
-            enhanced_summary = result["summary"]
-            if result["article_count"] > 0:
-                enhanced_summary += f"\n\n📊 Analysis of {result['article_count']} recent articles shows "
-                enhanced_summary += f"{result['sentiment'].upper()} sentiment. "
-
-                # Add sentiment interpretation
-                sentiment_map = {
-                    "bullish": "Positive news flow may support upward price momentum.",
-                    "bearish": "Negative coverage could create downward pressure.",
-                    "neutral": "Mixed signals suggest waiting for clearer direction.",
-                    "mixed": "Conflicting signals require careful monitoring."
-                }
-                enhanced_summary += sentiment_map.get(result['sentiment'].lower(), "")
-
-            insights.append(AgentInsight(
-                agent_name="News Sentiment Analyst",
-                confidence=result["confidence"],
-                summary=enhanced_summary,
-                details={
-                    "ticker": ticker,
-                    "sentiment": result["sentiment"],
-                    "article_count": result["article_count"]
-                },
-                reasoning=result["reasoning"]
-            ))
-
-        return insights
+        return await self._analyze_tickers(tickers, self.analyze_news_ticker, progress_callback)
+
+    async def _run_synthesis_analysis(
+        self,
+        tickers: List[str],
+        focus: str,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[AgentInsight]:
+        """Run the market -> synthesis <- news graph for every ticker concurrently."""
+        per_ticker = await self._analyze_tickers(
+            tickers,
+            lambda ticker: self.analyze_ticker_graph(ticker, focus),
+            progress_callback
+        )
+        return [insight for insights in per_ticker for insight in insights]
+
+    async def analyze_ticker_graph(self, ticker: str, focus: str = "decision") -> List[AgentInsight]:
+        """
+        Market, news and synthesis insights for one ticker.
+
+        The market and news nodes run concurrently and the synthesis node starts
+        once both finish, so the cost is max(market, news) + synthesis. Each node
+        has its own deadline; a failed market or news node is left out of the
+        synthesis, and a failed synthesis falls back to the local analyzer.
+        Synthesis results are cached by their inputs.
+
+        Args:
+            ticker: Stock ticker symbol
+            focus: "decision" or "risk"
+
+        Returns:
+            The available insights, synthesis last
+        """
+        timeout = settings.AGENT_DAG_NODE_TIMEOUT_SECONDS
+
+        async def synthesize(inputs: Dict[str, Any]) -> AgentInsight:
+            market, news = self._synthesis_inputs(inputs)
+            result = await synthesis_agent.synthesize(ticker, market, news, focus=focus)
+            return self._synthesis_insight(ticker, focus, result)
+
+        def synthesize_locally(inputs: Dict[str, Any], error: Exception) -> AgentInsight:
+            market, news = self._synthesis_inputs(inputs)
+            result = local_analyzer.synthesize(ticker, market, news, reason=type(error).__name__)
+            return self._synthesis_insight(ticker, focus, result)
+
+        def synthesis_cache_key(inputs: Dict[str, Any]) -> Optional[str]:
+            upstream = [inputs.get("market"), inputs.get("news")]
+            if any(insight is None or insight.details.get("degraded") for insight in upstream):
+                return None
+            key = json.dumps([ticker, focus, model_router.select_model()] + [insight.summary for insight in upstream])
+            return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+        results, timings = await agent_dag_executor.run([
+            DagNode("market", lambda _: self.analyze_market_ticker(ticker), timeout=timeout),
+            DagNode("news", lambda _: self.analyze_news_ticker(ticker), timeout=timeout),
+            DagNode(
+                "synthesis",
+                synthesize,
+                deps=("market", "news"),
+                timeout=timeout,
+                fallback=synthesize_locally,
+                cache_key=synthesis_cache_key,
+                cache_ttl=settings.AGENT_DAG_CACHE_TTL_SECONDS,
+                agent="synthesis_agent"
+            )
+        ])
+
+        synthesis = results["synthesis"].model_copy(deep=True)
+        synthesis.details["timings_ms"] = timings
+
+        return [insight for insight in (results["market"], results["news"]) if insight] + [synthesis]
+
+    def _synthesis_inputs(self, inputs: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Reduce market and news insights to what the synthesis step needs."""
+        market_insight: Optional[AgentInsight] = inputs.get("market")
+        news_insight: Optional[AgentInsight] = inputs.get("news")
+
+        market = None
+        if market_insight:
+            market = {
+                "summary": market_insight.summary,
+                "risk_level": market_insight.details.get("risk_level", "unknown"),
+                "change_percent": market_insight.details.get("price_data", {}).get("change_percent", 0)
+            }
+
+        news = None
+        if news_insight:
+            news = {
+                "summary": news_insight.summary,
+                "sentiment": news_insight.details.get("sentiment", "neutral"),
+                "article_count": news_insight.details.get("article_count", 0)
+            }
+
+        return market, news
+
+    def _synthesis_insight(self, ticker: str, focus: str, result: Dict[str, Any]) -> AgentInsight:
+        return AgentInsight(
+            agent_name=SYNTHESIS_AGENT_NAME,
+            confidence=result["confidence"],
+            summary=result["analysis"],
+            details={
+                "ticker": ticker,
+                "stance": result["stance"],
+                "focus": focus,
+                "degraded": result.get("degraded", False),
+                "model": result.get("model")
+            },
+            reasoning=result["reasoning"]
+        )
+
+    async def analyze_news_ticker(
+        self,
+        ticker: str,
+        use_cache: bool = True
+    ) -> AgentInsight:
+        """
+        News sentiment insight for one ticker.
+
+        A cached or precomputed insight is reused until at least
+        MATERIALITY_MIN_NEW_ARTICLES articles it has not seen are published.
+
+        Args:
+            ticker: Stock ticker symbol
+            use_cache: Allow reusing a cached or precomputed insight
+
+        Returns:
+            The insight
+        """
+        with telemetry.fetch("news"):
+            articles = await news_service.get_ticker_news(ticker, days_back=7, max_articles=15)
+        inputs = {"article_fingerprints": sorted(article_fingerprint(a) for a in articles)}
+
+        if use_cache:
+            baseline = await self._get_baseline(ticker, ANALYSIS_NEWS)
+            if baseline and not self._news_change_is_material(baseline.inputs, inputs):
+                telemetry.cache_hit("news_agent", ticker)
+                return baseline.reused_insight()
+
+        result = await news_agent.analyze_news_sentiment(ticker, days_back=7, articles=articles)
+
+        # Enhanced summary with more detail
+        enhanced_summary = result["summary"]
+        if result["article_count"] > 0:
+            enhanced_summary += f"\n\n📊 Analysis of {result['article_count']} recent articles shows "
+            enhanced_summary += f"{result['sentiment'].upper()} sentiment. "
+
+            # Add sentiment interpretation
+            sentiment_map = {
+                "bullish": "Positive news flow may support upward price momentum.",
+                "bearish": "Negative coverage could create downward pressure.",
+                "neutral": "Mixed signals suggest waiting for clearer direction.",
+                "mixed": "Conflicting signals require careful monitoring."
+            }
+            enhanced_summary += sentiment_map.get(result['sentiment'].lower(), "")
+
+        insight = AgentInsight(
+            agent_name="News Sentiment Analyst",
+            confidence=result["confidence"],
+            summary=enhanced_summary,
+            details={
+                "ticker": ticker,
+                "sentiment": result["sentiment"],
+                "article_count": result["article_count"],
+                "degraded": result.get("degraded", False),
+                "model": result.get("model")
+            },
+            reasoning=result["reasoning"]
+        )
+        if articles:
+            self._remember(ticker, ANALYSIS_NEWS, insight, inputs)
+
+        return insight
+
+    def cached_insight(self, ticker: str, analysis_type: str, model: Optional[str]) -> Optional[CachedInsight]:
+        """The last insight ``model`` computed in this process for a ticker, with its inputs."""
+        return self._insight_cache.get((analysis_type, ticker.upper(), model))
+
+    def _remember(self, ticker: str, analysis_type: str, insight: AgentInsight, inputs: Dict[str, Any]):
+        """Cache a freshly computed insight with its inputs (degraded ones are not cached)."""
+        if insight.details.get("degraded"):
+            return
+        key = (analysis_type, ticker.upper(), insight.details.get("model"))
+        self._insight_cache[key] = CachedInsight(insight, inputs, datetime.utcnow())
+
+    async def _get_baseline(self, ticker: str, analysis_type: str) -> Optional[CachedInsight]:
+        """
+        Newest reusable insight: in-process cache first, then the precomputed store.
+
+        Only insights from a model the current request may use are reusable
+        (see ``ModelRouter.reusable_models``), so a deep request is never
+        answered with a fast model's insight.
+        """
+        max_age = timedelta(minutes=settings.MATERIALITY_MAX_AGE_MINUTES)
+        now = datetime.utcnow()
+        models = model_router.reusable_models()
+
+        for model in models:
+            cached = self.cached_insight(ticker, analysis_type, model)
+            if cached and now - cached.computed_at <= max_age:
+                return cached
+
+        try:
+            row = await insight_store.get(ticker, analysis_type)
+        except Exception as e:
+            logger.error(f"Error reading precomputed {analysis_type} insight for {ticker}: {e}")
+            return None
+
+        if row is None or not row.inputs:
+            return None
+
+        computed_at = row.computed_at.replace(tzinfo=None)
+        if now - computed_at > timedelta(minutes=min(settings.PRECOMPUTE_MAX_AGE_MINUTES, settings.MATERIALITY_MAX_AGE_MINUTES)):
+            return None
+
+        insight = AgentInsight.model_validate(row.insight)
+        if insight.details.get("model") not in models:
+            return None
+        insight.details = {**insight.details, "precomputed": True}
+        return CachedInsight(insight, row.inputs, computed_at)
+
+    def _market_change_is_material(self, previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+        """Whether price or volatility moved past the configured thresholds."""
+        old_price = previous.get("price") or 0
+        if old_price <= 0:
+            return True
+
+        price_move_pct = abs(current["price"] - old_price) / old_price * 100
+        volatility_change = abs(current["volatility_pct"] - (previous.get("volatility_pct") or 0))
+
+        return (
+            price_move_pct >= settings.MATERIALITY_PRICE_MOVE_PCT or
+            volatility_change >= settings.MATERIALITY_VOLATILITY_CHANGE_PCT
+        )
+
+    def _news_change_is_material(self, previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+        """Whether enough unseen articles appeared since the insight was computed."""
+        seen = set(previous.get("article_fingerprints") or [])
+        new_articles = [fp for fp in current["article_fingerprints"] if fp not in seen]
+        return len(new_articles) >= settings.MATERIALITY_MIN_NEW_ARTICLES
 
     def _determine_overall_risk(self, insights: List[AgentInsight]) -> str:
         """Determine overall risk level from insights."""
@@ -187,5 +631,29 @@ class AgentOrchestrationService:
             return "low"
 
 
+def build_query_history(
+    user_id: int,
+    query_request: AIQueryRequest,
+    response: AIQueryResponse
+) -> QueryHistory:
+    """Build the QueryHistory row recorded for a completed analysis."""
+    return QueryHistory(
+        user_id=user_id,
+        query_type=query_request.query_type.value,
+        query_params={
+            "tickers": query_request.tickers,
+            "additional_context": query_request.additional_context
+        },
+        agent_response={
+            "query_id": response.query_id,
+            "risk_level": response.risk_level,
+            "insights_count": len(response.insights),
+            "telemetry": response.telemetry
+        },
+        response_summary=response.synthesis[:1000],
+        execution_time_ms=response.execution_time_ms
+    )
+
+
 # Global instance
 agent_orchestration_service = AgentOrchestrationService()
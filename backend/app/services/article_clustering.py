@@ -0,0 +1,359 @@
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from functools import lru_cache
+import hashlib
+import math
+import re
+import zlib
+
+import numpy as np
+
+from ..core.config import settings
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "to", "was", "will", "with"
+}
+
+SIMHASH_BITS = 64
+
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase, strip punctuation and drop stopwords."""
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _hash64(token: str) -> int:
+    """Stable 64-bit hash for a feature string."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint for text.
+
+    Word unigrams are used as features so that reordered or lightly edited
+    headlines still land within a few bits of each other.
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        64-bit integer fingerprint
+    """
+    features = _tokenize(text)
+
+    if not features:
+        return 0
+
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = _hash64(feature)
+        for bit in range(SIMHASH_BITS):
+            if h & (1 << bit):
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token estimate (~4 characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def article_text(article: Dict[str, Any]) -> str:
+    """Text used to fingerprint an article (headline plus lead)."""
+    title = article.get("title") or ""
+    description = article.get("description") or ""
+    return f"{title} {description[:200]}"
+
+
+def article_fingerprint(article: Dict[str, Any]) -> str:
+    """Stable identity of an article: hash of its URL, falling back to its title."""
+    key = article.get("url") or article.get("title") or ""
+    return hashlib.sha1(key.strip().lower().encode("utf-8")).hexdigest()
+
+
+def _source_name(article: Dict[str, Any]) -> str:
+    """Source name for both processed and raw NewsAPI article shapes."""
+    source = article.get("source")
+    if isinstance(source, dict):
+        source = source.get("name")
+    return source or "Unknown"
+
+
+class ArticleCluster:
+    """A group of near-duplicate articles represented by a single article."""
+
+    def __init__(self, members: List[Dict[str, Any]]):
+        self.members = members
+        self.representative = max(
+            members,
+            key=lambda a: (len(a.get("description") or ""), a.get("published_at") or a.get("publishedAt") or "")
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    @property
+    def sources(self) -> List[str]:
+        """Distinct source names, in first-seen order."""
+        seen: List[str] = []
+        for article in self.members:
+            name = _source_name(article)
+            if name not in seen:
+                seen.append(name)
+        return seen
+
+    @property
+    def latest_published(self) -> str:
+        return max((a.get("published_at") or a.get("publishedAt") or "") for a in self.members)
+
+
+class _DisjointSet:
+    """Union-find over article positions; roots are the lowest position in a group."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    def clusters(self, articles: List[Dict[str, Any]]) -> List[ArticleCluster]:
+        """Clusters ordered by first appearance in ``articles``."""
+        groups: Dict[int, List[Dict[str, Any]]] = {}
+        for i, article in enumerate(articles):
+            groups.setdefault(self.find(i), []).append(article)
+        return [ArticleCluster(members) for _, members in sorted(groups.items())]
+
+
+def cluster_articles(
+    articles: List[Dict[str, Any]],
+    max_distance: Optional[int] = None
+) -> List[ArticleCluster]:
+    """
+    Group near-duplicate articles using SimHash fingerprints.
+
+    Fingerprints are split into ``max_distance + 1`` bands; by the pigeonhole
+    principle any two fingerprints within ``max_distance`` bits share at least
+    one identical band, so only articles colliding in a band bucket are
+    compared and clustering stays near-linear.
+
+    Args:
+        articles: Articles to cluster
+        max_distance: Maximum Hamming distance for two articles to be duplicates
+
+    Returns:
+        Clusters ordered by first appearance in the input
+    """
+    if max_distance is None:
+        max_distance = settings.NEWS_DEDUP_MAX_HAMMING
+
+    fingerprints = [simhash(article_text(a)) for a in articles]
+    groups = _DisjointSet(len(articles))
+
+    bands = max_distance + 1
+    band_width = SIMHASH_BITS // bands
+    band_mask = (1 << band_width) - 1
+    buckets: Dict[tuple, List[int]] = {}
+
+    for i, fp in enumerate(fingerprints):
+        if fp == 0:
+            continue
+        for band in range(bands):
+            key = (band, (fp >> (band * band_width)) & band_mask)
+            for j in buckets.get(key, []):
+                if hamming_distance(fp, fingerprints[j]) <= max_distance:
+                    groups.union(i, j)
+            buckets.setdefault(key, []).append(i)
+
+    return groups.clusters(articles)
+
+
+def story_title(article: Dict[str, Any]) -> str:
+    """
+    Normalized headline used to match articles about the same story.
+
+    NewsAPI titles often end in " - <source name>"; that suffix would make
+    the same wire story look different per outlet, so it is dropped.
+    """
+    title = (article.get("title") or "").strip()
+    source = _source_name(article)
+    for separator in (" - ", " | ", " – ", " — "):
+        head, found, tail = title.rpartition(separator)
+        if found and head and tail.strip().lower() == source.lower():
+            title = head
+            break
+    return " ".join(_tokenize(title))
+
+
+@lru_cache(maxsize=4)
+def _minhash_permutations(count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Coefficients of ``count`` hash functions (a * x + b) mod p, fixed across processes."""
+    rng = np.random.default_rng(20240101)
+    a = rng.integers(1, _MINHASH_PRIME, size=count, dtype=np.uint64)
+    b = rng.integers(0, _MINHASH_PRIME, size=count, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(text: str, permutations: int, shingle_chars: int) -> Optional[np.ndarray]:
+    """
+    MinHash signature of the character shingles of ``text``.
+
+    The fraction of positions at which two signatures agree estimates the
+    Jaccard similarity of the two shingle sets.
+
+    Args:
+        text: Normalized text (see ``story_title``)
+        permutations: Signature length
+        shingle_chars: Characters per shingle
+
+    Returns:
+        uint64 array of length ``permutations``, or None for empty text
+    """
+    if not text:
+        return None
+    shingles = {text[i:i + shingle_chars] for i in range(max(1, len(text) - shingle_chars + 1))}
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    a, b = _minhash_permutations(permutations)
+    # Inputs are reduced below 2**31 first, so a * x + b stays within 64 bits
+    return ((np.outer(a, hashes % _MINHASH_PRIME) + b[:, None]) % _MINHASH_PRIME).min(axis=1)
+
+
+def cluster_stories(
+    articles: List[Dict[str, Any]],
+    min_similarity: Optional[float] = None
+) -> List[ArticleCluster]:
+    """
+    Group articles reporting the same story, using MinHash over title shingles.
+
+    Signatures are cut into NEWS_STORY_LSH_BANDS bands and only articles
+    sharing an identical band are compared, so grouping stays near-linear in
+    the number of articles. A compared pair joins the same story when its
+    estimated title similarity reaches ``min_similarity``.
+
+    Args:
+        articles: Articles to group
+        min_similarity: Estimated Jaccard similarity of title shingles (default NEWS_STORY_MIN_SIMILARITY)
+
+    Returns:
+        Stories ordered by first appearance in the input
+    """
+    if min_similarity is None:
+        min_similarity = settings.NEWS_STORY_MIN_SIMILARITY
+
+    permutations = settings.NEWS_STORY_MINHASH_PERMUTATIONS
+    bands = max(1, min(settings.NEWS_STORY_LSH_BANDS, permutations))
+    rows = permutations // bands
+    signatures = [
+        minhash_signature(story_title(article), permutations, settings.NEWS_STORY_SHINGLE_CHARS)
+        for article in articles
+    ]
+    min_agreeing = math.ceil(min_similarity * permutations)
+    groups = _DisjointSet(len(articles))
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        compared = set()
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+            bucket = buckets.setdefault(key, [])
+            for j in bucket:
+                if j in compared:
+                    continue
+                compared.add(j)
+                if groups.find(i) != groups.find(j) and np.count_nonzero(signature == signatures[j]) >= min_agreeing:
+                    groups.union(i, j)
+            bucket.append(i)
+
+    return groups.clusters(articles)
+
+
+def story_entry(story: ArticleCluster) -> Dict[str, Any]:
+    """
+    One story for display.
+
+    The entry is its lead article (the cluster representative, with every
+    field) plus ``story_size`` and ``alternates``: the other outlets' versions
+    reduced to title, source, url and publication time.
+    """
+    lead = story.representative
+    alternates = [
+        {
+            "title": article.get("title"),
+            "source": _source_name(article),
+            "url": article.get("url"),
+            "published_at": article.get("published_at") or article.get("publishedAt")
+        }
+        for article in story.members if article is not lead
+    ]
+    return {**lead, "story_size": story.size, "alternates": alternates}
+
+
+def story_entries(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Articles grouped into stories for display (see ``story_entry``)."""
+    return [story_entry(story) for story in cluster_stories(articles)]
+
+
+def pack_clusters(
+    clusters: List[ArticleCluster],
+    token_budget: int,
+    render: Callable[[int, ArticleCluster], str]
+) -> List[Tuple[ArticleCluster, str]]:
+    """
+    Greedily pack one rendered entry per cluster into a token budget.
+
+    Clusters covered by more sources are packed first (they are the stories the
+    market is actually talking about), then the most recent. Entries that do not
+    fit are skipped so that smaller, distinct stories can still use the
+    remaining budget.
+
+    Args:
+        clusters: Article clusters to pack
+        token_budget: Maximum estimated tokens for all entries combined
+        render: Callable producing the prompt entry for (position, cluster)
+
+    Returns:
+        (cluster, rendered entry) pairs in packing order
+    """
+    ordered = sorted(clusters, key=lambda c: (c.size, c.latest_published), reverse=True)
+
+    packed: List[Tuple[ArticleCluster, str]] = []
+    used_tokens = 0
+
+    for cluster in ordered:
+        entry = render(len(packed) + 1, cluster)
+        cost = estimate_tokens(entry)
+        if used_tokens + cost > token_budget:
+            continue
+        packed.append((cluster, entry))
+        used_tokens += cost
+
+    return packed
@@ -0,0 +1,114 @@
+from typing import Dict, Any, List, Optional
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, desc
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.insight import PrecomputedInsight
+from ..models.watchlist import Watchlist
+from ..schemas.market import AgentInsight
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_MARKET = "market"
+ANALYSIS_NEWS = "news"
+
+
+class InsightStore:
+    """Database-backed store of precomputed agent insights."""
+
+    async def most_watched_tickers(self, limit: int) -> List[str]:
+        """Tickers present in the most watchlists (those worth precomputing and ingesting)."""
+        async with AsyncSessionLocal() as db:
+            watchers = func.count(Watchlist.id)
+            result = await db.execute(
+                select(Watchlist.ticker, watchers)
+                .group_by(Watchlist.ticker)
+                .order_by(desc(watchers))
+                .limit(limit)
+            )
+            return [row[0] for row in result.all()]
+
+    async def get(self, ticker: str, analysis_type: str) -> Optional[PrecomputedInsight]:
+        """Fetch the stored row for a ticker and analysis type, if any."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(PrecomputedInsight).where(
+                    (PrecomputedInsight.ticker == ticker.upper()) &
+                    (PrecomputedInsight.analysis_type == analysis_type)
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def get_fresh(
+        self,
+        ticker: str,
+        analysis_type: str,
+        max_age_minutes: Optional[int] = None
+    ) -> Optional[AgentInsight]:
+        """
+        Return a precomputed insight if it is fresh enough to serve.
+
+        Args:
+            ticker: Stock ticker symbol
+            analysis_type: ANALYSIS_MARKET or ANALYSIS_NEWS
+            max_age_minutes: Freshness limit (defaults to PRECOMPUTE_MAX_AGE_MINUTES)
+
+        Returns:
+            The insight marked as precomputed, or None
+        """
+        max_age = timedelta(minutes=max_age_minutes or settings.PRECOMPUTE_MAX_AGE_MINUTES)
+
+        try:
+            row = await self.get(ticker, analysis_type)
+        except Exception as e:
+            logger.error(f"Error reading precomputed {analysis_type} insight for {ticker}: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        computed_at = row.computed_at.replace(tzinfo=None)
+        if datetime.utcnow() - computed_at > max_age:
+            return None
+
+        insight = AgentInsight.model_validate(row.insight)
+        insight.details = {
+            **insight.details,
+            "precomputed": True,
+            "computed_at": computed_at.isoformat()
+        }
+        return insight
+
+    async def save(
+        self,
+        ticker: str,
+        analysis_type: str,
+        insight: AgentInsight,
+        inputs: Optional[Dict[str, Any]] = None
+    ):
+        """Insert or replace the stored insight for a ticker and analysis type."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(PrecomputedInsight).where(
+                    (PrecomputedInsight.ticker == ticker.upper()) &
+                    (PrecomputedInsight.analysis_type == analysis_type)
+                )
+            )
+            row = result.scalar_one_or_none()
+
+            if row is None:
+                row = PrecomputedInsight(ticker=ticker.upper(), analysis_type=analysis_type)
+                db.add(row)
+
+            row.insight = insight.model_dump(mode="json")
+            row.inputs = inputs or {}
+            row.computed_at = datetime.utcnow()
+
+            await db.commit()
+
+
+# Global instance
+insight_store = InsightStore()
@@ -0,0 +1,282 @@
+from typing import Dict, Any, List, Optional, Set, AsyncIterator
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.analysis_job import AnalysisJob
+from ..models.watchlist import QueryHistory
+from ..schemas.market import AIQueryRequest, AIQueryResponse, AnalysisJobStatus, AnalysisJobResponse
+from .agent_service import agent_orchestration_service, build_query_history
+from .admission import admission_controller, LANE_STREAMING
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {AnalysisJobStatus.COMPLETED.value, AnalysisJobStatus.FAILED.value}
+
+
+def job_to_response(job: AnalysisJob) -> AnalysisJobResponse:
+    """Convert a job row into its API representation."""
+    return AnalysisJobResponse(
+        job_id=job.id,
+        status=job.status,
+        query_type=job.query_type,
+        tickers=job.request.get("tickers", []),
+        progress_completed=job.progress_completed or 0,
+        progress_total=job.progress_total or 0,
+        result=AIQueryResponse.model_validate(job.result) if job.result else None,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at
+    )
+
+
+class AnalysisJobQueue:
+    """
+    Database-backed analysis job queue with an in-process worker pool.
+
+    Job state lives in the ``analysis_jobs`` table, so jobs that were queued or
+    running when the process stopped are picked up again on the next start.
+    Progress events are fanned out to in-process subscribers.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def start(self, concurrency: Optional[int] = None):
+        """Recover unfinished jobs and start the worker pool."""
+        concurrency = concurrency or settings.ANALYSIS_WORKER_CONCURRENCY
+        self._queue = asyncio.Queue()
+
+        for job_id in await self._recover_jobs():
+            self._queue.put_nowait(job_id)
+
+        self._workers = [
+            asyncio.create_task(self._worker(n), name=f"analysis-worker-{n}")
+            for n in range(concurrency)
+        ]
+        logger.info(f"Analysis job queue started with {concurrency} workers")
+
+    async def stop(self):
+        """Stop the worker pool. Running jobs are resumed on next start."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Analysis job queue stopped")
+
+    async def submit(self, user_id: int, query_request: AIQueryRequest) -> AnalysisJobResponse:
+        """
+        Persist a new job and enqueue it.
+
+        Args:
+            user_id: Owner of the job
+            query_request: Analysis to run
+
+        Returns:
+            The queued job
+        """
+        async with AsyncSessionLocal() as db:
+            job = AnalysisJob(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                status=AnalysisJobStatus.QUEUED.value,
+                query_type=query_request.query_type.value,
+                request=query_request.model_dump(mode="json"),
+                progress_completed=0,
+                progress_total=len(query_request.tickers),
+                attempts=0
+            )
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+
+        self._queue.put_nowait(job.id)
+        logger.info(f"Queued analysis job {job.id} for user {user_id}")
+
+        return job_to_response(job)
+
+    async def get_job(self, job_id: str, user_id: int) -> Optional[AnalysisJobResponse]:
+        """Fetch a job owned by the given user."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(AnalysisJob).where(
+                    (AnalysisJob.id == job_id) &
+                    (AnalysisJob.user_id == user_id)
+                )
+            )
+            job = result.scalar_one_or_none()
+
+        return job_to_response(job) if job else None
+
+    async def subscribe(self, job_id: str, user_id: int) -> AsyncIterator[AnalysisJobResponse]:
+        """
+        Yield job snapshots as the job progresses, ending at a terminal state.
+
+        The current state is always yielded first; a snapshot is re-sent every
+        15 seconds without changes so that idle connections stay open.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(events)
+
+        try:
+            snapshot = await self.get_job(job_id, user_id)
+            while snapshot is not None:
+                yield snapshot
+                if snapshot.status.value in TERMINAL_STATUSES:
+                    break
+                try:
+                    snapshot = await asyncio.wait_for(events.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    snapshot = await self.get_job(job_id, user_id)
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(events)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    def _publish(self, job: AnalysisJob):
+        """Push a job snapshot to all subscribers of that job."""
+        subscribers = self._subscribers.get(job.id)
+        if not subscribers:
+            return
+        snapshot = job_to_response(job)
+        for events in subscribers:
+            events.put_nowait(snapshot)
+
+    async def _recover_jobs(self) -> List[str]:
+        """Re-queue jobs left queued or running by a previous process."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(AnalysisJob)
+                .where(AnalysisJob.status.in_([
+                    AnalysisJobStatus.QUEUED.value,
+                    AnalysisJobStatus.RUNNING.value
+                ]))
+                .order_by(AnalysisJob.created_at)
+            )
+            jobs = result.scalars().all()
+
+            recovered = []
+            for job in jobs:
+                if job.attempts >= settings.ANALYSIS_JOB_MAX_ATTEMPTS:
+                    job.status = AnalysisJobStatus.FAILED.value
+                    job.error = "Job interrupted too many times"
+                    job.finished_at = datetime.utcnow()
+                else:
+                    job.status = AnalysisJobStatus.QUEUED.value
+                    recovered.append(job.id)
+
+            await db.commit()
+
+        if recovered:
+            logger.info(f"Recovered {len(recovered)} unfinished analysis jobs")
+
+        return recovered
+
+    async def _worker(self, worker_id: int):
+        """Process jobs from the queue until cancelled."""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                logger.error(f"Analysis worker {worker_id} failed on job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: str):
+        """
+        Run a single job and persist its progress and result.
+
+        Each write uses its own short session, so no session is held open
+        while the agents run, and progress reports from tickers finishing
+        concurrently are written one at a time.
+        """
+        async with AsyncSessionLocal() as db:
+            job = await db.get(AnalysisJob, job_id)
+            if job is None or job.status != AnalysisJobStatus.QUEUED.value:
+                return
+
+            job.status = AnalysisJobStatus.RUNNING.value
+            job.attempts += 1
+            job.started_at = datetime.utcnow()
+            await db.commit()
+        self._publish(job)
+
+        progress_lock = asyncio.Lock()
+
+        async def report_progress(completed: int, total: int):
+            async with progress_lock:
+                if completed < (job.progress_completed or 0):
+                    return  # A later report was already written
+                job.progress_completed = completed
+                job.progress_total = total
+                if await self._save(job_id, progress_completed=completed, progress_total=total):
+                    self._publish(job)
+
+        query_request = AIQueryRequest.model_validate(job.request)
+
+        try:
+            with admission_controller.context(job.user_id, LANE_STREAMING):
+                response = await agent_orchestration_service.execute_query(
+                    query_request,
+                    progress_callback=report_progress
+                )
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {e}")
+            async with progress_lock:
+                job = await self._save(
+                    job_id,
+                    status=AnalysisJobStatus.FAILED.value,
+                    error=str(e)[:1000],
+                    finished_at=datetime.utcnow()
+                )
+            if job is not None:
+                self._publish(job)
+            return
+
+        async with progress_lock:
+            job = await self._save(
+                job_id,
+                history=build_query_history(job.user_id, query_request, response),
+                status=AnalysisJobStatus.COMPLETED.value,
+                result=response.model_dump(mode="json"),
+                progress_completed=job.progress_total,
+                finished_at=datetime.utcnow()
+            )
+        if job is None:
+            return
+        self._publish(job)
+
+        logger.info(f"Analysis job {job_id} completed in {response.execution_time_ms}ms")
+
+    async def _save(self, job_id: str, history: Optional[QueryHistory] = None, **values: Any) -> Optional[AnalysisJob]:
+        """
+        Update a job's columns (and optionally record its query history) in a short session.
+
+        Returns:
+            The updated job, or None if its row was deleted while it ran
+        """
+        async with AsyncSessionLocal() as db:
+            job = await db.get(AnalysisJob, job_id)
+            if job is None:
+                logger.warning(f"Analysis job {job_id} was deleted while running; dropping its update")
+                return None
+            for column, value in values.items():
+                setattr(job, column, value)
+            if history is not None:
+                db.add(history)
+            await db.commit()
+        return job
+
+
+# Global instance
+analysis_job_queue = AnalysisJobQueue()
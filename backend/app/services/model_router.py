@@ -0,0 +1,151 @@
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import threading
+import time
+
+from ..core.config import settings
+from ..schemas.market import AnalysisDepth, QueryType
+
+logger = logging.getLogger(__name__)
+
+TIER_FAST = "fast"
+TIER_DEEP = "deep"
+
+# Tier chosen for the request being processed; read by the agents at call time
+_requested_tier: ContextVar[str] = ContextVar("requested_tier", default=TIER_FAST)
+
+
+class LatencyWindow:
+    """Sliding time window of call latencies for one model."""
+
+    def __init__(self, window_seconds: float, max_samples: int = 500):
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)  # (recorded_at, seconds)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds))
+
+    def snapshot(self) -> Tuple[int, float]:
+        """Return (sample count, p95 latency in seconds) over the window."""
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            latencies = sorted(seconds for _, seconds in self._samples)
+
+        if not latencies:
+            return 0, 0.0
+        return len(latencies), latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+
+
+class ModelRouter:
+    """
+    Picks the Gemini model for each LLM call.
+
+    The tier is chosen per request from its size, type and requested depth:
+    quick requests and large requests use the fast tier; deep requests, and
+    small synthesis or risk requests, prefer the deep tier. At call time a
+    deep preference is downgraded to the fast tier while the deep model's
+    moving p95 latency breaches its SLO. Old samples age out of the window,
+    so the deep tier is retried once it has been quiet for a while.
+    """
+
+    def __init__(self):
+        self._latency: Dict[str, LatencyWindow] = {}
+        self._breached = False
+
+    def choose_tier(self, ticker_count: int, query_type: QueryType, depth: AnalysisDepth) -> str:
+        """
+        Preferred tier for a request.
+
+        Args:
+            ticker_count: Number of tickers in the request
+            query_type: Type of analysis
+            depth: User-selected depth
+
+        Returns:
+            TIER_FAST or TIER_DEEP
+        """
+        if depth == AnalysisDepth.QUICK:
+            return TIER_FAST
+        if depth == AnalysisDepth.DEEP:
+            return TIER_DEEP
+        if (
+            query_type in (QueryType.DECISION_SYNTHESIS, QueryType.RISK_ASSESSMENT) and
+            ticker_count <= settings.MODEL_DEEP_MAX_TICKERS
+        ):
+            return TIER_DEEP
+        return TIER_FAST
+
+    @contextmanager
+    def use_tier(self, tier: str) -> Iterator[None]:
+        """Make ``tier`` the preferred tier for LLM calls made inside the block."""
+        token = _requested_tier.set(tier)
+        try:
+            yield
+        finally:
+            _requested_tier.reset(token)
+
+    def select_model(self) -> str:
+        """Model for an LLM call, honouring the current request's tier and the deep SLO."""
+        if _requested_tier.get() == TIER_DEEP and not self.deep_tier_breached():
+            return settings.GEMINI_DEEP_MODEL
+        return settings.GEMINI_FAST_MODEL
+
+    def reusable_models(self) -> List[str]:
+        """
+        Models whose earlier results may answer an LLM call made now.
+
+        That is the model ``select_model`` would call, plus the deep model,
+        whose results are at least as good as the fast model's.
+        """
+        model = self.select_model()
+        return [model] if model == settings.GEMINI_DEEP_MODEL else [model, settings.GEMINI_DEEP_MODEL]
+
+    def deep_tier_breached(self) -> bool:
+        """Whether the deep model's moving p95 is above its SLO."""
+        count, p95 = self._window(settings.GEMINI_DEEP_MODEL).snapshot()
+        breached = count >= settings.MODEL_LATENCY_MIN_SAMPLES and p95 > settings.MODEL_DEEP_SLO_P95_SECONDS
+
+        if breached != self._breached:
+            self._breached = breached
+            if breached:
+                logger.warning(f"Deep tier p95 {p95:.1f}s breaches SLO, routing to {settings.GEMINI_FAST_MODEL}")
+            else:
+                logger.info("Deep tier back within SLO")
+
+        return breached
+
+    def record(self, model: str, seconds: float):
+        """Record the latency of a completed (or failed) call to a model."""
+        self._window(model).record(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model latency and current routing state."""
+        models = {}
+        for model, window in list(self._latency.items()):
+            count, p95 = window.snapshot()
+            models[model] = {"samples": count, "p95_seconds": round(p95, 3)}
+
+        return {
+            "fast_model": settings.GEMINI_FAST_MODEL,
+            "deep_model": settings.GEMINI_DEEP_MODEL,
+            "deep_slo_p95_seconds": settings.MODEL_DEEP_SLO_P95_SECONDS,
+            "deep_tier_breached": self.deep_tier_breached(),
+            "models": models
+        }
+
+    def _window(self, model: str) -> LatencyWindow:
+        window = self._latency.get(model)
+        if window is None:
+            window = self._latency.setdefault(model, LatencyWindow(settings.MODEL_LATENCY_WINDOW_SECONDS))
+        return window
+
+
+# Global instance
+model_router = ModelRouter()
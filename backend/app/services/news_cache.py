@@ -0,0 +1,254 @@
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict, deque
+import asyncio
+import logging
+import re
+import time
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]  # (endpoint, normalized query, window)
+Fetcher = Callable[[int], Awaitable[Optional[List[Dict[str, Any]]]]]
+
+QUOTA_WINDOW_SECONDS = 24 * 3600
+
+
+_OPERATORS = {"AND", "OR", "NOT"}
+
+# NewsAPI syntax beyond bare terms: operators, quoted phrases, grouping and +/- prefixes
+_QUERY_SYNTAX = re.compile(r'\b(?:AND|OR|NOT)\b|["()]|(?:^|\s)[+-]')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key form of a search query.
+
+    Bare terms are ANDed by NewsAPI, so a plain term list is made case- and
+    order-insensitive. Queries using operators, phrases, grouping or +/-
+    prefixes mean something else when reordered; only their case (operators
+    excepted) and whitespace are collapsed.
+    """
+    if _QUERY_SYNTAX.search(query):
+        return " ".join(token if token in _OPERATORS else token.lower() for token in query.split())
+    return " ".join(sorted(set(query.lower().split())))
+
+
+class NewsQuota:
+    """
+    Tracks NewsAPI requests against the plan's daily allowance.
+
+    Requests are counted over a rolling 24 hour window. A 429 from NewsAPI
+    marks the quota exhausted for NEWS_API_RATE_LIMIT_BACKOFF_SECONDS
+    regardless of the local count (other processes share the key).
+    """
+
+    def __init__(self):
+        self._requests: Deque[float] = deque()
+        self._exhausted_until = 0.0
+
+    def _prune(self, now: float):
+        while self._requests and now - self._requests[0] > QUOTA_WINDOW_SECONDS:
+            self._requests.popleft()
+
+    def remaining(self) -> int:
+        now = time.time()
+        if now < self._exhausted_until:
+            return 0
+        self._prune(now)
+        return max(0, settings.NEWS_API_DAILY_QUOTA - len(self._requests))
+
+    def try_acquire(self, reserve: int = 0) -> bool:
+        """
+        Count one request if more than ``reserve`` requests remain.
+
+        Returns:
+            True if the request may be sent
+        """
+        if self.remaining() <= reserve:
+            return False
+        self._requests.append(time.time())
+        return True
+
+    def mark_exhausted(self):
+        """NewsAPI rejected a request for rate limiting."""
+        self._exhausted_until = time.time() + settings.NEWS_API_RATE_LIMIT_BACKOFF_SECONDS
+        logger.warning("NewsAPI rate limit reached, serving cached news only")
+
+    def stats(self) -> Dict[str, Any]:
+        remaining = self.remaining()
+        now = time.time()
+        if now < self._exhausted_until:
+            resets_in = self._exhausted_until - now
+        elif self._requests and remaining == 0:
+            resets_in = QUOTA_WINDOW_SECONDS - (now - self._requests[0])
+        else:
+            resets_in = 0.0
+        return {
+            "limit": settings.NEWS_API_DAILY_QUOTA,
+            "used": len(self._requests),
+            "remaining": remaining,
+            "resets_in_seconds": round(resets_in)
+        }
+
+
+class _Entry:
+    __slots__ = ("fetched_at", "page_size", "articles")
+
+    def __init__(self, fetched_at: float, page_size: int, articles: List[Dict[str, Any]]):
+        self.fetched_at = fetched_at
+        self.page_size = page_size
+        self.articles = articles
+
+
+class NewsResponseCache:
+    """
+    Stale-while-revalidate cache for NewsAPI responses.
+
+    Entries younger than NEWS_CACHE_TTL_SECONDS are served as is. Older
+    entries, up to NEWS_CACHE_STALE_SECONDS, are served immediately while one
+    background refresh runs. Anything older, or a miss, is fetched inline,
+    with concurrent callers sharing one upstream request. When the quota is
+    spent or the fetch fails, any cached entry up to NEWS_CACHE_MAX_STALE_SECONDS
+    old is served instead.
+
+    Results for a larger page answer requests for a smaller one (results are
+    relevancy or recency ordered).
+    """
+
+    def __init__(self, quota: NewsQuota):
+        self.quota = quota
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._inflight: Dict[Tuple[CacheKey, int], asyncio.Future] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+        self._counters = {
+            "fresh_hits": 0, "stale_hits": 0, "shared_fetches": 0, "misses": 0, "refreshes": 0,
+            "stale_fallbacks": 0, "quota_rejections": 0
+        }
+
+    async def get(self, key: CacheKey, page_size: int, fetch: Fetcher, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Cached articles for ``key``, fetching through ``fetch(page_size)`` as needed.
+
+        ``fetch`` returns None when the upstream request failed. With
+        ``refresh`` the cached entry is only used as a fallback.
+        """
+        entry = self._entries.get(key)
+        if refresh or (entry is not None and entry.page_size < page_size):
+            entry = None  # A smaller page cannot answer this request
+
+        age = time.monotonic() - entry.fetched_at if entry is not None else None
+
+        if entry is not None and age <= settings.NEWS_CACHE_TTL_SECONDS:
+            self._counters["fresh_hits"] += 1
+            self._entries.move_to_end(key)
+            return list(entry.articles[:page_size])
+
+        if entry is not None and age <= settings.NEWS_CACHE_STALE_SECONDS:
+            self._counters["stale_hits"] += 1
+            self._entries.move_to_end(key)
+            self._schedule_refresh(key, entry.page_size, fetch)
+            return list(entry.articles[:page_size])
+
+        if (key, page_size) in self._inflight:
+            self._counters["shared_fetches"] += 1
+        else:
+            self._counters["misses"] += 1
+        articles = await self._fetch_shared(key, page_size, fetch, reserve=0)
+        if articles is not None:
+            return list(articles[:page_size])
+
+        fallback = self._stale_fallback(key, page_size)
+        if fallback is not None:
+            self._counters["stale_fallbacks"] += 1
+            return fallback
+        return []
+
+    def _stale_fallback(self, key: CacheKey, page_size: int) -> Optional[List[Dict[str, Any]]]:
+        """Any cached articles for ``key`` (even a smaller page) when nothing fresher is available."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.fetched_at > settings.NEWS_CACHE_MAX_STALE_SECONDS:
+            return None
+        return list(entry.articles[:page_size])
+
+    async def _fetch_shared(
+        self,
+        key: CacheKey,
+        page_size: int,
+        fetch: Fetcher,
+        reserve: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch and store ``key``, sharing one upstream request between concurrent callers."""
+        inflight_key = (key, page_size)
+        future = self._inflight.get(inflight_key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        if not self.quota.try_acquire(reserve):
+            self._counters["quota_rejections"] += 1
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        try:
+            articles = await fetch(page_size)
+            if articles is not None:
+                self._store(key, page_size, articles)
+            future.set_result(articles)
+            return articles
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; avoid "never retrieved" warnings
+            raise
+        finally:
+            self._inflight.pop(inflight_key, None)
+
+    def _schedule_refresh(self, key: CacheKey, page_size: int, fetch: Fetcher):
+        if (key, page_size) in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                if await self._fetch_shared(key, page_size, fetch, reserve=settings.NEWS_API_QUOTA_RESERVE) is not None:
+                    self._counters["refreshes"] += 1
+            except Exception as e:
+                logger.error(f"Background news refresh failed for {key[1]!r}: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    def _store(self, key: CacheKey, page_size: int, articles: List[Dict[str, Any]]):
+        self._entries[key] = _Entry(time.monotonic(), page_size, articles)
+        self._entries.move_to_end(key)
+
+        now = time.monotonic()
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if len(self._entries) <= settings.NEWS_CACHE_MAX_ENTRIES and now - oldest.fetched_at <= settings.NEWS_CACHE_MAX_STALE_SECONDS:
+                break
+            del self._entries[oldest_key]
+
+    def clear(self):
+        self._entries.clear()
+
+    async def close(self):
+        """Cancel background refreshes."""
+        tasks = list(self._refreshes)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        # Callers that joined another caller's upstream request did not spend quota
+        hits = self._counters["fresh_hits"] + self._counters["stale_hits"] + self._counters["shared_fetches"]
+        lookups = hits + self._counters["misses"]
+        return {
+            "entries": len(self._entries),
+            **self._counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+        }
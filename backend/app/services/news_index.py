@@ -0,0 +1,472 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timezone
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+from ..core.config import settings
+from .telemetry import registry
+
+logger = logging.getLogger(__name__)
+
+NEWS_INDEX_SEARCHES = registry.histogram(
+    "news_index_search_seconds", "Local news index search latency", ("outcome",)
+)
+
+# Column weights for BM25 ranking: title, description, content
+_BM25_WEIGHTS = (5.0, 2.0, 1.0)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Quoted phrase, parenthesis or whitespace-delimited word of a NewsAPI query
+_QUERY_TOKEN = re.compile(r'"[^"]*"?|[()]|[^\s()"]+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_hash TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    content TEXT,
+    source TEXT,
+    published_at TEXT,
+    published_ts REAL,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_articles_published_ts ON articles (published_ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, description, content,
+    content='articles', content_rowid='id',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, description, content)
+    VALUES (new.id, new.title, new.description, new.content);
+END;
+CREATE TABLE IF NOT EXISTS article_tickers (
+    article_id INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    published_ts REAL,
+    PRIMARY KEY (ticker, article_id)
+);
+CREATE INDEX IF NOT EXISTS ix_article_tickers_ticker_published ON article_tickers (ticker, published_ts DESC);
+CREATE TABLE IF NOT EXISTS ticker_refreshes (
+    ticker TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, description, content)
+    VALUES ('delete', old.id, old.title, old.description, old.content);
+    DELETE FROM article_tickers WHERE article_id = old.id;
+END;
+"""
+
+_ARTICLE_COLUMNS = "a.title, a.description, a.source, a.url, a.published_at, a.content"
+
+
+def url_hash(url: str) -> str:
+    """Identity of an article URL (scheme, host case, fragment and trailing slash ignored)."""
+    parts = urlsplit(url.strip())
+    normalized = urlunsplit(("", parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _parse_published(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.timestamp()
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for a NewsAPI ``q`` query.
+
+    Bare terms are all required, as NewsAPI does. Quoted phrases, AND / OR /
+    NOT, parentheses and +/- prefixes keep their NewsAPI meaning. Terms are
+    always quoted, so a query never injects FTS5 syntax of its own.
+
+    Returns:
+        The expression, or None when there is nothing to search for or the
+        query has no FTS5 equivalent (e.g. it starts with NOT)
+    """
+    parts: List[str] = []
+    expect_operand = True  # At the start, after an operator or after "("
+    depth = 0
+
+    for token in _QUERY_TOKEN.findall(query):
+        if token in ("AND", "OR", "NOT"):
+            if token == "NOT" and parts and parts[-1] == "AND":
+                parts[-1] = "NOT"  # "a AND NOT b"
+                continue
+            if expect_operand:
+                return None
+            parts.append(token)
+            expect_operand = True
+        elif token == "(":
+            if not expect_operand:
+                parts.append("AND")
+            parts.append(token)
+            expect_operand = True
+            depth += 1
+        elif token == ")":
+            if expect_operand or depth == 0:
+                return None
+            parts.append(token)
+            depth -= 1
+        else:
+            excluded = token.startswith("-")
+            terms = _TERM.findall(token.lower())
+            if not terms:
+                continue
+            if excluded and expect_operand:
+                return None
+            if not expect_operand:
+                parts.append("NOT" if excluded else "AND")
+            parts.append('"' + " ".join(terms) + '"')
+            expect_operand = False
+
+    if expect_operand or depth:
+        return None
+    return " ".join(parts)
+
+
+class NewsIndex:
+    """
+    Local store and full-text index of ingested news articles (SQLite FTS5).
+
+    Articles are deduplicated by URL hash and ranked with BM25 (title matches
+    weigh most). Articles can be tagged with tickers, indexed by ticker and
+    publish time for per-ticker reads. The store lives in its own SQLite file
+    (NEWS_INDEX_PATH) and is accessed from worker threads, so reads never block
+    the event loop.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.NEWS_INDEX_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._unavailable = False
+        self._pruned_at = 0.0
+        # Kept in memory so stats() never waits on the lock or SQLite
+        self._article_count: Optional[int] = None
+        self._stored = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.NEWS_INDEX_ENABLED and not self._unavailable
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the index and create its schema on first use (caller holds the lock)."""
+        if self._conn is None and not self._unavailable:
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+                self._article_count = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+                self._prune_locked()
+            except sqlite3.Error as e:
+                # SQLite builds without FTS5 cannot host the index; fall back to NewsAPI only
+                logger.error(f"News index unavailable ({self.path}): {e}")
+                self._unavailable = True
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def ingest(self, articles: Iterable[Dict[str, Any]], refreshed_tickers: Iterable[str] = ()) -> int:
+        """
+        Add articles to the store, skipping URLs already present.
+
+        Accepts both processed articles and raw NewsAPI articles. An optional
+        ``tickers`` list on an article tags it with those tickers (also when
+        the article itself was already stored). Rows are written in
+        transactions of NEWS_INGEST_BATCH_SIZE articles.
+
+        Args:
+            articles: Articles to store
+            refreshed_tickers: Tickers whose news was just fetched in full
+
+        Returns:
+            Number of newly stored articles
+        """
+        if not self.enabled:
+            return 0
+        rows = []
+        tags = []
+        seen = set()
+        now = time.time()
+        for article in articles:
+            url = article.get("url")
+            if not url:
+                continue
+            key = url_hash(url)
+            for ticker in article.get("tickers") or ():
+                tags.append((ticker.upper(), key))
+            if key in seen:
+                continue
+            seen.add(key)
+            source = article.get("source")
+            published_at = article.get("published_at") or article.get("publishedAt")
+            rows.append((
+                key, url, article.get("title"), article.get("description"),
+                (article.get("content") or "")[:2000],
+                source.get("name") if isinstance(source, dict) else source,
+                published_at, _parse_published(published_at), now
+            ))
+        refreshes = [(ticker.upper(), now) for ticker in refreshed_tickers]
+        if not rows and not refreshes:
+            return 0
+        return await asyncio.to_thread(self._insert, rows, tags, refreshes)
+
+    async def retag(self, articles: Iterable[Dict[str, Any]], refreshed_tickers: Iterable[str] = ()):
+        """
+        Tag stored articles with their ``tickers`` lists and record refreshed tickers.
+
+        For articles that were stored when fetched (see ``NewsService._index``)
+        but carry tickers only the caller knows, such as a queried ticker
+        missing from the symbol master. Article rows are not written again.
+
+        Args:
+            articles: Stored articles with ``tickers`` lists
+            refreshed_tickers: Tickers whose news was just fetched in full
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        tags = [
+            (ticker.upper(), url_hash(article["url"]))
+            for article in articles if article.get("url")
+            for ticker in article.get("tickers") or ()
+        ]
+        refreshes = [(ticker.upper(), now) for ticker in refreshed_tickers]
+        if tags or refreshes:
+            await asyncio.to_thread(self._insert, [], tags, refreshes)
+
+    def _insert(self, rows: List[tuple], tags: List[tuple], refreshes: List[tuple]) -> int:
+        batch_size = max(1, settings.NEWS_INGEST_BATCH_SIZE)
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            inserted = 0
+            for start in range(0, len(rows), batch_size):
+                with conn:
+                    # rowcount leaves out the FTS rows written by the insert trigger
+                    inserted += conn.executemany(
+                        "INSERT OR IGNORE INTO articles "
+                        "(url_hash, url, title, description, content, source, published_at, published_ts, ingested_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows[start:start + batch_size]
+                    ).rowcount
+            self._article_count += inserted
+            self._stored += inserted
+            for start in range(0, len(tags), batch_size):
+                with conn:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO article_tickers (article_id, ticker, published_ts) "
+                        "SELECT id, ?, published_ts FROM articles WHERE url_hash = ?",
+                        tags[start:start + batch_size]
+                    )
+            if refreshes:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO ticker_refreshes (ticker, refreshed_at) VALUES (?, ?) "
+                        "ON CONFLICT (ticker) DO UPDATE SET refreshed_at = excluded.refreshed_at",
+                        refreshes
+                    )
+            if time.time() - self._pruned_at >= settings.NEWS_INDEX_PRUNE_INTERVAL_HOURS * 3600:
+                self._prune_locked()
+            return inserted
+
+    async def ticker_articles(
+        self,
+        ticker: str,
+        since: Optional[datetime] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], Optional[float]]:
+        """
+        Stored articles tagged with ``ticker``, newest first.
+
+        Returns:
+            (articles, unix time the ticker's news was last refreshed or None)
+        """
+        if not self.enabled:
+            return [], None
+        return await asyncio.to_thread(self._ticker_articles, ticker.upper(), since, limit)
+
+    def _ticker_articles(
+        self,
+        ticker: str,
+        since: Optional[datetime],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[float]]:
+        since_ts = since.replace(tzinfo=since.tzinfo or timezone.utc).timestamp() if since is not None else 0.0
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return [], None
+            rows = conn.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM article_tickers t JOIN articles a ON a.id = t.article_id "
+                "WHERE t.ticker = ? AND t.published_ts >= ? ORDER BY t.published_ts DESC LIMIT ?",
+                (ticker, since_ts, limit)
+            ).fetchall()
+            refreshed = conn.execute(
+                "SELECT refreshed_at FROM ticker_refreshes WHERE ticker = ?", (ticker,)
+            ).fetchone()
+        return [dict(row) for row in rows], refreshed[0] if refreshed else None
+
+    async def search(
+        self,
+        query: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Articles matching ``query``, best BM25 match first.
+
+        Args:
+            query: NewsAPI-style query (see ``match_expression``)
+            since: Only articles published at or after this time
+            until: Only articles published before this time
+            limit: Maximum number of articles
+            offset: Matches to skip (pages are read with LIMIT/OFFSET in SQLite)
+
+        Returns:
+            Articles in the processed NewsService format
+        """
+        expression = match_expression(query)
+        if not self.enabled or expression is None:
+            return []
+        started = time.monotonic()
+        try:
+            results = await asyncio.to_thread(self._search, expression, since, until, limit, offset)
+        except sqlite3.Error as e:
+            logger.error(f"News index search failed for {query!r}: {e}")
+            results = []
+        NEWS_INDEX_SEARCHES.observe(time.monotonic() - started, outcome="hit" if results else "miss")
+        return results
+
+    async def count(
+        self,
+        query: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> int:
+        """Number of articles ``search`` would return with this ``limit`` (no rows are read)."""
+        expression = match_expression(query)
+        if not self.enabled or expression is None:
+            return 0
+        try:
+            return await asyncio.to_thread(self._count, expression, since, until, limit)
+        except sqlite3.Error as e:
+            logger.error(f"News index count failed for {query!r}: {e}")
+            return 0
+
+    @staticmethod
+    def _match_clauses(
+        expression: str,
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> Tuple[str, List[Any]]:
+        clauses = ["articles_fts MATCH ?"]
+        params: List[Any] = [expression]
+        if since is not None:
+            clauses.append("a.published_ts >= ?")
+            params.append(since.replace(tzinfo=since.tzinfo or timezone.utc).timestamp())
+        if until is not None:
+            clauses.append("a.published_ts < ?")
+            params.append(until.replace(tzinfo=until.tzinfo or timezone.utc).timestamp())
+        return (
+            f"FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid WHERE {' AND '.join(clauses)}",
+            params
+        )
+
+    def _search(
+        self,
+        expression: str,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        limit: int,
+        offset: int
+    ) -> List[Dict[str, Any]]:
+        where, params = self._match_clauses(expression, since, until)
+        # The id tiebreaker keeps the order stable between pages
+        sql = (
+            f"SELECT {_ARTICLE_COLUMNS} {where} "
+            f"ORDER BY bm25(articles_fts, {', '.join(str(w) for w in _BM25_WEIGHTS)}), a.published_ts DESC, a.id "
+            "LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+            return [dict(row) for row in conn.execute(sql, [*params, limit, offset])]
+
+    def _count(
+        self,
+        expression: str,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        limit: int
+    ) -> int:
+        where, params = self._match_clauses(expression, since, until)
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            return conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 {where} LIMIT ?)", [*params, limit]).fetchone()[0]
+
+    def _prune_locked(self):
+        """
+        Drop articles older than the retention period (caller holds the lock).
+
+        Runs when the index is opened and then after ingests, at most once per
+        NEWS_INDEX_PRUNE_INTERVAL_HOURS. Articles without a publish time age
+        from when they were ingested.
+        """
+        self._pruned_at = time.time()
+        cutoff = self._pruned_at - settings.NEWS_INDEX_RETENTION_DAYS * 86400
+        with self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM articles WHERE published_ts < ? OR (published_ts IS NULL AND ingested_at < ?)",
+                (cutoff, cutoff)
+            ).rowcount
+        self._article_count -= removed
+        if removed:
+            logger.info(f"Pruned {removed} articles older than {settings.NEWS_INDEX_RETENTION_DAYS} days from the news index")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Article counters, read from memory (safe to call on the event loop).
+
+        ``articles`` is None until the index is first opened; ``stored``
+        counts articles newly stored by this process.
+        """
+        if not self.enabled:
+            return {"enabled": False}
+        return {"enabled": True, "articles": self._article_count, "stored": self._stored}
+
+
+# Global instance
+news_index = NewsIndex()
@@ -0,0 +1,131 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+from datetime import datetime
+
+from ..core.config import settings
+from .news_service import news_service
+from .news_index import news_index
+from .insight_store import insight_store
+from .news_planner import batch_query, plan_queries
+from .ticker_index import ticker_index
+
+logger = logging.getLogger(__name__)
+
+
+class NewsIngestionWorker:
+    """
+    Scheduled worker that keeps the local article store current.
+
+    Each cycle fetches top headlines for NEWS_INGEST_CATEGORIES and news for
+    the most-watched tickers, several tickers per NewsAPI query (see
+    ``plan_queries``), continuing where the previous cycle stopped so every
+    ticker is refreshed in turn. A cycle spends at most its share of the
+    daily NewsAPI quota (NEWS_INGEST_QUOTA_SHARE spread over the cycles in a
+    day) and stops at NEWS_API_QUOTA_RESERVE. Articles are tagged with every
+    ticker they mention (see ``TickerIndex``) and written to the store in
+    batched transactions, from which the agents and news search read.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._cursor = 0
+        self._stats: Dict[str, Any] = {"cycles": 0, "requests": 0, "articles_fetched": 0, "articles_stored": 0, "last_cycle_at": None}
+
+    async def start(self):
+        """Start the ingestion loop if enabled."""
+        if not settings.NEWS_INGEST_ENABLED or not news_index.enabled:
+            return
+        self._task = asyncio.create_task(self._loop(), name="news-ingestion")
+        logger.info("News ingestion worker started")
+
+    async def stop(self):
+        """Stop the ingestion loop."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"News ingestion cycle failed: {e}")
+
+            await asyncio.sleep(settings.NEWS_INGEST_INTERVAL_MINUTES * 60)
+
+    def cycle_budget(self) -> int:
+        """NewsAPI requests one cycle may spend."""
+        cycles_per_day = max(1, 1440 // max(1, settings.NEWS_INGEST_INTERVAL_MINUTES))
+        return max(1, int(settings.NEWS_API_DAILY_QUOTA * settings.NEWS_INGEST_QUOTA_SHARE / cycles_per_day))
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Run one ingestion cycle.
+
+        Returns:
+            Requests made, articles fetched and articles newly stored
+        """
+        tickers = await insight_store.most_watched_tickers(settings.NEWS_INGEST_TOP_TICKERS)
+        work = [("headlines", category) for category in settings.NEWS_INGEST_CATEGORIES]
+        work += [("tickers", group) for group in plan_queries(tickers)]
+
+        stats = {"requests": 0, "articles_fetched": 0, "articles_stored": 0}
+        stored_before = news_index.stats().get("stored", 0)
+
+        for _ in range(min(self.cycle_budget(), len(work))):
+            if news_service.quota.remaining() <= settings.NEWS_API_QUOTA_RESERVE:
+                logger.info("NewsAPI quota reserve reached, ending ingestion cycle early")
+                break
+
+            kind, target = work[self._cursor % len(work)]
+            self._cursor += 1
+
+            if kind == "headlines":
+                articles = await news_service.get_market_news(
+                    target, max_articles=settings.NEWS_INGEST_PAGE_SIZE, refresh=True
+                )
+                refreshed: List[str] = []
+            else:
+                articles = await news_service.get_stock_news(
+                    batch_query(target),
+                    days_back=settings.NEWS_INGEST_DAYS_BACK,
+                    max_articles=settings.NEWS_INGEST_PAGE_SIZE,
+                    refresh=True,
+                    sort_by="publishedAt" if len(target) > 1 else "relevancy"
+                )
+                refreshed = target
+
+            stats["requests"] += 1
+            stats["articles_fetched"] += len(articles)
+            tagged = await asyncio.to_thread(self._tag, articles, refreshed)
+            # Only tickers the results actually covered count as refreshed
+            mentioned = {ticker for article in tagged for ticker in article["tickers"]}
+            # Fetching stored the articles; record the refresh and trusted tags only
+            await news_index.retag(tagged, refreshed_tickers=[ticker for ticker in refreshed if ticker in mentioned])
+
+        stats["articles_stored"] = news_index.stats().get("stored", 0) - stored_before
+
+        self._stats["cycles"] += 1
+        for key in ("requests", "articles_fetched", "articles_stored"):
+            self._stats[key] += stats[key]
+        self._stats["last_cycle_at"] = datetime.utcnow().isoformat()
+
+        logger.info(f"News ingestion cycle finished: {stats}")
+        return stats
+
+    def _tag(self, articles: List[Dict[str, Any]], queried: List[str]) -> List[Dict[str, Any]]:
+        """Tag articles with the tickers they mention; queried tickers missing from the symbol master are trusted."""
+        trusted = {ticker.upper() for ticker in queried if not ticker_index.knows(ticker)}
+        return [
+            {**article, "tickers": sorted({*article["tickers"], *trusted})}
+            for article in ticker_index.tag(articles)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self._task is not None, "cycle_budget": self.cycle_budget(), **self._stats}
+
+
+# Global instance
+news_ingestion_worker = NewsIngestionWorker()
@@ -0,0 +1,151 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import base64
+import binascii
+import hashlib
+import json
+
+from .news_index import url_hash
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another query."""
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """Short identity of a news query, bound into its cursors."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(fingerprint: str, offset: int, anchor: Optional[str]) -> str:
+    """Opaque cursor for the page starting at ``offset`` (after the article hashed ``anchor``)."""
+    payload = json.dumps({"q": fingerprint, "o": offset, "a": anchor}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Tuple[int, Optional[str]]:
+    """
+    Position encoded in a cursor.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a different query
+
+    Returns:
+        (offset, anchor article hash)
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset, anchor = int(payload["o"]), payload.get("a")
+        issued_for = payload["q"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Malformed cursor") from None
+    if issued_for != fingerprint or offset < 0:
+        raise InvalidCursorError("Cursor does not belong to this query")
+    return offset, anchor
+
+
+def _article_key(article: Dict[str, Any]) -> Optional[str]:
+    url = article.get("url")
+    return url_hash(url)[:16] if url else None
+
+
+def page_range(
+    articles: List[Dict[str, Any]],
+    fingerprint: str,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[int, int, Optional[str]]:
+    """
+    Bounds of one page of ``articles`` and the cursor of the next page.
+
+    The cursor remembers the last article served, so when the underlying
+    results were refreshed between pages the next page resumes right after
+    that article rather than at a shifted offset.
+
+    Raises:
+        InvalidCursorError: If ``cursor`` is invalid for this query
+
+    Returns:
+        (start, end, next cursor or None on the last page)
+    """
+    start = 0
+    if cursor:
+        start, anchor = decode_cursor(cursor, fingerprint)
+        if anchor and not (0 < start <= len(articles) and _article_key(articles[start - 1]) == anchor):
+            keys = [_article_key(article) for article in articles]
+            if anchor in keys:
+                start = keys.index(anchor) + 1
+
+    start = min(start, len(articles))
+    end = min(start + limit, len(articles))
+    next_cursor = encode_cursor(fingerprint, end, _article_key(articles[end - 1])) if start < end < len(articles) else None
+    return start, end, next_cursor
+
+
+def paginate(
+    articles: List[Dict[str, Any]],
+    fingerprint: str,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of ``articles`` and the cursor of the next page (see ``page_range``).
+
+    Returns:
+        (page, next cursor or None on the last page)
+    """
+    start, end, next_cursor = page_range(articles, fingerprint, cursor, limit)
+    return articles[start:end], next_cursor
+
+
+def source_window(cursor: Optional[str], fingerprint: str, limit: int) -> Tuple[int, int]:
+    """
+    Rows to read at the source for one page, as (start, count).
+
+    The window also covers the cursor's anchor row right before the page
+    (to check the results did not shift) and one row after it (to tell
+    whether there is a next page).
+
+    Raises:
+        InvalidCursorError: If ``cursor`` is invalid for this query
+    """
+    offset, anchor = decode_cursor(cursor, fingerprint) if cursor else (0, None)
+    before = 1 if offset and anchor else 0
+    return offset - before, limit + before + 1
+
+
+def page_from_window(
+    window: List[Dict[str, Any]],
+    fingerprint: str,
+    cursor: Optional[str],
+    limit: int
+) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """
+    One page and the next cursor from rows read with ``source_window``.
+
+    Returns:
+        (page, next cursor or None on the last page), or None when the anchor
+        is no longer right before the page; the caller then pages the full
+        results with ``paginate``, which looks the anchor up
+    """
+    offset, anchor = decode_cursor(cursor, fingerprint) if cursor else (0, None)
+    if offset and anchor:
+        if not window or _article_key(window[0]) != anchor:
+            return None
+        window = window[1:]
+    page = window[:limit]
+    next_cursor = encode_cursor(fingerprint, offset + len(page), _article_key(page[-1])) if len(window) > limit else None
+    return page, next_cursor
+
+
+def ndjson_lines(articles: List[Dict[str, Any]], next_cursor: Optional[str]) -> Iterator[str]:
+    """
+    NDJSON body: one article per line, then a ``{"next_cursor": ...}`` line.
+
+    Lines are serialized as they are sent, so the full response body is never
+    built in memory.
+    """
+    for article in articles:
+        yield json.dumps(article, default=str) + "\n"
+    yield json.dumps({"next_cursor": next_cursor}) + "\n"
@@ -0,0 +1,170 @@
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+import asyncio
+import logging
+
+from ..core.config import settings
+from .ticker_index import ticker_index
+
+logger = logging.getLogger(__name__)
+
+# fetch(query, days_back, page_size, sort_by) -> articles ([] when nothing could be fetched)
+QueryFetcher = Callable[[str, int, int, str], Awaitable[List[Dict[str, Any]]]]
+
+NEWS_API_MAX_PAGE_SIZE = 100
+
+
+def plan_queries(tickers: List[str]) -> List[List[str]]:
+    """
+    Pack tickers into groups that can share one NewsAPI query.
+
+    Each group's combined query (see ``batch_query``) stays within
+    NEWS_API_MAX_QUERY_LENGTH and holds at most NEWS_BATCH_MAX_TICKERS
+    tickers. Tickers missing from the symbol master cannot be told apart in
+    combined results, so each gets a group of its own.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    length = 0
+    for ticker in sorted(set(tickers)):
+        if not ticker_index.knows(ticker):
+            groups.append([ticker])
+            continue
+        query_length = len(ticker_index.news_query(ticker))
+        added_length = query_length + (len(" OR ") if current else 0)
+        if current and (
+            len(current) >= settings.NEWS_BATCH_MAX_TICKERS
+            or length + added_length > settings.NEWS_API_MAX_QUERY_LENGTH
+        ):
+            groups.append(current)
+            current, length, added_length = [], 0, query_length
+        current.append(ticker)
+        length += added_length
+    if current:
+        groups.append(current)
+    return groups
+
+
+def batch_query(tickers: List[str]) -> str:
+    """One NewsAPI query matching news about any of ``tickers``."""
+    return " OR ".join(ticker_index.news_query(ticker) for ticker in tickers)
+
+
+def split_by_ticker(articles: List[Dict[str, Any]], tickers: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Assign articles to the tickers they mention.
+
+    Articles are tagged with ``TickerIndex``; a ticker missing from the symbol
+    master (always queried alone) keeps every article.
+    """
+    tagged = ticker_index.tag(articles)
+    split: Dict[str, List[Dict[str, Any]]] = {}
+    for ticker in tickers:
+        if ticker_index.knows(ticker):
+            split[ticker] = [article for article in tagged if ticker in article["tickers"]]
+        else:
+            split[ticker] = [{**article, "tickers": sorted({*article["tickers"], ticker})} for article in tagged]
+    return split
+
+
+class NewsFetchPlanner:
+    """
+    Batches concurrent per-ticker news fetches into shared NewsAPI queries.
+
+    Requests arriving within NEWS_BATCH_WINDOW_MS of each other (for example
+    the per-ticker agents of one multi-ticker analysis) are grouped by look-back
+    window, packed into OR queries by ``plan_queries`` and fetched once, newest
+    first. The combined results are split back out per ticker by entity
+    matching. A ticker that a combined query returned nothing for is fetched
+    on its own, so a heavily covered company cannot crowd a quiet one out
+    entirely.
+    """
+
+    def __init__(self, fetch: QueryFetcher):
+        self._fetch = fetch
+        self._pending: Dict[int, Dict[str, List[Tuple[int, asyncio.Future]]]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._counters = {"ticker_requests": 0, "batches": 0, "queries": 0, "followups": 0}
+
+    async def fetch(self, ticker: str, days_back: int, max_articles: int) -> List[Dict[str, Any]]:
+        """
+        News mentioning ``ticker``, fetched together with concurrent requests.
+
+        Returns:
+            Up to ``max_articles`` articles, each with a ``tickers`` list
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._counters["ticker_requests"] += 1
+
+        group = self._pending.get(days_back)
+        if group is None:
+            group = self._pending[days_back] = {}
+            loop.call_later(settings.NEWS_BATCH_WINDOW_MS / 1000, self._flush, days_back)
+        group.setdefault(ticker.upper(), []).append((max_articles, future))
+        return await future
+
+    def _flush(self, days_back: int):
+        group = self._pending.pop(days_back, None)
+        if not group:
+            return
+        self._counters["batches"] += 1
+        for tickers in plan_queries(list(group)):
+            task = asyncio.create_task(self._run(tickers, days_back, {ticker: group[ticker] for ticker in tickers}))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, tickers: List[str], days_back: int, waiters: Dict[str, List[Tuple[int, asyncio.Future]]]):
+        wanted = {ticker: max(limit for limit, _ in waiters[ticker]) for ticker in tickers}
+        try:
+            if len(tickers) == 1:
+                ticker = tickers[0]
+                articles = await self._query(ticker_index.news_query(ticker), days_back, wanted[ticker], "relevancy")
+                split = await asyncio.to_thread(split_by_ticker, articles, tickers)
+            else:
+                page_size = min(NEWS_API_MAX_PAGE_SIZE, sum(wanted.values()))
+                articles = await self._query(batch_query(tickers), days_back, page_size, "publishedAt")
+                split = await asyncio.to_thread(split_by_ticker, articles, tickers)
+
+                starved = [ticker for ticker in tickers if not split[ticker]]
+                if starved:
+                    self._counters["followups"] += len(starved)
+                    followups = await asyncio.gather(*(
+                        self._query(ticker_index.news_query(ticker), days_back, wanted[ticker], "relevancy")
+                        for ticker in starved
+                    ))
+                    for ticker, ticker_articles in zip(starved, followups):
+                        split[ticker] = (await asyncio.to_thread(split_by_ticker, ticker_articles, [ticker]))[ticker]
+
+            for ticker in tickers:
+                for limit, future in waiters[ticker]:
+                    if not future.done():
+                        future.set_result(split[ticker][:limit])
+        except Exception as e:
+            logger.error(f"Batched news fetch failed for {tickers}: {e}")
+            for ticker in tickers:
+                for _, future in waiters[ticker]:
+                    if not future.done():
+                        future.set_exception(e)
+        except asyncio.CancelledError:
+            for ticker in tickers:
+                for _, future in waiters[ticker]:
+                    future.cancel()
+            raise
+
+    async def _query(self, query: str, days_back: int, page_size: int, sort_by: str) -> List[Dict[str, Any]]:
+        self._counters["queries"] += 1
+        return await self._fetch(query, days_back, page_size, sort_by)
+
+    async def close(self):
+        """Cancel batches in flight."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        queries = self._counters["queries"]
+        return {
+            **self._counters,
+            "requests_per_query": round(self._counters["ticker_requests"] / queries, 2) if queries else 0.0
+        }
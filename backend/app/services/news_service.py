@@ -1,99 +1,382 @@
 import aiohttp
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import ssl
+import time
 
 from ..core.config import settings
+from .telemetry import registry
+from .news_cache import NewsQuota, NewsResponseCache, normalize_query
+from .news_index import news_index
+from .news_planner import NewsFetchPlanner
+from .sentiment import article_text, sentiment_engine
+from .ticker_index import ticker_index
 
 logger = logging.getLogger(__name__)
 
+NEWS_API_REQUESTS = registry.histogram(
+    "news_api_request_seconds", "NewsAPI request latency", ("endpoint", "status")
+)
+
 
 class NewsService:
     """Service for fetching financial news and sentiment data."""
 
     def __init__(self):
         self.api_key = settings.NEWS_API_KEY
-        self.base_url = "https://newsapi.org/v2"
+        self.base_url = settings.NEWS_API_BASE_URL
+        self.quota = NewsQuota()
+        self.cache = NewsResponseCache(self.quota)
+        self.planner = NewsFetchPlanner(
+            lambda query, days_back, page_size, sort_by: self.get_stock_news(
+                query, days_back=days_back, max_articles=page_size, sort_by=sort_by
+            )
+        )
+        self._search_counts = {"local": 0, "upstream": 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions_created = 0
+        self._requests = 0
+        self._request_errors = 0
+        self._request_seconds = 0.0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Shared keep-alive session for NewsAPI requests, created on first use.
+
+        Connections (and their TLS sessions) are reused across calls, at most
+        NEWS_HTTP_POOL_SIZE at a time. The session is closed by ``close()``
+        at shutdown.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            # Create SSL context that doesn't verify certificates (for development)
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_context,
+                limit=settings.NEWS_HTTP_POOL_SIZE,
+                keepalive_timeout=settings.NEWS_HTTP_KEEPALIVE_SECONDS,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=settings.NEWS_HTTP_TIMEOUT_SECONDS,
+                    sock_connect=settings.NEWS_HTTP_CONNECT_TIMEOUT_SECONDS
+                )
+            )
+            self._session_loop = loop
+            self._sessions_created += 1
+
+        return self._session
+
+    async def close(self):
+        """Stop background cache refreshes and batched fetches, and close the shared HTTP session."""
+        await self.planner.close()
+        await self.cache.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def _get_json(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        GET a NewsAPI endpoint on the shared session.
+
+        Returns:
+            Decoded JSON body, or None for a non-200 response
+        """
+        started = time.monotonic()
+        status = "error"
+        try:
+            async with self._get_session().get(f"{self.base_url}/{endpoint}", params=params) as response:
+                status = str(response.status)
+                if response.status == 429:
+                    self.quota.mark_exhausted()
+                if response.status != 200:
+                    logger.error(f"News API error: {response.status}")
+                    return None
+                return await response.json()
+        finally:
+            elapsed = time.monotonic() - started
+            self._requests += 1
+            self._request_seconds += elapsed
+            if status != "200":
+                self._request_errors += 1
+            NEWS_API_REQUESTS.observe(elapsed, endpoint=endpoint, status=status)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit rate, remaining NewsAPI quota and HTTP client counters."""
+        return {
+            "cache": self.cache.stats(),
+            "quota": self.quota.stats(),
+            "http": self.http_stats(),
+            "index": {**news_index.stats(), "searches": dict(self._search_counts)},
+            "ticker_index": ticker_index.stats(),
+            "planner": self.planner.stats()
+        }
+
+    def http_stats(self) -> Dict[str, Any]:
+        """Connection pool and request counters for the shared session."""
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        return {
+            "pool_size": settings.NEWS_HTTP_POOL_SIZE,
+            "connections_in_use": len(connector._acquired) if connector is not None else 0,
+            "sessions_created": self._sessions_created,
+            "requests": self._requests,
+            "errors": self._request_errors,
+            "avg_latency_ms": round(self._request_seconds / self._requests * 1000, 1) if self._requests else 0.0
+        }
+
+    async def search_news(
+        self,
+        query: str,
+        days_back: int = 7,
+        max_articles: int = 20,
+        refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Search news, answering from the local index when it has enough matches.
+
+        The local corpus answers when it holds at least
+        min(max_articles, NEWS_INDEX_MIN_RESULTS) matching articles from the
+        window; otherwise, or with ``refresh``, the query goes to NewsAPI
+        (whose results are indexed for next time).
+
+        Args:
+            query: Search query (ticker, company name, topic)
+            days_back: Number of days to look back for news
+            max_articles: Maximum number of articles to return
+            refresh: Skip the local index and the response cache
+
+        Returns:
+            List of news articles with metadata
+        """
+        if not refresh:
+            since = datetime.utcnow() - timedelta(days=days_back)
+            local = await news_index.search(query, since=since, limit=max_articles)
+            if local and len(local) >= min(max_articles, settings.NEWS_INDEX_MIN_RESULTS):
+                self._search_counts["local"] += 1
+                return local
+
+        self._search_counts["upstream"] += 1
+        return await self.get_stock_news(query, days_back=days_back, max_articles=max_articles, refresh=refresh)
+
+    async def search_news_window(
+        self,
+        query: str,
+        days_back: int,
+        max_articles: int,
+        start: int,
+        count: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Articles ``start`` to ``start + count`` of a search the local index answers.
+
+        The window is read at the source with LIMIT/OFFSET, so a page never
+        loads the rest of the result set.
+
+        Returns:
+            The articles (within the first ``max_articles``), or None when the
+            local index would not answer the search (see ``search_news``)
+        """
+        since = datetime.utcnow() - timedelta(days=days_back)
+        matches = await news_index.count(query, since=since, limit=max_articles)
+        if not matches or matches < min(max_articles, settings.NEWS_INDEX_MIN_RESULTS):
+            return None
+        self._search_counts["local"] += 1
+        end = min(start + count, max_articles)
+        if end <= start:
+            return []
+        return await news_index.search(query, since=since, limit=end - start, offset=start)
+
+    async def get_ticker_news(
+        self,
+        ticker: str,
+        days_back: int = 7,
+        max_articles: int = 15
+    ) -> List[Dict[str, Any]]:
+        """
+        News for a ticker, read from the ingested article store when it is current.
+
+        The store answers when the ticker's news was refreshed within
+        NEWS_STORE_MAX_AGE_MINUTES and it holds at least
+        min(max_articles, NEWS_STORE_MIN_ARTICLES) articles from the window.
+        Otherwise the news is fetched by company name and symbol (see
+        ``TickerIndex.news_query``), batched with concurrent requests for
+        other tickers into shared NewsAPI queries (see ``NewsFetchPlanner``),
+        and only articles that actually mention the ticker are kept. Tickers
+        missing from the symbol master are searched as is and every result is
+        kept.
+
+        Args:
+            ticker: Stock ticker symbol
+            days_back: Number of days to look back for news
+            max_articles: Maximum number of articles to return
+
+        Returns:
+            List of news articles, newest first when read from the store
+        """
+        since = datetime.utcnow() - timedelta(days=days_back)
+        stored, refreshed_at = await news_index.ticker_articles(ticker, since=since, limit=max_articles)
+        is_current = refreshed_at is not None and time.time() - refreshed_at <= settings.NEWS_STORE_MAX_AGE_MINUTES * 60
+        if is_current and len(stored) >= min(max_articles, settings.NEWS_STORE_MIN_ARTICLES):
+            return stored
+
+        articles = await self.planner.fetch(ticker, days_back, max_articles)
+        if not articles:
+            return stored  # NewsAPI unavailable or out of quota: older stored news beats none
+        try:
+            # The fetch already stored the articles; only the refresh (and the tag of a ticker
+            # missing from the symbol master) is new
+            await news_index.retag(articles, refreshed_tickers=[ticker])
+        except Exception as e:
+            logger.error(f"Error recording news refresh for {ticker}: {e}")
+        return articles
+
+    async def ticker_sentiment(
+        self,
+        tickers: List[str],
+        days_back: int = 7,
+        bucket_hours: int = 24,
+        max_articles: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Lexicon sentiment of recent news per ticker and time bucket.
+
+        Args:
+            tickers: Stock ticker symbols
+            days_back: Number of days to look back for news
+            bucket_hours: Width of each time bucket
+            max_articles: Maximum articles scored per ticker
+
+        Returns:
+            Per (ticker, bucket) article counts and mean sentiment
+        """
+        results = await asyncio.gather(*(
+            self.get_ticker_news(ticker, days_back=days_back, max_articles=max_articles) for ticker in tickers
+        ))
+        articles, article_tickers, timestamps = [], [], []
+        for ticker, ticker_articles in zip(tickers, results):
+            for article in ticker_articles:
+                try:
+                    published = datetime.fromisoformat((article.get("published_at") or "").replace("Z", "+00:00"))
+                except ValueError:
+                    continue
+                articles.append(article)
+                article_tickers.append(ticker)
+                timestamps.append(published.replace(tzinfo=published.tzinfo or timezone.utc).timestamp())
+
+        scores = [result["score"] for result in sentiment_engine.score_batch([article_text(a) for a in articles])]
+        return sentiment_engine.aggregate(scores, article_tickers, timestamps, bucket_hours * 3600)
 
     async def get_stock_news(
         self,
         ticker: str,
         days_back: int = 7,
-        max_articles: int = 20
+        max_articles: int = 20,
+        refresh: bool = False,
+        sort_by: str = "relevancy"
     ) -> List[Dict[str, Any]]:
         """
         Fetch news articles related to a specific stock ticker.
 
+        Served from the news cache while fresh; see ``NewsResponseCache``.
+
         Args:
-            ticker: Stock ticker symbol
+            ticker: Stock ticker symbol or NewsAPI query
             days_back: Number of days to look back for news
             max_articles: Maximum number of articles to return
+            refresh: Bypass fresh cached results
+            sort_by: NewsAPI ordering: relevancy, publishedAt or popularity
 
         Returns:
             List of news articles with metadata
         """
+        window = f"{days_back}d" if sort_by == "relevancy" else f"{days_back}d/{sort_by}"
+        return await self.cache.get(
+            ("everything", normalize_query(ticker), window),
+            max_articles,
+            lambda page_size: self._fetch_stock_news(ticker, days_back, page_size, sort_by),
+            refresh=refresh
+        )
+
+    async def _fetch_stock_news(
+        self,
+        ticker: str,
+        days_back: int,
+        max_articles: int,
+        sort_by: str = "relevancy"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch news articles for a query from NewsAPI (uncached); None if the request failed."""
         try:
             from_date = (datetime.utcnow() - timedelta(days=days_back)).strftime("%Y-%m-%d")
 
             params = {
                 "q": ticker,
                 "from": from_date,
-                "sortBy": "relevancy",
+                "sortBy": sort_by,
                 "pageSize": max_articles,
                 "apiKey": self.api_key,
                 "language": "en"
             }
 
-            import ssl
+            data = await self._get_json("everything", params)
+            if data is None:
+                return None
 
-            # Create SSL context that doesn't verify certificates (for development)
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
+            # Process and structure articles
+            processed_articles = []
+            for article in data.get("articles", []):
+                processed_articles.append({
+                    "title": article.get("title"),
+                    "description": article.get("description"),
+                    "source": article.get("source", {}).get("name"),
+                    "url": article.get("url"),
+                    "published_at": article.get("publishedAt"),
+                    "content": (article.get("content") or "")[:500]  # Truncate for efficiency
+                })
 
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(f"{self.base_url}/everything", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = data.get("articles", [])
-
-                        # Process and structure articles
-                        processed_articles = []
-                        for article in articles:
-                            processed_articles.append({
-                                "title": article.get("title"),
-                                "description": article.get("description"),
-                                "source": article.get("source", {}).get("name"),
-                                "url": article.get("url"),
-                                "published_at": article.get("publishedAt"),
-                                "content": article.get("content", "")[:500]  # Truncate for efficiency
-                            })
-
-                        return processed_articles
-                    else:
-                        logger.error(f"News API error: {response.status}")
-                        return []
+            await self._index(processed_articles)
+            return processed_articles
 
         except Exception as e:
             logger.error(f"Error fetching news for {ticker}: {e}")
-            return []
+            return None
 
     async def get_market_news(
         self,
         category: str = "business",
-        max_articles: int = 20
+        max_articles: int = 20,
+        refresh: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Fetch general market/financial news.
 
+        Served from the news cache while fresh; see ``NewsResponseCache``.
+
         Args:
             category: News category (business, technology, etc.)
             max_articles: Maximum number of articles to return
+            refresh: Bypass fresh cached results
 
         Returns:
             List of news articles
         """
+        return await self.cache.get(
+            ("top-headlines", normalize_query(category), "us"),
+            max_articles,
+            lambda page_size: self._fetch_market_news(category, page_size),
+            refresh=refresh
+        )
+
+    async def _fetch_market_news(self, category: str, max_articles: int) -> Optional[List[Dict[str, Any]]]:
+        """Fetch top headlines for a category from NewsAPI (uncached); None if the request failed."""
         try:
             params = {
                 "category": category,
@@ -102,31 +385,36 @@ class NewsService:
                 "country": "us"
             }
 
-            import ssl
-
-            # Create SSL context that doesn't verify certificates (for development)
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
+            data = await self._get_json("top-headlines", params)
+            if data is None:
+                return None
 
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(f"{self.base_url}/top-headlines", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("articles", [])
-                    else:
-                        logger.error(f"News API error: {response.status}")
-                        return []
+            articles = data.get("articles", [])
+            await self._index(articles)
+            return articles
 
         except Exception as e:
             logger.error(f"Error fetching market news: {e}")
-            return []
+            return None
+
+    async def _index(self, articles: List[Dict[str, Any]]):
+        """
+        Add fetched articles to the local article store, tagged with the tickers they mention.
+
+        Every article fetched from NewsAPI is stored here, and only here.
+        """
+        try:
+            if news_index.enabled:
+                articles = await asyncio.to_thread(ticker_index.tag, articles)
+            added = await news_index.ingest(articles)
+            if added:
+                logger.debug(f"Indexed {added} new articles")
+        except Exception as e:
+            logger.error(f"Error indexing news articles: {e}")
 
     def calculate_simple_sentiment(self, text: str) -> Dict[str, Any]:
         """
-        Calculate simple sentiment score for text.
-        In production, use a proper sentiment analysis model.
+        Calculate lexicon sentiment score for text.
 
         Args:
             text: Text to analyze
@@ -134,38 +422,7 @@ class NewsService:
         Returns:
             Sentiment analysis result
         """
-        positive_words = [
-            "growth", "profit", "gain", "surge", "rally", "bullish",
-            "positive", "strong", "beat", "outperform", "success"
-        ]
-        negative_words = [
-            "loss", "decline", "fall", "drop", "bearish", "negative",
-            "weak", "miss", "underperform", "risk", "concern"
-        ]
-
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-
-        total = positive_count + negative_count
-        if total == 0:
-            sentiment_score = 0.0
-        else:
-            sentiment_score = (positive_count - negative_count) / total
-
-        if sentiment_score > 0.2:
-            sentiment_label = "positive"
-        elif sentiment_score < -0.2:
-            sentiment_label = "negative"
-        else:
-            sentiment_label = "neutral"
-
-        return {
-            "score": sentiment_score,
-            "label": sentiment_label,
-            "positive_mentions": positive_count,
-            "negative_mentions": negative_count
-        }
+        return sentiment_engine.score(text)
 
 
 # Global instance
@@ -0,0 +1,110 @@
+from typing import Dict, Optional
+import asyncio
+import logging
+from datetime import datetime
+
+from ..core.config import settings
+from .agent_service import agent_orchestration_service
+from .admission import admission_controller, LANE_BACKGROUND
+from .insight_store import insight_store, ANALYSIS_MARKET, ANALYSIS_NEWS
+
+logger = logging.getLogger(__name__)
+
+
+class InsightPrecomputeScheduler:
+    """
+    Background scheduler that precomputes insights for the most-watched tickers.
+
+    Runs only start during PRECOMPUTE_OFFPEAK_HOURS_UTC and spend at most
+    PRECOMPUTE_LLM_BUDGET agent analyses each. Results are stored in the insight
+    store, from which ``execute_query`` serves them while they are fresh.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the scheduler loop if precomputation is enabled."""
+        if not settings.PRECOMPUTE_ENABLED:
+            return
+        # The task inherits the background admission lane
+        with admission_controller.context(None, LANE_BACKGROUND):
+            self._task = asyncio.create_task(self._loop(), name="insight-precompute")
+        logger.info("Insight precompute scheduler started")
+
+    async def stop(self):
+        """Stop the scheduler loop."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def in_offpeak_slot(self, now: Optional[datetime] = None) -> bool:
+        """Whether a precompute run may start at the given (UTC) time."""
+        now = now or datetime.utcnow()
+        return now.hour in settings.PRECOMPUTE_OFFPEAK_HOURS_UTC
+
+    async def _loop(self):
+        while True:
+            try:
+                if self.in_offpeak_slot():
+                    await self.run_once()
+            except Exception as e:
+                logger.error(f"Insight precompute run failed: {e}")
+
+            await asyncio.sleep(settings.PRECOMPUTE_INTERVAL_MINUTES * 60)
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Precompute market and news insights for the most-watched tickers.
+
+        Tickers whose stored insights are still fresh are skipped. The run stops
+        early when the LLM budget is spent or the agents start degrading.
+
+        Returns:
+            Counts of computed, skipped and budget-limited analyses
+        """
+        tickers = await insight_store.most_watched_tickers(settings.PRECOMPUTE_TOP_TICKERS)
+        budget = settings.PRECOMPUTE_LLM_BUDGET
+        stats = {"computed": 0, "skipped": 0, "degraded": 0}
+
+        analyses = [
+            (ANALYSIS_MARKET, agent_orchestration_service.analyze_market_ticker),
+            (ANALYSIS_NEWS, agent_orchestration_service.analyze_news_ticker)
+        ]
+
+        for ticker in tickers:
+            for analysis_type, analyze in analyses:
+                if budget <= 0:
+                    logger.info(f"Precompute LLM budget exhausted: {stats}")
+                    return stats
+
+                # Leave a margin so insights do not expire right before users arrive
+                if await insight_store.get_fresh(ticker, analysis_type, settings.PRECOMPUTE_MAX_AGE_MINUTES // 2):
+                    stats["skipped"] += 1
+                    continue
+
+                insight = await analyze(ticker, use_cache=False)
+                budget -= 1
+
+                if insight is None:
+                    continue
+                if analysis_type == ANALYSIS_NEWS and not insight.details.get("article_count"):
+                    # Likely a transient news fetch failure; do not pin "no news" for hours
+                    continue
+                if insight.details.get("degraded"):
+                    stats["degraded"] += 1
+                    logger.warning(f"Agents degraded, stopping precompute run: {stats}")
+                    return stats
+
+                cached = agent_orchestration_service.cached_insight(ticker, analysis_type, insight.details.get("model"))
+                inputs = cached.inputs if cached else {}
+                await insight_store.save(ticker, analysis_type, insight, inputs)
+                stats["computed"] += 1
+
+        logger.info(f"Precompute run finished for {len(tickers)} tickers: {stats}")
+        return stats
+
+
+# Global instance
+insight_precompute_scheduler = InsightPrecomputeScheduler()
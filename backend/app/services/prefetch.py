@@ -0,0 +1,92 @@
+from typing import Dict
+import asyncio
+import logging
+
+from ..core.config import settings
+from .stock_stream import stock_stream_manager
+from .news_service import news_service
+from .agent_service import agent_orchestration_service
+from .admission import admission_controller, LANE_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+
+class WatchlistPrefetcher:
+    """
+    Speculatively warms caches for tickers just added to a watchlist.
+
+    The quote and recent news are fetched concurrently into their caches, then
+    the market insight is computed from the cached quote. Prefetched quotes
+    are kept for PREFETCH_QUOTE_TTL_SECONDS rather than the usual quote TTL,
+    so they are still cached when the dashboard that follows the add loads. At most
+    PREFETCH_CONCURRENCY tickers are prefetched at once; requests beyond
+    PREFETCH_MAX_PENDING, or for a ticker already being prefetched, are dropped.
+    """
+
+    def __init__(self):
+        self._semaphore = asyncio.Semaphore(settings.PREFETCH_CONCURRENCY)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._dropped = 0
+        self._completed = 0
+
+    def schedule(self, ticker: str) -> bool:
+        """
+        Start prefetching a ticker in the background.
+
+        Returns:
+            True if a prefetch was scheduled
+        """
+        if not settings.PREFETCH_ON_WATCHLIST_ADD:
+            return False
+
+        ticker = ticker.upper()
+        if ticker in self._tasks:
+            return False
+        if len(self._tasks) >= settings.PREFETCH_MAX_PENDING:
+            self._dropped += 1
+            logger.info(f"Prefetch queue full, skipping {ticker}")
+            return False
+
+        with admission_controller.context(None, LANE_BACKGROUND):
+            task = asyncio.create_task(self._prefetch(ticker), name=f"prefetch-{ticker}")
+        self._tasks[ticker] = task
+        task.add_done_callback(lambda _: self._tasks.pop(ticker, None))
+        return True
+
+    async def stop(self):
+        """Cancel outstanding prefetches."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _prefetch(self, ticker: str):
+        async with self._semaphore:
+            try:
+                quote, articles = await asyncio.gather(
+                    stock_stream_manager.get_quote(ticker, ttl=settings.PREFETCH_QUOTE_TTL_SECONDS),
+                    news_service.get_ticker_news(ticker, days_back=7, max_articles=settings.PREFETCH_NEWS_ARTICLES)
+                )
+
+                if quote:
+                    await agent_orchestration_service.analyze_market_ticker(ticker)
+
+                self._completed += 1
+                logger.info(
+                    f"Prefetched {ticker}: quote={'yes' if quote else 'no'}, "
+                    f"{len(articles)} articles, market insight={'yes' if quote else 'no'}"
+                )
+            except Exception as e:
+                logger.error(f"Prefetch failed for {ticker}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Prefetch counters."""
+        return {
+            "in_flight": len(self._tasks),
+            "completed": self._completed,
+            "dropped": self._dropped
+        }
+
+
+# Global instance
+watchlist_prefetcher = WatchlistPrefetcher()
@@ -0,0 +1,142 @@
+from typing import Any, Callable, Optional
+from concurrent.futures import Executor
+import asyncio
+import contextvars
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class CapacityError(Exception):
+    """Raised when a call is shed for lack of local capacity (not an upstream failure)."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. It then lets a single trial
+    call through (half-open); success closes it, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be attempted now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self._opened_at is not None:
+            logger.info(f"Circuit breaker '{self.name}' closed")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        """Give back a half-open trial slot without recording an outcome."""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(f"Circuit breaker '{self.name}' opened after {self._failures} failures")
+            self._opened_at = time.monotonic()
+
+
+async def call_with_deadline(
+    breaker: CircuitBreaker,
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: float,
+    executor: Executor,
+    on_finished: Optional[Callable[[], None]] = None
+) -> Any:
+    """
+    Run a blocking callable in a worker thread under a deadline and breaker.
+
+    A missed deadline stops the wait, not the thread: a call that already
+    started keeps its worker thread until it returns (one still queued for a
+    thread is dropped). ``on_finished`` runs on the event loop once the thread
+    is free again, or right away when the call never starts, so callers can
+    hold their concurrency slots for as long as the call really runs.
+
+    Args:
+        breaker: Circuit breaker guarding the upstream
+        func: Blocking callable (e.g. an LLM request)
+        *args: Positional arguments for func
+        timeout: Deadline in seconds
+        executor: Bounded executor that runs func
+        on_finished: Called once func has returned or was dropped
+
+    Returns:
+        The callable's return value
+
+    Raises:
+        CircuitOpenError: If the breaker rejects the call
+        CapacityError: If the callable was shed locally (does not count as a failure)
+        asyncio.TimeoutError: If the deadline is missed
+    """
+    if not breaker.allow_request():
+        if on_finished:
+            on_finished()
+        raise CircuitOpenError(f"Circuit breaker '{breaker.name}' is open")
+
+    job = executor.submit(contextvars.copy_context().run, func, *args)
+    work = asyncio.wrap_future(job)
+
+    def settled(done: asyncio.Future):
+        if not done.cancelled():
+            done.exception()  # Retrieved here when nobody awaits it any more
+        if on_finished:
+            on_finished()
+
+    work.add_done_callback(settled)
+
+    try:
+        result = await asyncio.wait_for(asyncio.shield(work), timeout=timeout)
+    except asyncio.TimeoutError:
+        job.cancel()
+        breaker.record_failure()
+        raise
+    except (asyncio.CancelledError, CapacityError):
+        job.cancel()
+        breaker.release_trial()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+
+    breaker.record_success()
+    return result
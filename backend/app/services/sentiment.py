@@ -0,0 +1,235 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from datetime import datetime, timezone
+from itertools import chain, repeat
+from pathlib import Path
+import csv
+import logging
+import re
+
+import numpy as np
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_LEXICON = Path(__file__).resolve().parent.parent / "data" / "finance_lexicon.csv"
+
+# Token codes
+_NEUTRAL = 0
+_POSITIVE = 1
+_NEGATIVE = -1
+_NEGATOR = 2
+_CLAUSE_END = 3
+
+# Words, plus punctuation that ends a negation's scope
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,;:!?]")
+
+NEGATORS = frozenset({
+    "not", "no", "never", "none", "neither", "nor", "without", "cannot", "hardly", "barely",
+    "isn't", "aren't", "wasn't", "weren't", "don't", "doesn't", "didn't", "won't", "wouldn't",
+    "can't", "couldn't", "shouldn't", "hasn't", "haven't", "hadn't", "ain't"
+})
+
+
+def load_lexicon(path: Path) -> Dict[str, int]:
+    """
+    Read a sentiment word list.
+
+    Accepts either ``word,polarity`` rows (polarity ``positive`` or
+    ``negative``) or the Loughran-McDonald master dictionary CSV, whose
+    ``Positive`` and ``Negative`` columns hold the year a word was added
+    (0 when it is not in the list).
+
+    Returns:
+        Lower-cased word -> +1 or -1
+    """
+    lexicon: Dict[str, int] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fields = {name.lower(): name for name in reader.fieldnames or ()}
+        for row in reader:
+            word = (row.get(fields.get("word", "word")) or "").strip().lower()
+            if not word:
+                continue
+            if "polarity" in fields:
+                polarity = row[fields["polarity"]].strip().lower()
+                if polarity in ("positive", "negative"):
+                    lexicon[word] = _POSITIVE if polarity == "positive" else _NEGATIVE
+            elif row.get(fields.get("negative", ""), "0").strip() not in ("", "0"):
+                lexicon[word] = _NEGATIVE
+            elif row.get(fields.get("positive", ""), "0").strip() not in ("", "0"):
+                lexicon[word] = _POSITIVE
+    return lexicon
+
+
+class LexiconSentimentEngine:
+    """
+    Batch lexicon sentiment scoring for news text.
+
+    Text is split into whole word tokens (so "brisk" does not count as
+    "risk") and looked up in a financial word list (the bundled list, or the
+    Loughran-McDonald master dictionary via SENTIMENT_LEXICON_PATH). A
+    sentiment word within SENTIMENT_NEGATION_WINDOW tokens after a negator
+    ("not", "no", "didn't", ...) in the same clause has its polarity flipped.
+    A batch of texts is tokenized once and negation and per-document counts
+    are computed over the whole batch with NumPy.
+    """
+
+    def __init__(self, lexicon_path: Optional[str] = None):
+        self.lexicon_path = Path(lexicon_path or settings.SENTIMENT_LEXICON_PATH or BUNDLED_LEXICON)
+        self._codes: Optional[Dict[str, int]] = None
+
+    @property
+    def codes(self) -> Dict[str, int]:
+        """Token -> code table, loaded on first use."""
+        if self._codes is None:
+            try:
+                lexicon = load_lexicon(self.lexicon_path)
+            except OSError as e:
+                logger.error(f"Sentiment lexicon unavailable ({self.lexicon_path}): {e}, using the bundled list")
+                lexicon = load_lexicon(BUNDLED_LEXICON)
+            self._codes = {
+                **lexicon,
+                **{word: _NEGATOR for word in NEGATORS},
+                **{mark: _CLAUSE_END for mark in ".,;:!?"}
+            }
+            logger.info(f"Loaded sentiment lexicon with {len(lexicon)} words from {self.lexicon_path}")
+        return self._codes
+
+    def count_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Positive and negative word counts per text, after negation.
+
+        Returns:
+            Integer array of shape (len(texts), 2): positive, negative
+        """
+        counts = np.zeros((len(texts), 2), dtype=np.int64)
+        if not texts:
+            return counts
+
+        documents = [_TOKEN.findall(text.lower()) for text in texts]
+        lengths = np.fromiter(map(len, documents), dtype=np.int64, count=len(documents))
+        total = int(lengths.sum())
+        if total == 0:
+            return counts
+
+        tokens = chain.from_iterable(documents)
+        token_codes = np.fromiter(map(self.codes.get, tokens, repeat(_NEUTRAL)), dtype=np.int8, count=total)
+        doc_ids = np.repeat(np.arange(len(texts)), lengths)
+        doc_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        # Closest negator at or before each token, within the same text and clause
+        positions = np.arange(total)
+        last_negator = np.maximum.accumulate(np.where(token_codes == _NEGATOR, positions, -1))
+        last_clause_end = np.maximum.accumulate(np.where(token_codes == _CLAUSE_END, positions, -1))
+        negated = (
+            (last_negator >= doc_starts)
+            & (last_negator > last_clause_end)
+            & (positions - last_negator <= settings.SENTIMENT_NEGATION_WINDOW)
+        )
+
+        polarity = np.where(np.abs(token_codes) == 1, token_codes, 0).astype(np.int8)
+        polarity[negated] *= -1
+
+        counts[:, 0] = np.bincount(doc_ids, weights=polarity > 0, minlength=len(texts))
+        counts[:, 1] = np.bincount(doc_ids, weights=polarity < 0, minlength=len(texts))
+        return counts
+
+    def score_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Score many texts at once.
+
+        Returns:
+            One result per text, as returned by ``score``
+        """
+        counts = self.count_batch(texts)
+        positive, negative = counts[:, 0], counts[:, 1]
+        total = positive + negative
+        scores = np.divide(positive - negative, total, out=np.zeros(len(texts)), where=total > 0)
+
+        return [
+            {
+                "score": float(score),
+                "label": self.label_for_score(score),
+                "positive_mentions": int(pos),
+                "negative_mentions": int(neg)
+            }
+            for score, pos, neg in zip(scores, positive, negative)
+        ]
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """
+        Score one text.
+
+        Returns:
+            Score in [-1, 1], label and positive/negative word counts
+        """
+        return self.score_batch([text])[0]
+
+    @staticmethod
+    def label_for_score(score: float) -> str:
+        if score > 0.2:
+            return "positive"
+        if score < -0.2:
+            return "negative"
+        return "neutral"
+
+    def aggregate(
+        self,
+        scores: Sequence[float],
+        tickers: Sequence[str],
+        timestamps: Sequence[float],
+        bucket_seconds: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Average article scores per ticker and time bucket.
+
+        Args:
+            scores: Article sentiment scores
+            tickers: Ticker of each article
+            timestamps: Unix publish time of each article
+            bucket_seconds: Bucket width
+
+        Returns:
+            One entry per (ticker, bucket) with articles, mean score and
+            positive/negative article counts, ordered by ticker then time
+        """
+        if not len(scores):
+            return []
+        scores = np.asarray(scores, dtype=np.float64)
+        ticker_names, ticker_ids = np.unique(np.asarray(tickers), return_inverse=True)
+        buckets = np.floor(np.asarray(timestamps, dtype=np.float64) / bucket_seconds).astype(np.int64)
+
+        groups, group_ids = np.unique(np.column_stack((ticker_ids, buckets)), axis=0, return_inverse=True)
+        group_ids = group_ids.reshape(-1)
+        articles = np.bincount(group_ids, minlength=len(groups))
+        sums = np.bincount(group_ids, weights=scores, minlength=len(groups))
+        positive = np.bincount(group_ids, weights=scores > 0, minlength=len(groups))
+        negative = np.bincount(group_ids, weights=scores < 0, minlength=len(groups))
+
+        return [
+            {
+                "ticker": str(ticker_names[ticker_id]),
+                "bucket_start": datetime.fromtimestamp(bucket * bucket_seconds, tz=timezone.utc).isoformat(),
+                "articles": int(count),
+                "score": round(float(total / count), 4),
+                "label": self.label_for_score(total / count),
+                "positive_articles": int(pos),
+                "negative_articles": int(neg)
+            }
+            for (ticker_id, bucket), count, total, pos, neg in zip(groups, articles, sums, positive, negative)
+        ]
+
+
+def article_text(article: Dict[str, Any]) -> str:
+    """Text of an article that sentiment is scored on."""
+    return f"{article.get('title') or ''} {article.get('description') or ''}"
+
+
+def score_articles(articles: Iterable[Dict[str, Any]]) -> List[float]:
+    """Lexicon sentiment score of each article."""
+    return [result["score"] for result in sentiment_engine.score_batch([article_text(a) for a in articles])]
+
+
+# Global instance
+sentiment_engine = LexiconSentimentEngine()
@@ -1,8 +1,9 @@
-from typing import Dict, Set, Callable, Optional, List
+from typing import Dict, Set, Callable, Optional, List, Tuple
 import asyncio
 import json
 from datetime import datetime
 import logging
+import time
 
 from ..core.config import settings
 from ..schemas.market import StockPrice
@@ -18,7 +19,7 @@ class FinnhubProvider:
         self.ws = None
         self.connected = False
         self._subscribed_tickers: Set[str] = set()
-        self.base_url = "https://finnhub.io/api/v1"
+        self.base_url = settings.FINNHUB_BASE_URL
 
     async def connect(self):
         """Connect to Finnhub WebSocket."""
@@ -135,6 +136,7 @@ class StockStreamManager:
     def __init__(self):
         self.provider: FinnhubProvider = None
         self.active_subscriptions: Dict[str, Set[str]] = {}  # user_id -> set of tickers
+        self._quote_cache: Dict[str, Tuple[float, StockPrice]] = {}  # ticker -> (expires_at, quote)
         self._initialize_provider()
 
     def _initialize_provider(self):
@@ -167,9 +169,29 @@ class StockStreamManager:
         if not self.active_subscriptions[user_id]:
             del self.active_subscriptions[user_id]
 
-    async def get_quote(self, ticker: str) -> Optional[StockPrice]:
-        """Get the latest quote for a ticker."""
-        return await self.provider.get_latest_quote(ticker)
+    async def get_quote(self, ticker: str, ttl: Optional[float] = None) -> Optional[StockPrice]:
+        """
+        Get the latest quote for a ticker, served from cache while it is fresh.
+
+        Args:
+            ticker: Stock ticker symbol
+            ttl: How long a newly fetched quote is served from cache
+                (defaults to QUOTE_CACHE_TTL_SECONDS)
+        """
+        now = time.monotonic()
+        cached = self._quote_cache.get(ticker)
+        if cached and now < cached[0]:
+            return cached[1]
+
+        quote = await self.provider.get_latest_quote(ticker)
+        if quote:
+            now = time.monotonic()
+            self._quote_cache = {
+                key: entry for key, entry in self._quote_cache.items() if now < entry[0]
+            }
+            self._quote_cache[ticker] = (now + (ttl if ttl is not None else settings.QUOTE_CACHE_TTL_SECONDS), quote)
+
+        return quote
 
 
 # Global instance
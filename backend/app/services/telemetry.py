@@ -0,0 +1,289 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels (Prometheus semantics)."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}  # bucket counts..., +Inf count, sum
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                labels = _format_labels(self.label_names, key)
+                cumulative = 0.0
+                for bound, count in zip(self.buckets + ("+Inf",), series):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else f"{bound:g}"
+                    bucket_labels = _format_labels(self.label_names, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative:g}")
+                lines.append(f"{self.name}_sum{labels} {series[-1]:g}")
+                lines.append(f"{self.name}_count{labels} {cumulative:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, label_names, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+registry = MetricsRegistry()
+
+AGENT_CALLS = registry.counter(
+    "agent_calls_total", "Agent invocations by cache outcome and error class", ("agent", "cache", "error")
+)
+AGENT_QUEUE_WAIT = registry.histogram(
+    "agent_queue_wait_seconds", "Time waiting for a pooled assistant", ("agent",)
+)
+AGENT_LLM_LATENCY = registry.histogram(
+    "agent_llm_latency_seconds", "LLM call latency", ("agent", "model")
+)
+AGENT_TOKENS = registry.counter(
+    "agent_tokens_total", "LLM tokens by direction", ("agent", "model", "direction")
+)
+ADMISSION_QUEUE_WAIT = registry.histogram(
+    "admission_queue_wait_seconds", "Time LLM calls waited for admission", ("lane",)
+)
+ADMISSION_DECISIONS = registry.counter(
+    "admission_decisions_total", "LLM admission outcomes", ("lane", "outcome")
+)
+UPSTREAM_FETCH = registry.histogram(
+    "upstream_fetch_seconds", "Market data and news fetch latency during analyses", ("source",)
+)
+
+
+class AgentCall:
+    """Measurements for one agent invocation."""
+
+    def __init__(self, agent: str, ticker: Optional[str], cache: str):
+        self.agent = agent
+        self.ticker = ticker
+        self.cache = cache  # "hit" (served without the LLM) or "miss"
+        self.model: Optional[str] = None
+        self.queue_wait: Optional[float] = None
+        self.llm_latency: Optional[float] = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.error: Optional[str] = None
+
+    def record_llm(self, model: str, queue_wait: float, llm_latency: float, llm_metrics: Dict[str, Any]):
+        """Record a completed LLM run (called from the worker thread)."""
+        self.model = model
+        self.queue_wait = queue_wait
+        self.llm_latency = llm_latency
+        self.prompt_tokens = int(llm_metrics.get("input_tokens") or 0)
+        self.completion_tokens = int(llm_metrics.get("output_tokens") or 0)
+
+    def finish(self, error: Optional[BaseException] = None):
+        """Close the call and export it to the metrics registry."""
+        if error is not None:
+            self.error = type(error).__name__
+
+        AGENT_CALLS.inc(agent=self.agent, cache=self.cache, error=self.error or "none")
+        if self.queue_wait is not None:
+            AGENT_QUEUE_WAIT.observe(self.queue_wait, agent=self.agent)
+        if self.llm_latency is not None:
+            AGENT_LLM_LATENCY.observe(self.llm_latency, agent=self.agent, model=self.model)
+            AGENT_TOKENS.inc(self.prompt_tokens, agent=self.agent, model=self.model, direction="prompt")
+            AGENT_TOKENS.inc(self.completion_tokens, agent=self.agent, model=self.model, direction="completion")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "agent": self.agent,
+            "ticker": self.ticker,
+            "cache": self.cache,
+            "model": self.model,
+            "queue_wait_ms": round(self.queue_wait * 1000, 1) if self.queue_wait is not None else None,
+            "llm_ms": round(self.llm_latency * 1000, 1) if self.llm_latency is not None else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "error": self.error
+        }
+
+
+class RequestTelemetry:
+    """Agent calls and upstream fetch times collected for one analysis request."""
+
+    def __init__(self):
+        self.calls: List[AgentCall] = []
+        self.fetch_seconds: Dict[str, float] = {}
+        self.admission_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_call(self, call: AgentCall):
+        with self._lock:
+            self.calls.append(call)
+
+    def add_fetch(self, source: str, seconds: float):
+        with self._lock:
+            self.fetch_seconds[source] = self.fetch_seconds.get(source, 0.0) + seconds
+
+    def add_admission_wait(self, seconds: float):
+        with self._lock:
+            self.admission_wait_seconds += seconds
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals and per-call detail, as stored with the query history."""
+        with self._lock:
+            calls = [call.to_dict() for call in self.calls]
+            fetch = {source: round(seconds * 1000, 1) for source, seconds in self.fetch_seconds.items()}
+            admission_wait = round(self.admission_wait_seconds * 1000, 1)
+
+        errors: Dict[str, int] = {}
+        for call in calls:
+            if call["error"]:
+                errors[call["error"]] = errors.get(call["error"], 0) + 1
+
+        return {
+            "llm_ms": round(sum(call["llm_ms"] or 0 for call in calls), 1),
+            "queue_wait_ms": round(sum(call["queue_wait_ms"] or 0 for call in calls), 1),
+            "admission_wait_ms": admission_wait,
+            "fetch_ms": fetch,
+            "prompt_tokens": sum(call["prompt_tokens"] for call in calls),
+            "completion_tokens": sum(call["completion_tokens"] for call in calls),
+            "cache_hits": sum(1 for call in calls if call["cache"] == "hit"),
+            "cache_misses": sum(1 for call in calls if call["cache"] == "miss"),
+            "errors": errors,
+            "calls": calls
+        }
+
+
+# Telemetry of the analysis request being processed (shared with child tasks and threads)
+_current_request: ContextVar[Optional[RequestTelemetry]] = ContextVar("request_telemetry", default=None)
+
+
+class Telemetry:
+    """Entry points used by the agents and the orchestration service."""
+
+    @contextmanager
+    def collect(self) -> Iterator[RequestTelemetry]:
+        """Collect telemetry for every agent call made inside the block."""
+        request = RequestTelemetry()
+        token = _current_request.set(request)
+        try:
+            yield request
+        finally:
+            _current_request.reset(token)
+
+    def agent_call(self, agent: str, ticker: Optional[str] = None, cache: str = "miss") -> AgentCall:
+        """Start measuring an agent invocation; call ``finish()`` when it ends."""
+        call = AgentCall(agent, ticker, cache)
+        request = _current_request.get()
+        if request is not None:
+            request.add_call(call)
+        return call
+
+    def cache_hit(self, agent: str, ticker: Optional[str] = None):
+        """Record an agent result served without calling the LLM."""
+        self.agent_call(agent, ticker, cache="hit").finish()
+
+    @contextmanager
+    def fetch(self, source: str) -> Iterator[None]:
+        """Time an upstream data fetch made on behalf of an analysis."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            UPSTREAM_FETCH.observe(elapsed, source=source)
+            request = _current_request.get()
+            if request is not None:
+                request.add_fetch(source, elapsed)
+
+    def admission(self, lane: str, waited: float, admitted: bool):
+        """Record an LLM admission decision and the time spent queued for it."""
+        ADMISSION_QUEUE_WAIT.observe(waited, lane=lane)
+        ADMISSION_DECISIONS.inc(lane=lane, outcome="admitted" if admitted else "timeout")
+        request = _current_request.get()
+        if request is not None:
+            request.add_admission_wait(waited)
+
+    def render_prometheus(self) -> str:
+        return registry.render()
+
+
+# Global instance
+telemetry = Telemetry()
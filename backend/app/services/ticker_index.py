@@ -0,0 +1,210 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from pathlib import Path
+import csv
+import logging
+import re
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_SYMBOLS = Path(__file__).resolve().parent.parent / "data" / "symbols.csv"
+
+# An exchange prefix ("NYSE: F", "Nasdaq:ON") right before a symbol
+_EXCHANGE_PREFIX = re.compile(r"\b(?:NYSE|NASDAQ|Nasdaq|NYSEARCA|NYSE American|AMEX)\s*:\s*$")
+
+# Pattern kinds
+_SYMBOL = "symbol"
+_NAME = "name"
+
+
+class _Automaton:
+    """Aho-Corasick automaton over lower-cased patterns."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, Any]]] = [[]]
+
+    def add(self, pattern: str, value: Any):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(pattern), value))
+
+    def build(self):
+        """Compute failure links (breadth first) once all patterns are added."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """(start, end, value) of every pattern occurrence in ``text``, in one pass."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in outputs[state]:
+                yield position + 1 - length, position + 1, value
+
+    @property
+    def size(self) -> int:
+        return len(self._goto)
+
+
+class TickerIndex:
+    """
+    Maps article text to the ticker symbols it mentions.
+
+    Built once from a symbol master CSV (SYMBOL_MASTER_PATH, or the bundled
+    app/data/symbols.csv) with ``symbol``, ``name``, ``aliases``
+    (``|``-separated) and ``ambiguous`` columns. Symbols, company names and
+    aliases all go into one Aho-Corasick automaton, so an article is tagged in
+    a single pass over its text whatever the size of the master file.
+
+    Matches must fall on word boundaries. Symbols must appear in upper case;
+    symbols that are also common words or letters ("F", "ON", "ALL") are
+    flagged ambiguous and only count as a cashtag ("$F") or after an exchange
+    prefix ("NYSE: F"). Names and aliases match case-insensitively, except that
+    a capitalized name must be capitalized in the text ("Apple", not "apple").
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.SYMBOL_MASTER_PATH or BUNDLED_SYMBOLS)
+        self._automaton: Optional[_Automaton] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def _load(self) -> _Automaton:
+        if self._automaton is not None:
+            return self._automaton
+
+        try:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            logger.error(f"Symbol master unavailable ({self.path}): {e}, using the bundled file")
+            with open(BUNDLED_SYMBOLS, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+
+        automaton = _Automaton()
+        for row in rows:
+            symbol = (row.get("symbol") or "").strip().upper()
+            if not symbol:
+                continue
+            name = (row.get("name") or "").strip()
+            aliases = [alias.strip() for alias in (row.get("aliases") or "").split("|") if alias.strip()]
+            self._entries[symbol] = {
+                "name": name,
+                "aliases": aliases,
+                "ambiguous": (row.get("ambiguous") or "0").strip() in ("1", "true", "yes")
+            }
+
+            automaton.add(symbol.lower(), (_SYMBOL, symbol, symbol))
+            for phrase in {name, *aliases} - {""}:
+                automaton.add(phrase.lower(), (_NAME, symbol, phrase))
+
+        automaton.build()
+        self._automaton = automaton
+        logger.info(f"Loaded {len(self._entries)} symbols from {self.path} ({automaton.size} automaton states)")
+        return automaton
+
+    def knows(self, ticker: str) -> bool:
+        """Whether ``ticker`` is in the symbol master."""
+        self._load()
+        return ticker.upper() in self._entries
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Tickers mentioned in ``text``.
+
+        Returns:
+            Sorted ticker symbols
+        """
+        automaton = self._load()
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters change length when lower-cased; keep offsets aligned
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+        found: Set[str] = set()
+        for start, end, (kind, symbol, pattern) in automaton.matches(lowered):
+            if symbol in found or not self._on_word_boundary(text, start, end):
+                continue
+            if kind == _SYMBOL:
+                if text[start:end] != pattern:
+                    continue
+                if self._entries[symbol]["ambiguous"] and not self._qualified(text, start):
+                    continue
+            elif pattern[0].isupper() and not text[start].isupper():
+                continue
+            found.add(symbol)
+        return sorted(found)
+
+    @staticmethod
+    def _on_word_boundary(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    @staticmethod
+    def _qualified(text: str, start: int) -> bool:
+        """A cashtag or an exchange-prefixed symbol."""
+        if start > 0 and text[start - 1] == "$":
+            return True
+        return _EXCHANGE_PREFIX.search(text[max(0, start - 20):start]) is not None
+
+    def tag(self, articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Articles with a ``tickers`` list of the symbols they mention.
+
+        Title, description and content are scanned. Articles that already
+        carry a ``tickers`` list are passed through unchanged.
+        """
+        tagged = []
+        for article in articles:
+            if "tickers" not in article:
+                text = " \n ".join(article.get(field) or "" for field in ("title", "description", "content"))
+                article = {**article, "tickers": self.extract(text)}
+            tagged.append(article)
+        return tagged
+
+    def news_query(self, ticker: str) -> str:
+        """
+        NewsAPI ``q`` expression for a ticker's news.
+
+        Company names and aliases are quoted phrases; the bare symbol is only
+        searched when it is unambiguous. Unknown tickers are searched as is.
+        """
+        self._load()
+        entry = self._entries.get(ticker.upper())
+        if entry is None:
+            return ticker
+        terms = [] if entry["ambiguous"] else [ticker.upper()]
+        terms += [f'"{alias}"' for alias in entry["aliases"] or [entry["name"]]]
+        return " OR ".join(terms)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self._automaton is not None,
+            "symbols": len(self._entries),
+            "states": self._automaton.size if self._automaton is not None else 0
+        }
+
+
+# Global instance
+ticker_index = TickerIndex()
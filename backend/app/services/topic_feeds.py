@@ -0,0 +1,204 @@
+from typing import Any, Dict, List, Optional, Tuple
+from bisect import bisect_left
+from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import json
+import logging
+
+from ..core.config import settings
+from .article_clustering import ArticleCluster, cluster_stories, story_entry
+from .news_index import news_index
+from .news_service import news_service
+
+logger = logging.getLogger(__name__)
+
+# Search query behind each fixed news topic
+TOPIC_QUERIES: Dict[str, str] = {
+    "stocks": "stock market",
+    "crypto": "cryptocurrency bitcoin ethereum",
+    "bitcoin": "bitcoin BTC",
+    "ethereum": "ethereum ETH",
+    "forex": "forex currency exchange",
+    "commodities": "commodities gold oil",
+    "gold": "gold commodity",
+    "oil": "crude oil",
+    "tech": "technology stocks",
+    "finance": "finance financial markets"
+}
+
+
+class TopicFeed:
+    """
+    A materialized topic feed: articles, their pre-encoded JSON and a content ETag.
+
+    Built off the event loop. Stories are grouped once over the whole feed,
+    and every story entry a request can need is encoded up front: a request
+    for the first N articles gets each story's entry for its members among
+    those N. Serving a view is then list slicing only.
+    """
+
+    __slots__ = ("topic", "articles", "encoded", "etag", "built_at", "_stories")
+
+    def __init__(self, topic: str, articles: List[Dict[str, Any]]):
+        self.topic = topic
+        self.articles = articles
+        self.encoded = [json.dumps(article, default=str) for article in articles]
+        self.etag = hashlib.sha1("\n".join(self.encoded).encode("utf-8")).hexdigest()[:16]
+        self.built_at = datetime.utcnow()
+
+        # Per story: feed positions of its members, and its entry for each member count
+        self._stories: List[Tuple[List[int], List[Tuple[Dict[str, Any], str]]]] = []
+        positions = {id(article): i for i, article in enumerate(articles)}
+        for story in cluster_stories(articles):
+            entries = [story_entry(ArticleCluster(story.members[:count])) for count in range(1, story.size + 1)]
+            self._stories.append((
+                [positions[id(article)] for article in story.members],
+                [(entry, json.dumps(entry, default=str)) for entry in entries]
+            ))
+
+    def view(self, max_articles: int, stories: bool) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        The first ``max_articles`` articles, or the stories they belong to.
+
+        Returns:
+            (items, their pre-encoded JSON)
+        """
+        if not stories:
+            return self.articles[:max_articles], self.encoded[:max_articles]
+        items, encoded = [], []
+        for members, entries in self._stories:
+            count = bisect_left(members, max_articles)
+            if count:
+                entry, line = entries[count - 1]
+                items.append(entry)
+                encoded.append(line)
+        return items, encoded
+
+
+class TopicFeedMaterializer:
+    """
+    Builds the fixed news topic feeds in the background and keeps them in memory.
+
+    Every TOPIC_FEED_REFRESH_MINUTES each topic in TOPIC_QUERIES is rebuilt
+    with up to TOPIC_FEED_MAX_ARTICLES articles from the last
+    TOPIC_FEED_DAYS_BACK days. Topics take turns being fetched from NewsAPI:
+    a cycle may spend its share of the daily quota (TOPIC_FEED_QUOTA_SHARE
+    spread over the cycles in a day, fractions carried over) and stops
+    spending at NEWS_API_QUOTA_RESERVE. Every other topic is rebuilt from
+    the local index only, when it holds enough matches. Articles (and their story grouping) are
+    JSON-encoded once per build, so serving a feed is a string join whatever
+    the number of users, and each feed carries an ETag derived from its
+    content. A topic with no articles keeps its existing feed.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._feeds: Dict[str, TopicFeed] = {}
+        self._cursor = 0
+        self._allowance = 0.0
+        self._stats: Dict[str, Any] = {
+            "builds": 0, "unchanged": 0, "skipped": 0, "requests": 0, "served": 0, "last_run_at": None
+        }
+
+    async def start(self):
+        """Start the refresh loop if enabled."""
+        if not settings.TOPIC_FEEDS_ENABLED:
+            return
+        self._task = asyncio.create_task(self._loop(), name="topic-feeds")
+        logger.info("Topic feed materializer started")
+
+    async def stop(self):
+        """Stop the refresh loop."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Topic feed refresh failed: {e}")
+
+            await asyncio.sleep(settings.TOPIC_FEED_REFRESH_MINUTES * 60)
+
+    def cycle_budget(self) -> float:
+        """NewsAPI requests one cycle may spend (the fraction carries over to later cycles)."""
+        cycles_per_day = max(1.0, 1440 / max(1.0, settings.TOPIC_FEED_REFRESH_MINUTES))
+        return settings.NEWS_API_DAILY_QUOTA * settings.TOPIC_FEED_QUOTA_SHARE / cycles_per_day
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Rebuild every topic feed, fetching the topics whose turn it is from NewsAPI.
+
+        Returns:
+            Feeds rebuilt, unchanged and skipped, and NewsAPI requests made in this run
+        """
+        topics = list(TOPIC_QUERIES.items())
+        self._allowance = min(float(len(topics)), self._allowance + self.cycle_budget())
+        since = datetime.utcnow() - timedelta(days=settings.TOPIC_FEED_DAYS_BACK)
+        start = self._cursor
+
+        stats = {"builds": 0, "unchanged": 0, "skipped": 0, "requests": 0}
+        for offset in range(len(topics)):
+            topic, query = topics[(start + offset) % len(topics)]
+            if self._allowance >= 1 and news_service.quota.remaining() > settings.NEWS_API_QUOTA_RESERVE:
+                self._allowance -= 1
+                self._cursor = (start + offset + 1) % len(topics)
+                stats["requests"] += 1
+                articles = await news_service.get_stock_news(
+                    query,
+                    days_back=settings.TOPIC_FEED_DAYS_BACK,
+                    max_articles=settings.TOPIC_FEED_MAX_ARTICLES,
+                    refresh=True
+                )
+            else:
+                articles = await news_index.search(query, since=since, limit=settings.TOPIC_FEED_MAX_ARTICLES)
+                if len(articles) < min(settings.TOPIC_FEED_MAX_ARTICLES, settings.NEWS_INDEX_MIN_RESULTS):
+                    articles = []  # Too few to stand in for a NewsAPI search (see NewsService.search_news)
+
+            if not articles:
+                stats["skipped"] += 1  # Keep the last good feed over an empty one
+                continue
+
+            feed = await asyncio.to_thread(TopicFeed, topic, articles)
+            previous = self._feeds.get(topic)
+            if previous is not None and previous.etag == feed.etag:
+                stats["unchanged"] += 1
+            else:
+                self._feeds[topic] = feed
+                stats["builds"] += 1
+
+        for key, value in stats.items():
+            self._stats[key] += value
+        self._stats["last_run_at"] = datetime.utcnow().isoformat()
+        logger.info(f"Topic feeds refreshed: {stats}")
+        return stats
+
+    def get(self, topic: str, days_back: int, max_articles: int) -> Optional[TopicFeed]:
+        """
+        The materialized feed able to answer a topic request, if any.
+
+        Returns:
+            The feed, or None when the topic is not materialized or the request
+            asks for a different window or more articles than feeds hold
+        """
+        if days_back != settings.TOPIC_FEED_DAYS_BACK or max_articles > settings.TOPIC_FEED_MAX_ARTICLES:
+            return None
+        feed = self._feeds.get(topic.lower())
+        if feed is not None:
+            self._stats["served"] += 1
+        return feed
+
+    def stats(self) -> Dict[str, Any]:
+        feeds = {
+            topic: {"articles": len(feed.articles), "etag": feed.etag, "built_at": feed.built_at.isoformat()}
+            for topic, feed in self._feeds.items()
+        }
+        return {"enabled": self._task is not None, "cycle_budget": round(self.cycle_budget(), 2), "feeds": feeds, **self._stats}
+
+
+# Global instance
+topic_feed_materializer = TopicFeedMaterializer()
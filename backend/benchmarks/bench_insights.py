@@ -0,0 +1,358 @@
+"""
+Offline throughput benchmark for ``POST /api/insights/analyze``.
+
+Starts Gemini, Finnhub and NewsAPI stand-ins (see ``stub_servers``) on a
+separate event loop, points the app at them, and drives the real FastAPI app
+in-process over ``httpx.ASGITransport`` at a fixed concurrency. For every
+scenario it reports requests/sec, latency percentiles, event-loop lag and the
+upstream calls made, and writes everything to a JSON file so runs can be
+diffed across versions.
+
+Scenarios:
+    one_ticker   1 ticker per request, tickers rotating through a symbol universe
+    ten_tickers  10 tickers per request
+    cache_cold   1 ticker per request, in-process caches cleared before every request
+    cache_hot    the same tickers requested repeatedly after a warm-up request
+    noisy_tenant 1-ticker requests measured while another user keeps
+                 ``--concurrency`` 10-ticker requests in flight
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_insights --requests 50 --concurrency 8 \\
+        --gemini-latency 0.3 --output bench-results.json
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+from benchmarks.stub_servers import create_finnhub_app, create_gemini_app, create_newsapi_app
+
+SCENARIOS = ("one_ticker", "ten_tickers", "cache_cold", "cache_hot", "noisy_tenant")
+
+SYMBOLS = [
+    "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "JPM", "V", "UNH",
+    "XOM", "JNJ", "WMT", "PG", "MA", "HD", "CVX", "KO", "PEP", "COST"
+]
+
+LOOP_LAG_INTERVAL = 0.01  # Seconds between event-loop lag probes
+
+
+class StubUpstreams:
+    """Upstream stand-ins served from their own event loop in a background thread."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.apps = {
+            "gemini": create_gemini_app({}, args.gemini_latency, args.jitter, args.error_rate, args.output_tokens),
+            "finnhub": create_finnhub_app(args.finnhub_latency, args.jitter, args.error_rate),
+            "newsapi": create_newsapi_app(args.news_latency, args.jitter, args.error_rate)
+        }
+        self.ports: Dict[str, int] = {}
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="stub-upstreams", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start_sites())
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _start_sites(self):
+        for name, app in self.apps.items():
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            self.ports[name] = site._server.sockets[0].getsockname()[1]
+
+    def counts(self) -> Dict[str, Any]:
+        """Snapshot of request and error counts per upstream."""
+        return {name: json.loads(json.dumps(app["stats"])) for name, app in self.apps.items()}
+
+
+def counts_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Upstream calls made between two ``StubUpstreams.counts`` snapshots."""
+    delta = {}
+    for upstream, stats in after.items():
+        delta[upstream] = {}
+        for kind, counts in stats.items():
+            previous = before.get(upstream, {}).get(kind, {})
+            changed = {key: value - previous.get(key, 0) for key, value in counts.items() if value != previous.get(key, 0)}
+            delta[upstream][kind] = changed
+        delta[upstream]["total"] = sum(delta[upstream].get("requests", {}).values())
+    return delta
+
+
+def configure_environment(upstreams: StubUpstreams, database_path: str):
+    """Settings for the app under test; must run before ``app`` is imported."""
+    for key in ("SECRET_KEY", "GEMINI_API_KEY", "MARKET_DATA_API_KEY", "NEWS_API_KEY"):
+        os.environ.setdefault(key, "benchmark")
+
+    os.environ.update({
+        "DATABASE_URL": f"sqlite+aiosqlite:///{database_path}",
+        "NEWS_INDEX_PATH": os.path.join(os.path.dirname(database_path), "news_index.db"),
+        "DEBUG": "False",
+        "GEMINI_API_ENDPOINT": f"http://127.0.0.1:{upstreams.ports['gemini']}",
+        "FINNHUB_BASE_URL": f"http://127.0.0.1:{upstreams.ports['finnhub']}/api/v1",
+        "NEWS_API_BASE_URL": f"http://127.0.0.1:{upstreams.ports['newsapi']}/v2",
+        "NEWS_API_DAILY_QUOTA": "1000000",
+        # Background work would add upstream calls the scenarios did not make
+        "PRECOMPUTE_ENABLED": "False",
+        "PREFETCH_ON_WATCHLIST_ADD": "False",
+        "NEWS_INGEST_ENABLED": "False"
+    })
+
+
+def reset_caches():
+    """Clear every in-process cache on the analysis path (quotes, news, insights, graph results)."""
+    from app.agents import news_agent
+    from app.services.agent_dag import agent_dag_executor
+    from app.services.agent_service import agent_orchestration_service
+    from app.services.news_service import news_service
+    from app.services.stock_stream import stock_stream_manager
+
+    stock_stream_manager._quote_cache.clear()
+    news_service.cache.clear()
+    news_agent._sentiment_state.clear()
+    agent_dag_executor._cache.clear()
+    agent_orchestration_service._recent.clear()
+    agent_orchestration_service._insight_cache.clear()
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Latency summary in milliseconds."""
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(max(values) if values else None),
+        "mean_ms": ms(sum(values) / len(values) if values else None)
+    }
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task."""
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.samples.append(max(0.0, time.monotonic() - started - LOOP_LAG_INTERVAL))
+
+    def __enter__(self) -> "LoopLagMonitor":
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        return self
+
+    def __exit__(self, *exc_info):
+        self._task.cancel()
+
+
+def scenario_payloads(scenario: str, requests: int, query_type: str) -> List[Dict[str, Any]]:
+    """Request bodies for a scenario."""
+    if scenario == "ten_tickers":
+        return [
+            {"tickers": [SYMBOLS[(i + j) % len(SYMBOLS)] for j in range(10)], "query_type": query_type}
+            for i in range(requests)
+        ]
+    if scenario == "cache_hot":
+        return [{"tickers": [SYMBOLS[i % 4]], "query_type": query_type} for i in range(requests)]
+    return [{"tickers": [SYMBOLS[i % len(SYMBOLS)]], "query_type": query_type} for i in range(requests)]
+
+
+async def run_batch_tenant(client, headers: Dict[str, str], args, stop: asyncio.Event) -> int:
+    """Keep ``args.concurrency`` 10-ticker requests in flight until ``stop`` is set."""
+    completed = 0
+
+    async def worker(worker_id: int):
+        nonlocal completed
+        round_number = 0
+        while not stop.is_set():
+            # Tickers of their own, so the batch work never shares caches with the measured requests
+            tickers = [f"B{worker_id}{round_number % 50:02d}{j}" for j in range(10)]
+            await client.post("/api/insights/analyze", json={"tickers": tickers, "query_type": args.query_type}, headers=headers)
+            completed += 1
+            round_number += 1
+
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return completed
+
+
+async def run_scenario(client, users: Dict[str, Dict[str, str]], upstreams: StubUpstreams, scenario: str, args) -> Dict[str, Any]:
+    """Drive one scenario at the configured concurrency and collect its results."""
+    payloads = scenario_payloads(scenario, args.requests, args.query_type)
+    headers = users["interactive"]
+
+    reset_caches()
+    if scenario == "cache_hot":
+        for tickers in {tuple(payload["tickers"]) for payload in payloads}:
+            await client.post("/api/insights/analyze", json={"tickers": list(tickers), "query_type": args.query_type}, headers=headers)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    degraded = 0
+
+    async def send(payload: Dict[str, Any]):
+        nonlocal degraded
+        async with semaphore:
+            if scenario == "cache_cold":
+                reset_caches()
+            started = time.monotonic()
+            response = await client.post("/api/insights/analyze", json=payload, headers=headers)
+            latencies.append(time.monotonic() - started)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+            if response.status_code == 200 and response.json().get("degraded"):
+                degraded += 1
+
+    before = upstreams.counts()
+    stop_batch = asyncio.Event()
+    batch = None
+    if scenario == "noisy_tenant":
+        batch = asyncio.create_task(run_batch_tenant(client, users["batch"], args, stop_batch))
+        await asyncio.sleep(1.0)  # Let the batch tenant fill the queues first
+
+    with LoopLagMonitor() as lag:
+        started = time.monotonic()
+        await asyncio.gather(*(send(payload) for payload in payloads))
+        elapsed = time.monotonic() - started
+
+    result = {}
+    if batch is not None:
+        stop_batch.set()
+        result["batch_requests_completed"] = await batch
+
+    return {
+        **result,
+        "requests": len(payloads),
+        "tickers_per_request": len(payloads[0]["tickers"]),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_second": round(len(payloads) / elapsed, 2),
+        "latency": summarize(latencies),
+        "status_codes": statuses,
+        "degraded_responses": degraded,
+        "event_loop_lag": summarize(lag.samples),
+        "upstream_calls": counts_delta(before, upstreams.counts())
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    upstreams = StubUpstreams(args)
+    upstreams.start()
+
+    database_dir = tempfile.mkdtemp(prefix="bench-insights-")
+    configure_environment(upstreams, os.path.join(database_dir, "bench.db"))
+
+    import httpx
+    from app.main import app
+
+    if not args.verbose:
+        logging.getLogger("app").setLevel(logging.WARNING)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results: Dict[str, Any] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            users = {}
+            for name in ("interactive", "batch"):
+                user = {"email": f"bench-{name}@example.com", "username": f"bench-{name}", "password": "benchmark-password"}
+                await client.post("/api/auth/signup", json=user)
+                login = await client.post("/api/auth/login", json={"username": user["username"], "password": user["password"]})
+                users[name] = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+            for scenario in args.scenarios:
+                print(f"Running {scenario}...", file=sys.stderr)
+                results[scenario] = await run_scenario(client, users, upstreams, scenario, args)
+                print(
+                    f"  {results[scenario]['requests_per_second']} req/s, "
+                    f"p95 {results[scenario]['latency']['p95_ms']} ms, "
+                    f"loop lag p99 {results[scenario]['event_loop_lag']['p99_ms']} ms",
+                    file=sys.stderr
+                )
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "query_type": args.query_type,
+            "gemini_latency_s": args.gemini_latency,
+            "finnhub_latency_s": args.finnhub_latency,
+            "news_latency_s": args.news_latency,
+            "jitter_s": args.jitter,
+            "error_rate": args.error_rate,
+            "output_tokens": args.output_tokens
+        },
+        "scenarios": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument(
+        "--query-type", default="decision_synthesis",
+        choices=["market_analysis", "news_sentiment", "risk_assessment", "decision_synthesis"]
+    )
+    parser.add_argument("--gemini-latency", type=float, default=0.3, help="Stand-in LLM latency in seconds")
+    parser.add_argument("--finnhub-latency", type=float, default=0.05, help="Stand-in quote latency in seconds")
+    parser.add_argument("--news-latency", type=float, default=0.15, help="Stand-in news latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Random extra latency per upstream call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream calls that fail")
+    parser.add_argument("--output-tokens", type=int, default=150, help="Approximate LLM answer size in tokens")
+    parser.add_argument("--output", default="bench-insights.json", help="Where to write the JSON results")
+    parser.add_argument("--verbose", action="store_true", help="Keep application INFO logging")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args))
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
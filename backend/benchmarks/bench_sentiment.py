@@ -0,0 +1,143 @@
+"""
+Throughput benchmark for lexicon news sentiment scoring.
+
+Generates a reproducible corpus of headline-plus-description texts mixing
+lexicon words, negations and filler, then scores it three ways and reports
+articles/sec:
+
+    legacy     the previous substring scorer (22 keywords, no negation)
+    per_text   ``sentiment_engine.score`` called once per article
+    batch      ``sentiment_engine.score_batch`` over batches of ``--batch-size``
+
+It also reports how often the legacy and lexicon labels agree, and writes
+everything to a JSON file so runs can be diffed across versions.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_sentiment --articles 20000 --batch-size 500 \\
+        --output bench-sentiment.json
+"""
+from typing import Any, Callable, Dict, List
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.bench_insights import git_revision
+
+_FILLER = (
+    "the company said shares quarter analysts investors market revenue guidance "
+    "its results for reported year on in of to a and with after as ceo fiscal"
+).split()
+_NEGATIONS = ("not", "no", "didn't", "never", "without")
+
+
+def legacy_sentiment(text: str) -> Dict[str, Any]:
+    """The substring keyword scorer the lexicon engine replaced."""
+    positive_words = [
+        "growth", "profit", "gain", "surge", "rally", "bullish",
+        "positive", "strong", "beat", "outperform", "success"
+    ]
+    negative_words = [
+        "loss", "decline", "fall", "drop", "bearish", "negative",
+        "weak", "miss", "underperform", "risk", "concern"
+    ]
+
+    text_lower = text.lower()
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+
+    total = positive_count + negative_count
+    score = (positive_count - negative_count) / total if total else 0.0
+    label = "positive" if score > 0.2 else "negative" if score < -0.2 else "neutral"
+    return {"score": score, "label": label}
+
+
+def build_corpus(count: int, words: List[str], seed: int) -> List[str]:
+    """Synthetic article texts of 25-60 tokens, about 1 in 8 of them sentiment words."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        tokens = []
+        for _ in range(rng.randint(25, 60)):
+            roll = rng.random()
+            if roll < 0.12:
+                tokens.append(rng.choice(words))
+            elif roll < 0.15:
+                tokens.append(rng.choice(_NEGATIONS))
+            else:
+                tokens.append(rng.choice(_FILLER))
+            if rng.random() < 0.06:
+                tokens[-1] += rng.choice(",.")
+        texts.append(" ".join(tokens).capitalize())
+    return texts
+
+
+def measure(name: str, run: Callable[[], List[Dict[str, Any]]], articles: int, repeats: int) -> Dict[str, Any]:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    result = {"seconds": round(best, 4), "articles_per_second": round(articles / best)}
+    print(f"  {name}: {result['articles_per_second']} articles/s", file=sys.stderr)
+    return result
+
+
+def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.services.sentiment import sentiment_engine
+
+    words = sorted(word for word, code in sentiment_engine.codes.items() if code in (1, -1))
+    texts = build_corpus(args.articles, words, args.seed)
+    batches = [texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+
+    def batched() -> List[Dict[str, Any]]:
+        return [result for batch in batches for result in sentiment_engine.score_batch(batch)]
+
+    print(f"Scoring {len(texts)} articles...", file=sys.stderr)
+    results = {
+        "legacy": measure("legacy", lambda: [legacy_sentiment(t) for t in texts], len(texts), args.repeats),
+        "per_text": measure("per_text", lambda: [sentiment_engine.score(t) for t in texts], len(texts), args.repeats),
+        "batch": measure("batch", batched, len(texts), args.repeats)
+    }
+
+    legacy_labels = [legacy_sentiment(t)["label"] for t in texts]
+    lexicon_labels = [result["label"] for result in batched()]
+    agreement = sum(a == b for a, b in zip(legacy_labels, lexicon_labels)) / len(texts)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "config": {
+            "articles": args.articles,
+            "batch_size": args.batch_size,
+            "repeats": args.repeats,
+            "seed": args.seed,
+            "lexicon_words": len(words),
+            "lexicon_path": str(sentiment_engine.lexicon_path)
+        },
+        "scorers": results,
+        "batch_speedup_vs_legacy": round(results["legacy"]["seconds"] / results["batch"]["seconds"], 2),
+        "label_agreement_with_legacy": round(agreement, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20000, help="Articles in the generated corpus")
+    parser.add_argument("--batch-size", type=int, default=500, help="Articles per score_batch call")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per scorer (best is reported)")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus random seed")
+    parser.add_argument("--output", default="bench-sentiment.json", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    results = benchmark(args)
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
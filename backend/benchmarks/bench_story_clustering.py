@@ -0,0 +1,160 @@
+"""
+Scaling and payload benchmark for news story clustering.
+
+Generates a reproducible corpus of wire stories, each reported by several
+outlets with lightly edited headlines (source suffixes, dropped or swapped
+words, changed case), mixed with unrelated one-off articles. The corpus is
+clustered at each ``--sizes`` step with ``cluster_stories`` and the script
+reports, per size:
+
+    seconds / articles_per_second   time to group the corpus
+    precision / recall              pairwise, against the generated stories
+    payload_ratio                   story JSON bytes / article JSON bytes
+
+Roughly constant articles/sec across sizes shows grouping stays near-linear.
+Results are written to a JSON file so runs can be diffed across versions.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_story_clustering --sizes 1000 4000 16000 \\
+        --output bench-story-clustering.json
+"""
+from typing import Any, Dict, List, Tuple
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.bench_insights import git_revision
+
+_WORDS = (
+    "apple microsoft tesla nvidia amazon fed oil gold bitcoin bank shares stock profit revenue "
+    "quarter guidance forecast rally slump surge merger deal chip cloud sales demand inflation "
+    "rates jobs report earnings outlook cuts raises buyback dividend investors analysts record "
+    "china europe tariffs supply factory retail consumer energy crude yields bonds dollar"
+).split()
+_SOURCES = ["Reuters", "Bloomberg", "CNBC", "AP", "MarketWatch", "Yahoo Finance", "WSJ", "FT", "Barron's"]
+
+
+def _variant(headline: List[str], source: str, rng: random.Random) -> str:
+    """One outlet's version of a headline."""
+    words = list(headline)
+    edit = rng.random()
+    if edit < 0.3 and len(words) > 6:
+        del words[rng.randrange(len(words))]
+    elif edit < 0.5:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    title = " ".join(words)
+    if rng.random() < 0.4:
+        title = title.title()
+    if rng.random() < 0.5:
+        title = f"{title} - {source}"
+    return title
+
+
+def build_corpus(count: int, seed: int) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Articles and the generated story each belongs to (about 1 in 4 articles is a one-off)."""
+    rng = random.Random(seed)
+    articles: List[Dict[str, Any]] = []
+    labels: List[int] = []
+    story = 0
+    while len(articles) < count:
+        headline = rng.sample(_WORDS, rng.randint(7, 12))
+        outlets = rng.sample(_SOURCES, 1 if rng.random() < 0.25 else rng.randint(2, 6))
+        for source in outlets:
+            articles.append({
+                "title": _variant(headline, source, rng),
+                "description": " ".join(rng.choices(_WORDS, k=30)),
+                "source": source,
+                "url": f"https://news.example/{story}/{len(articles)}",
+                "published_at": f"2024-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+                "content": " ".join(rng.choices(_WORDS, k=80))
+            })
+            labels.append(story)
+        story += 1
+    return articles[:count], labels[:count]
+
+
+def pair_scores(clusters: List[List[int]], labels: List[int]) -> Dict[str, float]:
+    """Pairwise precision and recall of the clustering against the generated stories."""
+    predicted = {pair for members in clusters for pair in itertools.combinations(sorted(members), 2)}
+    by_story: Dict[int, List[int]] = {}
+    for i, label in enumerate(labels):
+        by_story.setdefault(label, []).append(i)
+    actual = {pair for members in by_story.values() for pair in itertools.combinations(members, 2)}
+    hits = len(predicted & actual)
+    return {
+        "precision": round(hits / len(predicted), 4) if predicted else 1.0,
+        "recall": round(hits / len(actual), 4) if actual else 1.0
+    }
+
+
+def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.core.config import settings
+    from app.services.article_clustering import cluster_stories, story_entries
+
+    results = []
+    for size in args.sizes:
+        articles, labels = build_corpus(size, args.seed)
+        positions = {id(article): i for i, article in enumerate(articles)}
+
+        best = float("inf")
+        for _ in range(args.repeats):
+            started = time.perf_counter()
+            clusters = cluster_stories(articles)
+            best = min(best, time.perf_counter() - started)
+
+        members = [[positions[id(article)] for article in cluster.members] for cluster in clusters]
+        article_bytes = len(json.dumps(articles))
+        story_bytes = len(json.dumps(story_entries(articles)))
+        result = {
+            "articles": size,
+            "stories": len(clusters),
+            "seconds": round(best, 4),
+            "articles_per_second": round(size / best),
+            **pair_scores(members, labels),
+            "payload_ratio": round(story_bytes / article_bytes, 3)
+        }
+        print(
+            f"  {size}: {result['articles_per_second']} articles/s, {result['stories']} stories, "
+            f"precision {result['precision']}, recall {result['recall']}, payload x{result['payload_ratio']}",
+            file=sys.stderr
+        )
+        results.append(result)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "config": {
+            "sizes": args.sizes,
+            "repeats": args.repeats,
+            "seed": args.seed,
+            "min_similarity": settings.NEWS_STORY_MIN_SIMILARITY,
+            "shingle_chars": settings.NEWS_STORY_SHINGLE_CHARS,
+            "permutations": settings.NEWS_STORY_MINHASH_PERMUTATIONS,
+            "lsh_bands": settings.NEWS_STORY_LSH_BANDS
+        },
+        "runs": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000], help="Corpus sizes to cluster")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per size (best is reported)")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus random seed")
+    parser.add_argument("--output", default="bench-story-clustering.json", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    results = benchmark(args)
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
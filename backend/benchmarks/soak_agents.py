@@ -0,0 +1,125 @@
+"""
+Soak test for agent invocations.
+
+Runs thousands of market and news analyses against a recording stand-in LLM
+and fails if process RSS or the prompt sent to the LLM grows over time.
+
+Usage (from the backend directory):
+    python -m benchmarks.soak_agents --iterations 3000
+"""
+from typing import List, Tuple
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+from datetime import datetime, timezone
+
+# Settings require API keys; the soak test never calls real upstreams
+for key in ("SECRET_KEY", "GEMINI_API_KEY", "MARKET_DATA_API_KEY", "NEWS_API_KEY"):
+    os.environ.setdefault(key, "soak-test")
+
+from phi.llm.base import LLM  # noqa: E402
+from phi.llm.message import Message  # noqa: E402
+
+from app.agents import market_agent, news_agent  # noqa: E402
+
+# (message count, prompt characters) for every LLM call
+LLM_CALLS: List[Tuple[int, int]] = []
+
+
+class RecordingLLM(LLM):
+    """Stand-in LLM that records prompt size and returns a fixed analysis."""
+
+    model: str = "soak-stand-in"
+
+    def response(self, messages: List[Message]) -> str:
+        LLM_CALLS.append((len(messages), sum(len(m.get_content_string()) for m in messages)))
+        return "Neutral outlook with balanced risk.\nConfidence: 0.7\nSCORE 1: 0.1"
+
+
+def current_rss_mb() -> float:
+    """Current resident set size in MB (Linux), falling back to peak RSS."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def soak(iterations: int, tickers: int) -> dict:
+    market_agent._build_llm = lambda model: RecordingLLM()
+    news_agent._build_llm = lambda model: RecordingLLM()
+
+    price_data = {
+        "current_price": 101.25, "open": 100.0, "high": 102.0, "low": 99.5,
+        "change": 1.25, "change_percent": 1.25, "volume": 1_000_000
+    }
+
+    warmup = max(iterations // 10, 1)
+    rss_samples = []
+
+    for i in range(iterations):
+        ticker = f"T{i % tickers}"
+        await market_agent.analyze_price_action(ticker, price_data)
+
+        # One unseen article per call, so every news analysis reaches the LLM
+        article = {
+            "title": f"{ticker} update number {i}",
+            "description": "Routine company update with no surprises.",
+            "source": "Soak Wire",
+            "url": f"https://example.com/{ticker}/{i}",
+            "published_at": datetime.now(timezone.utc).isoformat()
+        }
+        await news_agent.analyze_news_sentiment(ticker, articles=[article])
+
+        if i + 1 == warmup or (i + 1) % warmup == 0:
+            rss_samples.append(round(current_rss_mb(), 2))
+
+    steady_calls = LLM_CALLS[2 * warmup:]
+    message_counts = sorted({count for count, _ in steady_calls})
+    prompt_chars = [chars for _, chars in steady_calls]
+
+    return {
+        "iterations": iterations,
+        "llm_calls": len(LLM_CALLS),
+        "rss_mb_samples": rss_samples,
+        "rss_growth_mb": round(rss_samples[-1] - rss_samples[0], 2),
+        "message_counts": message_counts,
+        "prompt_chars_min": min(prompt_chars),
+        "prompt_chars_max": max(prompt_chars),
+        "first_prompt_chars": LLM_CALLS[0][1],
+        "last_prompt_chars": LLM_CALLS[-1][1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=3000)
+    parser.add_argument("--tickers", type=int, default=5)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=10.0)
+    parser.add_argument("--max-prompt-chars", type=int, default=8000)
+    args = parser.parse_args()
+
+    report = asyncio.run(soak(args.iterations, args.tickers))
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if report["rss_growth_mb"] > args.max_rss_growth_mb:
+        failures.append(f"RSS grew by {report['rss_growth_mb']} MB after warm-up")
+    if len(report["message_counts"]) > 2:
+        failures.append(f"LLM message count varies across calls: {report['message_counts']}")
+    if report["prompt_chars_max"] > args.max_prompt_chars:
+        failures.append(f"Prompt reached {report['prompt_chars_max']} characters")
+
+    if failures:
+        print("SOAK FAILED: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+    print("SOAK PASSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Local stand-in servers for upstream APIs, for offline testing and benchmarks.
+
+Gemini stand-in (point GEMINI_API_ENDPOINT at it):
+    python -m benchmarks.stub_servers gemini --port 8090 \\
+        --latency gemini-1.5-pro=15 --latency gemini-2.0-flash-exp=0.5
+
+Finnhub and NewsAPI stand-ins (point FINNHUB_BASE_URL at
+http://127.0.0.1:8091/api/v1 and NEWS_API_BASE_URL at http://127.0.0.1:8092/v2):
+    python -m benchmarks.stub_servers finnhub --port 8091 --latency 0.05
+    python -m benchmarks.stub_servers newsapi --port 8092 --latency 0.2 --error-rate 0.05
+
+Latencies can be changed while the server runs:
+    curl -X POST localhost:8090/_stub/latency -d '{"gemini-1.5-pro": 2.0}'
+"""
+from typing import Any, Dict, Optional
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+# Numbered article entries in news prompts ("1. [Source] Title")
+_ARTICLE_ENTRY = re.compile(r'^(\d+)\. \[', re.MULTILINE)
+
+# Filler appended to Gemini answers to reach the configured output size (~4 characters per token)
+_FILLER_SENTENCE = "Volume and breadth are consistent with the prevailing trend. "
+
+_HEADLINES = [
+    "{ticker} beats earnings expectations as revenue growth accelerates",
+    "{ticker} shares slip after analyst downgrade on valuation concerns",
+    "{ticker} announces expanded buyback program",
+    "Regulators open inquiry into {ticker} supply agreements",
+    "{ticker} unveils new product line at investor day",
+    "{ticker} guidance steady despite weak consumer demand",
+    "Institutional investors raise stakes in {ticker}",
+    "{ticker} faces margin pressure from rising input costs",
+]
+
+
+def _injected_error(error_rate: float) -> Optional[web.Response]:
+    """Error response to return instead of a normal answer, at ``error_rate``."""
+    if error_rate > 0 and random.random() < error_rate:
+        status = random.choice((429, 500, 503))
+        return web.json_response({"status": "error", "code": status, "message": "Injected stand-in error"}, status=status)
+    return None
+
+
+def _count(stats: Dict[str, Any], key: str, name: str):
+    counts = stats.setdefault(key, {})
+    counts[name] = counts.get(name, 0) + 1
+
+
+def parse_latencies(values) -> Dict[str, float]:
+    """Parse repeated MODEL=SECONDS options."""
+    latencies = {}
+    for value in values or []:
+        model, _, seconds = value.partition("=")
+        latencies[model] = float(seconds)
+    return latencies
+
+
+def create_gemini_app(
+    latencies: Dict[str, float],
+    default_latency: float,
+    jitter: float,
+    error_rate: float = 0.0,
+    output_tokens: int = 0
+) -> web.Application:
+    """
+    Stand-in for the Gemini REST ``generateContent`` endpoint.
+
+    Each model answers after its configured latency (plus up to ``jitter``
+    seconds) with a canned analysis that includes a confidence line and one
+    SCORE line per numbered article in the prompt. Answers are padded to about
+    ``output_tokens`` tokens, and a fraction ``error_rate`` of requests fail.
+    """
+    stats = {"requests": {}, "errors": {}}
+
+    async def generate_content(request: web.Request) -> web.Response:
+        model, _, action = request.match_info["model_action"].partition(":")
+        if action != "generateContent":
+            return web.json_response({"error": {"code": 404, "message": "Unsupported action"}}, status=404)
+
+        body = await request.json()
+        prompt = "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+
+        _count(stats, "requests", model)
+        await asyncio.sleep(latencies.get(model, default_latency) + random.uniform(0, jitter))
+
+        error = _injected_error(error_rate)
+        if error is not None:
+            _count(stats, "errors", model)
+            return error
+
+        scores = "\n".join(
+            f"SCORE {number}: {random.uniform(-0.5, 0.8):.2f}"
+            for number in _ARTICLE_ENTRY.findall(prompt)
+        )
+        text = (
+            f"**Stand-in analysis ({model})**\n\n"
+            "- Trend: Neutral to bullish\n"
+            "- Key levels: support near the session low, resistance near the high\n"
+            "- Risk: moderate\n\n"
+            "Confidence: 0.72\n"
+            f"{scores}"
+        )
+        if output_tokens * 4 > len(text):
+            padding = output_tokens * 4 - len(text)
+            text += "\n\n" + (_FILLER_SENTENCE * (padding // len(_FILLER_SENTENCE) + 1))[:padding]
+
+        return web.json_response({
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (len(prompt) + len(text)) // 4
+            }
+        })
+
+    async def set_latency(request: web.Request) -> web.Response:
+        latencies.update({model: float(seconds) for model, seconds in (await request.json()).items()})
+        return web.json_response(latencies)
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_post("/v1beta/models/{model_action}", generate_content)
+    app.router.add_post("/_stub/latency", set_latency)
+    app.router.add_get("/_stub/stats", get_stats)
+    app["stats"] = stats
+    return app
+
+
+def create_finnhub_app(latency: float, jitter: float, error_rate: float = 0.0) -> web.Application:
+    """
+    Stand-in for the Finnhub REST ``/api/v1/quote`` endpoint.
+
+    Quotes are stable per ticker with a small random walk between calls.
+    """
+    stats = {"requests": {}, "errors": {}}
+    settings = {"latency": latency}
+
+    async def quote(request: web.Request) -> web.Response:
+        symbol = request.query.get("symbol", "").upper()
+        _count(stats, "requests", "quote")
+        await asyncio.sleep(settings["latency"] + random.uniform(0, jitter))
+
+        error = _injected_error(error_rate)
+        if error is not None:
+            _count(stats, "errors", "quote")
+            return error
+
+        seed = int(hashlib.sha256(symbol.encode("utf-8")).hexdigest()[:8], 16)
+        previous_close = 20 + seed % 480
+        price = round(previous_close * (1 + random.uniform(-0.02, 0.02)), 2)
+        return web.json_response({
+            "c": price,
+            "d": round(price - previous_close, 2),
+            "dp": round((price - previous_close) / previous_close * 100, 4),
+            "h": round(max(price, previous_close) * 1.01, 2),
+            "l": round(min(price, previous_close) * 0.99, 2),
+            "o": previous_close,
+            "pc": previous_close,
+            "v": 1_000_000 + seed % 9_000_000,
+            "t": int(datetime.now(timezone.utc).timestamp())
+        })
+
+    async def set_latency(request: web.Request) -> web.Response:
+        settings["latency"] = float((await request.json())["latency"])
+        return web.json_response(settings)
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_get("/api/v1/quote", quote)
+    app.router.add_post("/_stub/latency", set_latency)
+    app.router.add_get("/_stub/stats", get_stats)
+    app["stats"] = stats
+    return app
+
+
+def create_newsapi_app(latency: float, jitter: float, error_rate: float = 0.0) -> web.Application:
+    """
+    Stand-in for the NewsAPI ``/v2/everything`` and ``/v2/top-headlines`` endpoints.
+
+    Returns ``pageSize`` generated articles mentioning the queried ticker,
+    published over the last few days.
+    """
+    stats = {"requests": {}, "errors": {}}
+    settings = {"latency": latency}
+
+    def articles_for(query: str, count: int):
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                "source": {"id": None, "name": f"Stand-in Wire {i % 5}"},
+                "author": "Stand-in Reporter",
+                "title": _HEADLINES[i % len(_HEADLINES)].format(ticker=query),
+                "description": f"Coverage of {query}: " + _HEADLINES[(i + 3) % len(_HEADLINES)].format(ticker=query),
+                "url": f"https://news.example.com/{query.lower()}/{i}",
+                "publishedAt": (now - timedelta(hours=3 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "content": f"{query} " + _FILLER_SENTENCE * 4
+            }
+            for i in range(count)
+        ]
+
+    async def respond(request: web.Request, endpoint: str, query: str) -> web.Response:
+        _count(stats, "requests", endpoint)
+        await asyncio.sleep(settings["latency"] + random.uniform(0, jitter))
+
+        error = _injected_error(error_rate)
+        if error is not None:
+            _count(stats, "errors", endpoint)
+            return error
+
+        page_size = min(int(request.query.get("pageSize", 20)), 100)
+        articles = articles_for(query, page_size)
+        return web.json_response({"status": "ok", "totalResults": len(articles), "articles": articles})
+
+    async def everything(request: web.Request) -> web.Response:
+        return await respond(request, "everything", request.query.get("q", "MARKET"))
+
+    async def top_headlines(request: web.Request) -> web.Response:
+        return await respond(request, "top-headlines", request.query.get("category", "business").title())
+
+    async def set_latency(request: web.Request) -> web.Response:
+        settings["latency"] = float((await request.json())["latency"])
+        return web.json_response(settings)
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_get("/v2/everything", everything)
+    app.router.add_get("/v2/top-headlines", top_headlines)
+    app.router.add_post("/_stub/latency", set_latency)
+    app.router.add_get("/_stub/stats", get_stats)
+    app["stats"] = stats
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="service", required=True)
+
+    gemini = subparsers.add_parser("gemini", help="Gemini generateContent stand-in")
+    gemini.add_argument("--port", type=int, default=8090)
+    gemini.add_argument("--latency", action="append", metavar="MODEL=SECONDS", help="Per-model latency")
+    gemini.add_argument("--default-latency", type=float, default=0.5)
+    gemini.add_argument("--jitter", type=float, default=0.1)
+    gemini.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    gemini.add_argument("--output-tokens", type=int, default=0, help="Pad answers to about this many tokens")
+
+    for service, port, latency in (("finnhub", 8091, 0.05), ("newsapi", 8092, 0.2)):
+        upstream = subparsers.add_parser(service, help=f"{service} stand-in")
+        upstream.add_argument("--port", type=int, default=port)
+        upstream.add_argument("--latency", type=float, default=latency, help="Response latency in seconds")
+        upstream.add_argument("--jitter", type=float, default=0.02)
+        upstream.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+
+    args = parser.parse_args()
+
+    if args.service == "gemini":
+        app = create_gemini_app(
+            parse_latencies(args.latency), args.default_latency, args.jitter, args.error_rate, args.output_tokens
+        )
+    elif args.service == "finnhub":
+        app = create_finnhub_app(args.latency, args.jitter, args.error_rate)
+    else:
+        app = create_newsapi_app(args.latency, args.jitter, args.error_rate)
+
+    web.run_app(app, host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
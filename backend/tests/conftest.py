@@ -0,0 +1,40 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Settings require the API keys; unit tests never reach the real services
+for name in ("SECRET_KEY", "GEMINI_API_KEY", "MARKET_DATA_API_KEY", "NEWS_API_KEY"):
+    os.environ.setdefault(name, "test")
+
+# Keep test databases out of the working tree
+_scratch = Path(tempfile.mkdtemp(prefix="backend-tests-"))
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_scratch / 'test.db'}")
+os.environ.setdefault("NEWS_INDEX_PATH", str(_scratch / "news_index.db"))
+os.environ.setdefault("DEBUG", "False")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def run_in_db():
+    """Run a coroutine against freshly created tables."""
+    from app.core.database import Base, engine
+    import app.models  # noqa: F401  (registers the tables)
+
+    def run(coro):
+        async def scenario():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+            try:
+                return await coro
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(scenario())
+
+    return run
@@ -0,0 +1,66 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.admission import AdmissionController, LANE_BACKGROUND, LANE_INTERACTIVE
+
+
+async def _call(controller, user_id, lane, order, release):
+    with controller.context(user_id, lane):
+        async with controller.admit():
+            order.append((user_id, lane))
+            await release.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_lane_weights_order_queued_calls(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_CONCURRENT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_LANE_WEIGHTS", {LANE_INTERACTIVE: 8.0, LANE_BACKGROUND: 1.0})
+
+    async def scenario():
+        controller = AdmissionController()
+        order = []
+        hold, done = asyncio.Event(), asyncio.Event()
+        done.set()
+        tasks = [asyncio.create_task(_call(controller, 1, LANE_INTERACTIVE, order, hold))]
+        await _settle()
+
+        # Background calls queued first fall behind: each advances its flow by 1, interactive by 1/8
+        tasks += [asyncio.create_task(_call(controller, 2, LANE_BACKGROUND, order, done)) for _ in range(3)]
+        await _settle()
+        tasks += [asyncio.create_task(_call(controller, 3, LANE_INTERACTIVE, order, done)) for _ in range(3)]
+        await _settle()
+        assert controller.stats()["queued"] == 6
+
+        hold.set()
+        await asyncio.gather(*tasks)
+        assert [user for user, _ in order] == [1, 2, 3, 3, 3, 2, 2]
+        assert controller.stats()["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_per_user_cap_lets_other_users_through(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_CONCURRENT", 8)
+    monkeypatch.setattr(settings, "ADMISSION_PER_USER_MAX_CONCURRENT", 2)
+
+    async def scenario():
+        controller = AdmissionController()
+        order = []
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_call(controller, 1, LANE_INTERACTIVE, order, release)) for _ in range(3)]
+        tasks.append(asyncio.create_task(_call(controller, 2, LANE_INTERACTIVE, order, release)))
+        await _settle()
+
+        assert order == [(1, LANE_INTERACTIVE)] * 2 + [(2, LANE_INTERACTIVE)]
+        assert controller.stats()["queued"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert len(order) == 4
+        assert controller.stats()["active"] == 0
+
+    asyncio.run(scenario())
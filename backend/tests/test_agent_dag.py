@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from app.services.agent_dag import AgentDagExecutor, DagNode
+
+
+async def _value(value, delay=0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_timed_out_node_falls_back_and_feeds_dependents():
+    async def synthesis(inputs):
+        return f"{inputs['market']}+{inputs['news']}"
+
+    nodes = [
+        DagNode("market", lambda inputs: _value("market")),
+        DagNode("news", lambda inputs: _value("news", delay=5), timeout=0.05,
+                fallback=lambda inputs, error: f"local news ({type(error).__name__})"),
+        DagNode("synthesis", synthesis, deps=("market", "news"))
+    ]
+
+    results, timings = asyncio.run(AgentDagExecutor().run(nodes))
+
+    assert results["news"] == "local news (TimeoutError)"
+    assert results["synthesis"] == "market+local news (TimeoutError)"
+    assert timings["news"] < 1000
+
+
+def test_failed_node_without_fallback_contributes_none():
+    async def failing(inputs):
+        raise RuntimeError("upstream down")
+
+    nodes = [
+        DagNode("market", failing),
+        DagNode("synthesis", lambda inputs: _value(inputs["market"]), deps=("market",))
+    ]
+
+    results, _ = asyncio.run(AgentDagExecutor().run(nodes))
+
+    assert results == {"market": None, "synthesis": None}
+
+
+def test_independent_nodes_run_concurrently():
+    nodes = [
+        DagNode("market", lambda inputs: _value("market", delay=0.2)),
+        DagNode("news", lambda inputs: _value("news", delay=0.2))
+    ]
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await AgentDagExecutor().run(nodes)
+        return loop.time() - started
+
+    assert asyncio.run(timed()) < 0.35
+
+
+def test_cached_node_result_is_reused():
+    calls = []
+
+    async def synthesis(inputs):
+        calls.append(inputs["market"])
+        return "insight"
+
+    def nodes():
+        return [
+            DagNode("market", lambda inputs: _value("quote")),
+            DagNode("synthesis", synthesis, deps=("market",), cache_key=lambda inputs: inputs["market"], cache_ttl=60)
+        ]
+
+    executor = AgentDagExecutor()
+    asyncio.run(executor.run(nodes()))
+    results, _ = asyncio.run(executor.run(nodes()))
+
+    assert results["synthesis"] == "insight"
+    assert calls == ["quote"]
+
+
+@pytest.mark.parametrize("nodes", [
+    [DagNode("a", lambda inputs: _value(1), deps=("b",)), DagNode("b", lambda inputs: _value(2), deps=("a",))],
+    [DagNode("a", lambda inputs: _value(1), deps=("missing",))]
+])
+def test_invalid_graph_is_rejected(nodes):
+    with pytest.raises(ValueError):
+        asyncio.run(AgentDagExecutor().run(nodes))
@@ -0,0 +1,240 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.market import AIQueryRequest, AIQueryResponse, QueryType, StockPrice
+from app.services import agent_service as agent_service_module
+from app.services.agent_service import AgentOrchestrationService
+from app.services.model_router import TIER_DEEP, model_router
+
+
+def _request(*tickers, query_type=QueryType.MARKET_ANALYSIS):
+    return AIQueryRequest(tickers=list(tickers), query_type=query_type)
+
+
+def _service(degraded=False, delay=0.05):
+    service = AgentOrchestrationService()
+    runs = []
+
+    async def execute_query(query_request, progress_callback=None):
+        runs.append(query_request.tickers)
+        await asyncio.sleep(delay)
+        if progress_callback:
+            await progress_callback(len(query_request.tickers), len(query_request.tickers))
+        return AIQueryResponse(
+            query_id=1,
+            query_type=query_request.query_type,
+            tickers=query_request.tickers,
+            insights=[],
+            synthesis="shared",
+            risk_level="low",
+            execution_time_ms=50,
+            timestamp=datetime.utcnow(),
+            degraded=degraded
+        )
+
+    service._execute_query = execute_query
+    return service, runs
+
+
+def test_identical_concurrent_requests_share_one_run():
+    service, runs = _service()
+    progress = []
+
+    async def report(completed, total):
+        progress.append((completed, total))
+
+    async def scenario():
+        return await asyncio.gather(
+            service.execute_query(_request("AAPL", "MSFT")),
+            service.execute_query(_request("msft", "aapl"), progress_callback=report)
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert runs == [["AAPL", "MSFT"]]
+    assert first.synthesis == second.synthesis == "shared"
+    assert progress == [(2, 2)]
+
+
+def test_each_caller_gets_its_own_query_id_and_tickers():
+    service, _ = _service()
+
+    async def scenario():
+        return await asyncio.gather(
+            service.execute_query(_request("AAPL", "MSFT")),
+            service.execute_query(_request("msft", "aapl"))
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert first.query_id != second.query_id
+    assert first.tickers == ["AAPL", "MSFT"]
+    assert second.tickers == ["msft", "aapl"]
+
+
+def test_requests_for_different_tiers_are_not_shared():
+    service, runs = _service()
+
+    async def scenario():
+        await asyncio.gather(
+            service.execute_query(_request("AAPL", query_type=QueryType.DECISION_SYNTHESIS)),
+            service.execute_query(AIQueryRequest(tickers=["AAPL"], query_type=QueryType.DECISION_SYNTHESIS, depth="quick"))
+        )
+
+    asyncio.run(scenario())
+    assert runs == [["AAPL"], ["AAPL"]]
+
+
+def test_different_requests_are_not_shared():
+    service, runs = _service()
+
+    async def scenario():
+        await asyncio.gather(
+            service.execute_query(_request("AAPL")),
+            service.execute_query(_request("AAPL", query_type=QueryType.NEWS_SENTIMENT)),
+            service.execute_query(_request("AAPL", "MSFT"))
+        )
+
+    asyncio.run(scenario())
+    assert len(runs) == 3
+
+
+def test_recent_result_is_reused_within_the_grace_period(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_DEDUP_GRACE_SECONDS", 60.0)
+    service, runs = _service(delay=0)
+
+    async def scenario():
+        first = await service.execute_query(_request("AAPL"))
+        second = await service.execute_query(_request("AAPL"))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert len(runs) == 1
+    assert first.query_id != second.query_id
+
+
+def test_degraded_result_is_not_reused(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_DEDUP_GRACE_SECONDS", 60.0)
+    service, runs = _service(degraded=True, delay=0)
+
+    async def scenario():
+        await service.execute_query(_request("AAPL"))
+        await service.execute_query(_request("AAPL"))
+
+    asyncio.run(scenario())
+    assert len(runs) == 2
+
+
+def _quote(price, high=None, low=None):
+    return StockPrice(
+        ticker="AAPL", price=price, volume=1000, timestamp=datetime.utcnow(),
+        change=0.0, change_percent=0.0, open=100.0, high=high or price, low=low or price
+    )
+
+
+def _market_service(monkeypatch, quotes):
+    service = AgentOrchestrationService()
+    analyses = []
+
+    async def get_quote(ticker):
+        return quotes.pop(0)
+
+    async def analyze_price_action(ticker, price_data):
+        analyses.append(price_data["current_price"])
+        return {"analysis": f"at {price_data['current_price']}", "confidence": 0.8, "reasoning": "r",
+                "model": model_router.select_model()}
+
+    async def no_stored_insight(ticker, analysis_type):
+        return None
+
+    monkeypatch.setattr(agent_service_module.stock_stream_manager, "get_quote", get_quote)
+    monkeypatch.setattr(agent_service_module.market_agent, "analyze_price_action", analyze_price_action)
+    monkeypatch.setattr(agent_service_module.insight_store, "get", no_stored_insight)
+    return service, analyses
+
+
+@pytest.mark.parametrize("previous, current, material", [
+    ({"price": 100.0, "volatility_pct": 2.0}, {"price": 100.4, "volatility_pct": 2.5}, False),
+    ({"price": 100.0, "volatility_pct": 2.0}, {"price": 100.5, "volatility_pct": 2.0}, True),
+    ({"price": 100.0, "volatility_pct": 2.0}, {"price": 100.0, "volatility_pct": 3.0}, True),
+    ({}, {"price": 100.0, "volatility_pct": 2.0}, True)
+])
+def test_market_materiality(monkeypatch, previous, current, material):
+    monkeypatch.setattr(settings, "MATERIALITY_PRICE_MOVE_PCT", 0.5)
+    monkeypatch.setattr(settings, "MATERIALITY_VOLATILITY_CHANGE_PCT", 1.0)
+    assert AgentOrchestrationService()._market_change_is_material(previous, current) is material
+
+
+@pytest.mark.parametrize("current, material", [
+    (["a", "b", "c"], False),
+    (["a", "b", "c", "d"], False),
+    (["a", "d", "e"], True)
+])
+def test_news_materiality(monkeypatch, current, material):
+    monkeypatch.setattr(settings, "MATERIALITY_MIN_NEW_ARTICLES", 2)
+    previous = {"article_fingerprints": ["a", "b", "c"]}
+    assert AgentOrchestrationService()._news_change_is_material(previous, {"article_fingerprints": current}) is material
+
+
+def test_market_insight_is_reused_until_the_move_is_material(monkeypatch):
+    monkeypatch.setattr(settings, "MATERIALITY_PRICE_MOVE_PCT", 0.5)
+    service, analyses = _market_service(monkeypatch, [_quote(100.0), _quote(100.2), _quote(101.0)])
+
+    async def scenario():
+        return [await service.analyze_market_ticker("AAPL") for _ in range(3)]
+
+    first, second, third = asyncio.run(scenario())
+
+    assert analyses == [100.0, 101.0]
+    assert second.summary == first.summary
+    assert second.details["reused"] is True
+    assert "reused" not in third.details
+
+
+def test_use_cache_false_always_recomputes(monkeypatch):
+    service, analyses = _market_service(monkeypatch, [_quote(100.0), _quote(100.0)])
+
+    async def scenario():
+        await service.analyze_market_ticker("AAPL")
+        await service.analyze_market_ticker("AAPL", use_cache=False)
+
+    asyncio.run(scenario())
+    assert analyses == [100.0, 100.0]
+
+
+def test_stale_cached_insight_is_recomputed(monkeypatch):
+    monkeypatch.setattr(settings, "MATERIALITY_MAX_AGE_MINUTES", 0)
+    service, analyses = _market_service(monkeypatch, [_quote(100.0), _quote(100.0)])
+
+    async def scenario():
+        await service.analyze_market_ticker("AAPL")
+        await service.analyze_market_ticker("AAPL")
+
+    asyncio.run(scenario())
+    assert analyses == [100.0, 100.0]
+
+
+def test_fast_insight_is_not_reused_for_a_deep_request(monkeypatch):
+    service, analyses = _market_service(monkeypatch, [_quote(100.0) for _ in range(4)])
+
+    async def deep():
+        with model_router.use_tier(TIER_DEEP):
+            return await service.analyze_market_ticker("AAPL")
+
+    async def scenario():
+        await service.analyze_market_ticker("AAPL")
+        first_deep = await deep()
+        second_deep = await deep()
+        fast = await service.analyze_market_ticker("AAPL")
+        return first_deep, second_deep, fast
+
+    first_deep, second_deep, fast = asyncio.run(scenario())
+
+    assert analyses == [100.0, 100.0]
+    assert first_deep.details["model"] == settings.GEMINI_DEEP_MODEL
+    assert "reused" not in first_deep.details
+    assert second_deep.details["reused"] is True
+    assert fast.details["reused"] is True
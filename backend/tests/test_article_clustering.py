@@ -0,0 +1,80 @@
+from app.services.article_clustering import (
+    cluster_articles, cluster_stories, hamming_distance, pack_clusters, simhash, story_title
+)
+
+
+def _article(title, source):
+    return {"title": title, "source": source, "url": f"https://{source.lower()}.example/{hash(title)}"}
+
+
+def test_source_suffix_is_dropped():
+    assert story_title(_article("Tesla recalls 2 million cars - Reuters", "Reuters")) == "tesla recalls 2 million cars"
+    assert story_title({"title": "Fed holds | Bloomberg", "source": {"name": "Bloomberg"}}) == "fed holds"
+    # A dash that is part of the headline stays
+    assert story_title(_article("Tesla - the end of an era", "Reuters")) == "tesla end era"
+
+
+def test_same_story_from_different_sources_is_grouped():
+    articles = [
+        _article("Tesla recalls 2 million vehicles over Autopilot defect - Reuters", "Reuters"),
+        _article("Tesla recalls 2 million vehicles over Autopilot defect | Bloomberg", "Bloomberg"),
+        _article("Tesla recalls 2 million vehicles over Autopilot defect", "CNBC"),
+        _article("Federal Reserve holds interest rates steady - Reuters", "Reuters")
+    ]
+
+    stories = cluster_stories(articles)
+
+    assert [story.size for story in stories] == [3, 1]
+    assert stories[0].sources == ["Reuters", "Bloomberg", "CNBC"]
+    assert stories[1].members == [articles[3]]
+
+
+def test_untitled_articles_stay_apart():
+    articles = [_article("", "Reuters"), _article("", "Bloomberg")]
+    assert [story.size for story in cluster_stories(articles)] == [1, 1]
+
+
+def test_reworded_headline_is_near_duplicate():
+    original = simhash("Apple beats earnings estimates as iPhone sales surge")
+    reordered = simhash("iPhone sales surge as Apple beats earnings estimates")
+    unrelated = simhash("Oil prices fall on weak Chinese demand")
+
+    assert hamming_distance(original, reordered) == 0
+    assert hamming_distance(original, unrelated) > 6
+    assert simhash("the and of") == 0
+
+
+def test_near_duplicates_collapse_to_the_most_detailed_article():
+    articles = [
+        {"title": "Apple beats earnings estimates", "description": "Apple reported results", "url": "a"},
+        {"title": "Oil prices fall on weak demand", "description": "", "url": "b"},
+        {"title": "Apple Beats Earnings Estimates!", "description": "Apple reported results ...", "url": "c"},
+        {"title": "", "description": "", "url": "d"},
+        {"title": "", "description": "", "url": "e"}
+    ]
+
+    clusters = cluster_articles(articles, max_distance=3)
+
+    assert [cluster.size for cluster in clusters] == [2, 1, 1, 1]
+    assert clusters[0].representative is articles[2]
+
+
+def test_pack_clusters_prefers_widely_covered_stories_within_budget():
+    def cluster(title, copies, published):
+        return cluster_articles(
+            [{"title": title, "url": f"{title}{i}", "published_at": published} for i in range(copies)]
+        )[0]
+
+    wide = cluster("Fed raises rates", 3, "2024-01-01")
+    recent = cluster("Tesla recalls cars", 1, "2024-01-03")
+    older = cluster("Oil prices fall", 1, "2024-01-02")
+    long_entry = cluster("Long story", 2, "2024-01-04")
+
+    def render(position, story):
+        title = story.representative["title"]
+        return "x" * 200 if title == "Long story" else f"{position}. {title}"
+
+    packed = pack_clusters([older, recent, long_entry, wide], token_budget=20, render=render)
+
+    assert [story for story, _ in packed] == [wide, recent, older]
+    assert packed[0][1] == "1. Fed raises rates"
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents.assistant_pool import AssistantPool, ModelPools, PoolExhaustedError
+from app.agents.base import PooledLLMAgent
+from app.core.config import settings
+from app.services.admission import admission_controller
+from app.services.telemetry import telemetry
+
+
+def _assistant():
+    return SimpleNamespace(
+        memory=SimpleNamespace(chat_history=["old"], llm_messages=["old"], references=["old"]),
+        llm=SimpleNamespace(metrics={"input_tokens": 1}, function_call_stack=None)
+    )
+
+
+def test_assistants_are_reused_and_reset():
+    pool = AssistantPool("test", _assistant, size=2, checkout_timeout=1)
+
+    with pool.checkout() as first:
+        first.memory.chat_history.append("run")
+    with pool.checkout() as second:
+        assert second is first
+        assert second.memory.chat_history == []
+        assert second.llm.metrics == {}
+
+    assert pool.stats()["created"] == 1
+
+
+def test_checkout_times_out_when_every_assistant_is_busy():
+    pool = AssistantPool("test", _assistant, size=1, checkout_timeout=0.05)
+
+    with pool.checkout():
+        with pytest.raises(PoolExhaustedError):
+            with pool.checkout():
+                pass
+
+    assert pool.stats()["timeouts"] == 1
+    assert pool.stats()["in_use"] == 0
+
+
+def test_assistant_that_fails_to_reset_is_replaced():
+    built = []
+
+    def factory():
+        assistant = _assistant()
+        built.append(assistant)
+        return assistant
+
+    pool = AssistantPool("test", factory, size=1, checkout_timeout=0.05)
+    with pool.checkout() as broken:
+        broken.memory = None  # Reset now raises
+
+    with pool.checkout() as replacement:
+        assert replacement is not broken
+
+    assert len(built) == 2
+    assert pool.stats()["in_use"] == 0
+
+
+def test_failed_build_frees_its_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("no credentials")
+        return _assistant()
+
+    pool = AssistantPool("test", factory, size=1, checkout_timeout=0.05)
+    with pytest.raises(RuntimeError):
+        with pool.checkout():
+            pass
+    with pool.checkout():
+        pass
+
+
+def test_reservations_are_bounded_by_the_pool_size():
+    pools = ModelPools("test", lambda model: _assistant(), size=2, checkout_timeout=0.05)
+
+    async def scenario():
+        releases = [await pools.reserve("fast"), await pools.reserve("fast")]
+        await pools.reserve("deep")  # Other models have their own pool
+        with pytest.raises(PoolExhaustedError):
+            await pools.reserve("fast")
+
+        releases[0]()
+        await pools.reserve("fast")
+
+    asyncio.run(scenario())
+    assert pools.stats()["fast"]["timeouts"] == 1
+
+
+class StallingAgent(PooledLLMAgent):
+    def __init__(self):
+        super().__init__("stalling_agent")
+        self.unblock = threading.Event()
+
+    def _run_prompt(self, prompt, model, call):
+        self.unblock.wait(5)
+        return "late answer"
+
+
+def test_missed_deadline_keeps_admission_and_assistant_until_the_thread_returns(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "AGENT_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "AGENT_POOL_CHECKOUT_TIMEOUT_SECONDS", 0.05)
+    agent = StallingAgent()
+
+    async def scenario():
+        active = admission_controller.stats()["active"]
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await agent._complete("prompt", "fast", telemetry.agent_call("stalling_agent"))
+            assert admission_controller.stats()["active"] == active + 1
+
+            # The stalled call still owns the only assistant
+            with pytest.raises(PoolExhaustedError):
+                await agent._complete("prompt", "fast", telemetry.agent_call("stalling_agent"))
+            assert admission_controller.stats()["active"] == active + 1
+        finally:
+            agent.unblock.set()
+
+        for _ in range(100):
+            if admission_controller.stats()["active"] == active:
+                break
+            await asyncio.sleep(0.01)
+        assert admission_controller.stats()["active"] == active
+
+        agent.unblock.set()
+        assert await agent._complete("prompt", "fast", telemetry.agent_call("stalling_agent")) == "late answer"
+
+    asyncio.run(scenario())
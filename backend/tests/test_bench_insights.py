@@ -0,0 +1,38 @@
+import pytest
+
+from benchmarks.bench_insights import counts_delta, percentile, scenario_payloads, summarize
+
+
+@pytest.mark.parametrize("pct, expected", [(0, 1.0), (50, 5.0), (95, 10.0), (100, 10.0)])
+def test_percentile_uses_nearest_rank(pct, expected):
+    assert percentile([float(value) for value in range(10, 0, -1)], pct) == expected
+
+
+def test_summary_of_no_samples_is_empty():
+    assert percentile([], 50) is None
+    assert set(summarize([]).values()) == {None}
+
+
+def test_summary_is_in_milliseconds():
+    summary = summarize([0.1, 0.2, 0.3])
+    assert summary["p50_ms"] == 200.0
+    assert summary["max_ms"] == 300.0
+    assert summary["mean_ms"] == 200.0
+
+
+def test_counts_delta_keeps_only_changed_counts():
+    before = {"newsapi": {"requests": {"/v2/everything": 3, "/v2/top-headlines": 1}, "errors": {}}}
+    after = {"newsapi": {"requests": {"/v2/everything": 5, "/v2/top-headlines": 1}, "errors": {"429": 1}}}
+
+    assert counts_delta(before, after) == {
+        "newsapi": {"requests": {"/v2/everything": 2}, "errors": {"429": 1}, "total": 2}
+    }
+
+
+def test_scenario_payloads():
+    ten = scenario_payloads("ten_tickers", 3, "market_analysis")
+    hot = scenario_payloads("cache_hot", 8, "market_analysis")
+
+    assert len(ten) == 3
+    assert all(len(set(payload["tickers"])) == 10 for payload in ten)
+    assert len({payload["tickers"][0] for payload in hot}) == 4
@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import AnalysisJob, QueryHistory
+from app.schemas.market import AIQueryRequest, AIQueryResponse, AnalysisJobStatus, QueryType
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import AnalysisJobQueue
+
+
+def _request(*tickers):
+    return AIQueryRequest(tickers=list(tickers), query_type=QueryType.MARKET_ANALYSIS)
+
+
+def _response(query_request):
+    return AIQueryResponse(
+        query_id=1,
+        query_type=query_request.query_type,
+        tickers=query_request.tickers,
+        insights=[],
+        synthesis="ok",
+        risk_level="low",
+        execution_time_ms=5,
+        timestamp=datetime.utcnow()
+    )
+
+
+async def _add_job(job_id, status, attempts):
+    async with AsyncSessionLocal() as db:
+        db.add(AnalysisJob(
+            id=job_id,
+            user_id=1,
+            status=status,
+            query_type=QueryType.MARKET_ANALYSIS.value,
+            request=_request("AAPL").model_dump(mode="json"),
+            progress_total=1,
+            attempts=attempts
+        ))
+        await db.commit()
+
+
+async def _job(job_id):
+    async with AsyncSessionLocal() as db:
+        return await db.get(AnalysisJob, job_id)
+
+
+def test_recovery_requeues_unfinished_jobs_within_the_attempt_limit(run_in_db, monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_JOB_MAX_ATTEMPTS", 2)
+
+    async def scenario():
+        await _add_job("queued", AnalysisJobStatus.QUEUED.value, 0)
+        await _add_job("interrupted", AnalysisJobStatus.RUNNING.value, 1)
+        await _add_job("exhausted", AnalysisJobStatus.RUNNING.value, 2)
+        await _add_job("done", AnalysisJobStatus.COMPLETED.value, 1)
+
+        recovered = await AnalysisJobQueue()._recover_jobs()
+
+        assert sorted(recovered) == ["interrupted", "queued"]
+        assert (await _job("interrupted")).status == AnalysisJobStatus.QUEUED.value
+        exhausted = await _job("exhausted")
+        assert exhausted.status == AnalysisJobStatus.FAILED.value
+        assert exhausted.finished_at is not None
+        assert (await _job("done")).status == AnalysisJobStatus.COMPLETED.value
+
+    run_in_db(scenario())
+
+
+def test_process_records_progress_result_and_history(run_in_db, monkeypatch):
+    async def execute_query(query_request, progress_callback=None):
+        for completed in range(1, len(query_request.tickers) + 1):
+            await progress_callback(completed, len(query_request.tickers))
+        return _response(query_request)
+
+    monkeypatch.setattr(job_queue_module.agent_orchestration_service, "execute_query", execute_query)
+
+    async def scenario():
+        await _add_job("job", AnalysisJobStatus.QUEUED.value, 0)
+        queue = AnalysisJobQueue()
+        await queue._process("job")
+
+        job = await _job("job")
+        assert job.status == AnalysisJobStatus.COMPLETED.value
+        assert job.attempts == 1
+        assert (job.progress_completed, job.progress_total) == (1, 1)
+        assert job.result["synthesis"] == "ok"
+        async with AsyncSessionLocal() as db:
+            assert len((await db.execute(select(QueryHistory))).scalars().all()) == 1
+
+    run_in_db(scenario())
+
+
+def test_failed_run_marks_the_job_failed(run_in_db, monkeypatch):
+    async def execute_query(query_request, progress_callback=None):
+        raise RuntimeError("all agents down")
+
+    monkeypatch.setattr(job_queue_module.agent_orchestration_service, "execute_query", execute_query)
+
+    async def scenario():
+        await _add_job("job", AnalysisJobStatus.QUEUED.value, 0)
+        await AnalysisJobQueue()._process("job")
+
+        job = await _job("job")
+        assert job.status == AnalysisJobStatus.FAILED.value
+        assert job.error == "all agents down"
+
+    run_in_db(scenario())
+
+
+@pytest.mark.parametrize("status", [AnalysisJobStatus.RUNNING.value, AnalysisJobStatus.COMPLETED.value])
+def test_only_queued_jobs_are_processed(run_in_db, monkeypatch, status):
+    async def execute_query(query_request, progress_callback=None):
+        raise AssertionError("should not run")
+
+    monkeypatch.setattr(job_queue_module.agent_orchestration_service, "execute_query", execute_query)
+
+    async def scenario():
+        await _add_job("job", status, 1)
+        await AnalysisJobQueue()._process("job")
+        assert (await _job("job")).attempts == 1
+
+    run_in_db(scenario())
+
+
+def test_job_deleted_while_running_is_dropped(run_in_db, monkeypatch):
+    async def execute_query(query_request, progress_callback=None):
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(AnalysisJob))
+            await db.commit()
+        await progress_callback(1, 1)
+        return _response(query_request)
+
+    monkeypatch.setattr(job_queue_module.agent_orchestration_service, "execute_query", execute_query)
+
+    async def scenario():
+        await _add_job("job", AnalysisJobStatus.QUEUED.value, 0)
+        await AnalysisJobQueue()._process("job")
+
+        assert await _job("job") is None
+        async with AsyncSessionLocal() as db:
+            assert (await db.execute(select(QueryHistory))).scalars().all() == []
+
+    run_in_db(scenario())
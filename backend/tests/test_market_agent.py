@@ -0,0 +1,67 @@
+from typing import List
+
+from phi.llm.base import LLM
+from phi.llm.message import Message
+
+from app.agents.market_agent import MarketDataAgent
+from app.core.config import settings
+from app.services.telemetry import telemetry
+
+
+class RecordingLLM(LLM):
+    """Stand-in LLM that records the messages of every run."""
+
+    model: str = "recording"
+    runs: List[List[str]] = []
+
+    def response(self, messages: List[Message]) -> str:
+        self.runs.append([str(message.content) for message in messages])
+        self.metrics = {"input_tokens": 10, "output_tokens": 5}
+        return f"answer {len(self.runs)}"
+
+
+class RecordingMarketAgent(MarketDataAgent):
+    def __init__(self):
+        super().__init__()
+        self.llms: List[RecordingLLM] = []
+
+    def _build_llm(self, model: str) -> LLM:
+        llm = RecordingLLM(runs=[])
+        self.llms.append(llm)
+        return llm
+
+
+def _run(agent, prompt):
+    return agent._run_prompt(prompt, "recording", telemetry.agent_call("market_agent", "AAPL"))
+
+
+def test_runs_do_not_replay_earlier_prompts():
+    agent = RecordingMarketAgent()
+
+    assert _run(agent, "first prompt about AAPL") == "answer 1"
+    assert _run(agent, "second prompt about MSFT") == "answer 2"
+
+    assert len(agent.llms) == 1  # The pooled assistant was reused
+    second_run = " ".join(agent.llms[0].runs[1])
+    assert "second prompt" in second_run
+    assert "first prompt" not in second_run and "answer 1" not in second_run
+
+
+def test_assistant_memory_is_cleared_after_each_run():
+    agent = RecordingMarketAgent()
+    for n in range(5):
+        _run(agent, f"prompt {n}")
+
+    with agent.pools.checkout("recording") as assistant:
+        assert assistant.memory.chat_history == []
+        assert assistant.memory.llm_messages == []
+        assert assistant.llm.metrics == {}
+
+
+def test_prompt_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_PROMPT_CHARS", 50)
+    agent = RecordingMarketAgent()
+
+    _run(agent, "x" * 500)
+
+    assert agent.llms[0].runs[0][-1] == "x" * 50
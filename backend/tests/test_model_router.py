@@ -0,0 +1,69 @@
+import pytest
+
+from app.core.config import settings
+from app.schemas.market import AnalysisDepth, QueryType
+from app.services.model_router import TIER_DEEP, TIER_FAST, LatencyWindow, ModelRouter
+
+
+@pytest.mark.parametrize("ticker_count, query_type, depth, tier", [
+    (1, QueryType.DECISION_SYNTHESIS, AnalysisDepth.QUICK, TIER_FAST),
+    (10, QueryType.MARKET_ANALYSIS, AnalysisDepth.DEEP, TIER_DEEP),
+    (2, QueryType.DECISION_SYNTHESIS, AnalysisDepth.STANDARD, TIER_DEEP),
+    (2, QueryType.RISK_ASSESSMENT, AnalysisDepth.STANDARD, TIER_DEEP),
+    (3, QueryType.DECISION_SYNTHESIS, AnalysisDepth.STANDARD, TIER_FAST),
+    (1, QueryType.MARKET_ANALYSIS, AnalysisDepth.STANDARD, TIER_FAST),
+])
+def test_choose_tier(monkeypatch, ticker_count, query_type, depth, tier):
+    monkeypatch.setattr(settings, "MODEL_DEEP_MAX_TICKERS", 2)
+    assert ModelRouter().choose_tier(ticker_count, query_type, depth) == tier
+
+
+def test_select_model_follows_the_requested_tier():
+    router = ModelRouter()
+
+    assert router.select_model() == settings.GEMINI_FAST_MODEL
+    with router.use_tier(TIER_DEEP):
+        assert router.select_model() == settings.GEMINI_DEEP_MODEL
+    assert router.select_model() == settings.GEMINI_FAST_MODEL
+
+
+def test_deep_tier_downgrades_while_p95_breaches_the_slo(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_LATENCY_MIN_SAMPLES", 5)
+    monkeypatch.setattr(settings, "MODEL_DEEP_SLO_P95_SECONDS", 2.0)
+    router = ModelRouter()
+
+    with router.use_tier(TIER_DEEP):
+        for _ in range(4):
+            router.record(settings.GEMINI_DEEP_MODEL, 5.0)
+        # Too few samples to trust the p95 yet
+        assert router.select_model() == settings.GEMINI_DEEP_MODEL
+
+        router.record(settings.GEMINI_DEEP_MODEL, 5.0)
+        assert router.deep_tier_breached()
+        assert router.select_model() == settings.GEMINI_FAST_MODEL
+        assert router.reusable_models() == [settings.GEMINI_FAST_MODEL, settings.GEMINI_DEEP_MODEL]
+
+
+def test_slow_fast_model_does_not_affect_the_deep_tier(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_LATENCY_MIN_SAMPLES", 1)
+    router = ModelRouter()
+
+    router.record(settings.GEMINI_FAST_MODEL, 60.0)
+    assert not router.deep_tier_breached()
+
+
+def test_reusable_models_exclude_the_fast_model_for_deep_calls():
+    router = ModelRouter()
+
+    assert router.reusable_models() == [settings.GEMINI_FAST_MODEL, settings.GEMINI_DEEP_MODEL]
+    with router.use_tier(TIER_DEEP):
+        assert router.reusable_models() == [settings.GEMINI_DEEP_MODEL]
+
+
+def test_latency_window_p95():
+    window = LatencyWindow(window_seconds=60.0)
+    assert window.snapshot() == (0, 0.0)
+
+    for seconds in range(1, 21):
+        window.record(float(seconds))
+    assert window.snapshot() == (20, 20.0)
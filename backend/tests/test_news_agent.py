@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.agents.news_agent import NewsAndSentimentAgent, TickerSentimentState
+from app.core.config import settings
+
+
+def _article(n, title=None):
+    return {
+        "title": title or f"Headline number {n} about unrelated topic {n * 7919}",
+        "description": f"Description {n}",
+        "url": f"https://example.com/{n}",
+        "source": "Wire",
+        "published_at": datetime.now(timezone.utc).isoformat()
+    }
+
+
+def _agent(score=0.8, delay=0.05):
+    agent = NewsAndSentimentAgent()
+    prompts = []
+
+    async def complete(prompt, model, call):
+        prompts.append(prompt)
+        await asyncio.sleep(delay)
+        numbered = sum(1 for line in prompt.splitlines() if line[:1].isdigit() and ". [" in line)
+        scores = "\n".join(f"SCORE {n}: {score}" for n in range(1, numbered + 1))
+        return f"Demand looks strong. Confidence: 0.8\n{scores}"
+
+    agent._complete = complete
+    return agent, prompts
+
+
+def test_concurrent_requests_send_new_articles_once():
+    agent, prompts = _agent()
+    articles = [_article(1), _article(2)]
+
+    async def scenario():
+        return await asyncio.gather(*(agent.analyze_news_sentiment("AAPL", articles=articles) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert len(prompts) == 1
+    assert [result["sentiment"] for result in results] == ["bullish"] * 3
+    assert [result["new_article_count"] for result in results] == [2, 0, 0]
+
+
+def test_only_unseen_articles_are_sent_and_the_summary_is_scoped():
+    agent, prompts = _agent(delay=0)
+
+    async def scenario():
+        await agent.analyze_news_sentiment("AAPL", articles=[_article(1), _article(2)])
+        return await agent.analyze_news_sentiment("AAPL", articles=[_article(1), _article(2), _article(3)])
+
+    result = asyncio.run(scenario())
+
+    assert len(prompts) == 2
+    assert "Headline number 3" in prompts[1]
+    assert "Headline number 1" not in prompts[1]
+    assert "Sentiment from 2 earlier articles: bullish" in prompts[1]
+    assert result["article_count"] == 3
+    assert result["new_article_count"] == 1
+    assert result["summary"].startswith("Overall sentiment across 3 recent articles: bullish")
+    assert "Analysis of the 1 newest" in result["summary"]
+
+
+def test_no_new_articles_serves_state_without_llm():
+    agent, prompts = _agent(delay=0)
+    articles = [_article(1)]
+
+    async def scenario():
+        await agent.analyze_news_sentiment("AAPL", articles=articles)
+        return await agent.analyze_news_sentiment("AAPL", articles=articles)
+
+    result = asyncio.run(scenario())
+
+    assert len(prompts) == 1
+    assert result["new_article_count"] == 0
+    assert result["summary"].startswith("Demand looks strong")
+
+
+def test_failed_llm_call_lets_the_next_request_retry():
+    agent, prompts = _agent(delay=0)
+    calls = []
+    complete = agent._complete
+
+    async def flaky(prompt, model, call):
+        calls.append(prompt)
+        if len(calls) == 1:
+            raise TimeoutError()
+        return await complete(prompt, model, call)
+
+    agent._complete = flaky
+    articles = [_article(1)]
+
+    async def scenario():
+        first = await agent.analyze_news_sentiment("AAPL", articles=articles)
+        second = await agent.analyze_news_sentiment("AAPL", articles=articles)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first["degraded"] is True
+    assert second["new_article_count"] == 1
+    assert len(calls) == 2
+
+
+def test_state_is_bounded_to_recent_tickers(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_SENTIMENT_MAX_TICKERS", 2)
+    agent, _ = _agent(delay=0)
+
+    async def scenario():
+        for ticker in ("AAPL", "MSFT", "AAPL", "NVDA"):
+            await agent.analyze_news_sentiment(ticker, articles=[_article(1)])
+
+    asyncio.run(scenario())
+    assert list(agent._sentiment_state) == ["AAPL", "NVDA"]
+
+
+def test_state_keeps_only_the_newest_articles_in_the_window():
+    now = datetime.now(timezone.utc)
+    state = TickerSentimentState()
+    for hours in (1, 2, 3, 200):
+        article = _article(hours)
+        article["published_at"] = (now - timedelta(hours=hours)).isoformat()
+        state.add(article, 0.5)
+
+    state.prune(now - timedelta(days=7))
+    assert len(state.articles) == 3
+
+    state.trim(2)
+    assert sorted(published for _, published in state.articles.values()) == [
+        now - timedelta(hours=2), now - timedelta(hours=1)
+    ]
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.news_cache import NewsQuota, NewsResponseCache, normalize_query
+
+KEY = ("everything", "aapl", "7d")
+
+
+@pytest.fixture(autouse=True)
+def cache_settings(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_API_DAILY_QUOTA", 100)
+    monkeypatch.setattr(settings, "NEWS_API_QUOTA_RESERVE", 0)
+    monkeypatch.setattr(settings, "NEWS_CACHE_TTL_SECONDS", 300.0)
+    monkeypatch.setattr(settings, "NEWS_CACHE_STALE_SECONDS", 3600.0)
+    monkeypatch.setattr(settings, "NEWS_CACHE_MAX_STALE_SECONDS", 86400.0)
+
+
+class Upstream:
+    def __init__(self, fail=False, delay=0.0):
+        self.calls = []
+        self.fail = fail
+        self.delay = delay
+
+    async def __call__(self, page_size):
+        self.calls.append(page_size)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return None
+        return [{"title": f"call {len(self.calls)} article {i}"} for i in range(page_size)]
+
+
+def _age(cache, seconds):
+    cache._entries[KEY].fetched_at -= seconds
+
+
+@pytest.mark.parametrize("query, normalized", [
+    ("MSFT  aapl", "aapl msft"),
+    ("aapl AAPL", "aapl"),
+    ("AAPL OR MSFT", "aapl OR msft"),
+    ("MSFT OR AAPL", "msft OR aapl"),
+    ('"Apple Inc" earnings', '"apple inc" earnings'),
+    ("apple -pie", "apple -pie"),
+])
+def test_normalize_query(query, normalized):
+    assert normalize_query(query) == normalized
+
+
+def test_fresh_entry_is_served_and_answers_smaller_pages():
+    cache = NewsResponseCache(NewsQuota())
+    upstream = Upstream()
+
+    async def scenario():
+        await cache.get(KEY, 20, upstream)
+        return await cache.get(KEY, 5, upstream)
+
+    articles = asyncio.run(scenario())
+
+    assert upstream.calls == [20]
+    assert len(articles) == 5
+    assert cache.stats()["fresh_hits"] == 1
+
+
+def test_larger_page_is_fetched_again():
+    cache = NewsResponseCache(NewsQuota())
+    upstream = Upstream()
+
+    async def scenario():
+        await cache.get(KEY, 5, upstream)
+        await cache.get(KEY, 20, upstream)
+
+    asyncio.run(scenario())
+    assert upstream.calls == [5, 20]
+
+
+def test_concurrent_misses_share_one_request():
+    cache = NewsResponseCache(NewsQuota())
+    upstream = Upstream(delay=0.02)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get(KEY, 10, upstream) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert upstream.calls == [10]
+    assert all(result == results[0] for result in results)
+    assert cache.quota.stats()["used"] == 1
+
+
+def test_stale_entry_is_served_while_refreshing():
+    cache = NewsResponseCache(NewsQuota())
+    upstream = Upstream()
+
+    async def scenario():
+        await cache.get(KEY, 10, upstream)
+        _age(cache, 600)
+        stale = await cache.get(KEY, 10, upstream)
+        await asyncio.gather(*cache._refreshes)
+        fresh = await cache.get(KEY, 10, upstream)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+
+    assert stale[0]["title"] == "call 1 article 0"
+    assert fresh[0]["title"] == "call 2 article 0"
+    assert upstream.calls == [10, 10]
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_expired_entry_is_served_when_the_quota_is_spent(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_API_DAILY_QUOTA", 1)
+    cache = NewsResponseCache(NewsQuota())
+    upstream = Upstream()
+
+    async def scenario():
+        await cache.get(KEY, 10, upstream)
+        _age(cache, 7200)
+        return await cache.get(KEY, 10, upstream)
+
+    articles = asyncio.run(scenario())
+
+    assert upstream.calls == [10]
+    assert articles[0]["title"] == "call 1 article 0"
+    assert cache.stats()["quota_rejections"] == 1
+    assert cache.stats()["stale_fallbacks"] == 1
+
+
+def test_failed_fetch_without_a_cached_entry_returns_nothing():
+    cache = NewsResponseCache(NewsQuota())
+    assert asyncio.run(cache.get(KEY, 10, Upstream(fail=True))) == []
+
+
+def test_background_refresh_keeps_the_quota_reserve(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_API_DAILY_QUOTA", 3)
+    monkeypatch.setattr(settings, "NEWS_API_QUOTA_RESERVE", 2)
+    cache = NewsResponseCache(NewsQuota())
+    upstream = Upstream()
+
+    async def scenario():
+        await cache.get(KEY, 10, upstream)
+        _age(cache, 600)
+        await cache.get(KEY, 10, upstream)
+        await asyncio.gather(*cache._refreshes)
+
+    asyncio.run(scenario())
+    assert upstream.calls == [10]
+    assert cache.quota.remaining() == 2
+
+
+def test_rate_limit_exhausts_the_quota(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_API_RATE_LIMIT_BACKOFF_SECONDS", 60)
+    quota = NewsQuota()
+    assert quota.try_acquire()
+
+    quota.mark_exhausted()
+
+    assert quota.remaining() == 0
+    assert not quota.try_acquire()
+    assert 0 < quota.stats()["resets_in_seconds"] <= 60
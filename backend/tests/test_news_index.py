@@ -0,0 +1,163 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.services.news_index import NewsIndex, match_expression, url_hash
+
+
+def _published(days_ago=0):
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat()
+
+
+def _article(slug, title, description="", days_ago=0, tickers=()):
+    return {
+        "url": f"https://example.com/{slug}",
+        "title": title,
+        "description": description,
+        "source": {"name": "Example"},
+        "publishedAt": _published(days_ago),
+        "tickers": list(tickers)
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    news_index = NewsIndex(str(tmp_path / "news_index.db"))
+    yield news_index
+    news_index.close()
+
+
+@pytest.mark.parametrize("query, expression", [
+    ("Stock market", '"stock" AND "market"'),
+    ('AAPL OR "Apple Inc"', '"aapl" OR "apple inc"'),
+    ("AT&T earnings", '"at t" AND "earnings"'),
+    ("apple -pie", '"apple" NOT "pie"'),
+    ("apple AND NOT pie", '"apple" NOT "pie"'),
+    ("tesla (musk OR elon)", '"tesla" AND ( "musk" OR "elon" )'),
+    ('title:x "NEAR(a b)"', '"title x" AND "near a b"'),
+    ("NOT apple", None),
+    ("apple OR", None),
+    ("(apple", None),
+    ("&&", None),
+])
+def test_match_expression(query, expression):
+    assert match_expression(query) == expression
+
+
+def test_url_hash_ignores_scheme_case_and_trailing_slash():
+    assert url_hash("https://Example.com/a/") == url_hash("http://example.com/a#top")
+    assert url_hash("https://example.com/a") != url_hash("https://example.com/b")
+
+
+def test_search_ranks_title_matches_first(index):
+    async def scenario():
+        await index.ingest([
+            _article("body", "Markets rally", description="Tesla shares climb"),
+            _article("title", "Tesla shares climb")
+        ])
+        return await index.search("tesla")
+
+    results = asyncio.run(scenario())
+    assert [article["url"] for article in results] == ["https://example.com/title", "https://example.com/body"]
+
+
+def test_boolean_queries_match_either_term(index):
+    async def scenario():
+        await index.ingest([
+            _article("apple", "Apple Inc beats estimates"),
+            _article("msft", "MSFT cloud growth"),
+            _article("other", "Oil prices fall")
+        ])
+        return (
+            await index.search('MSFT OR "Apple Inc"'),
+            await index.count('MSFT OR "Apple Inc"'),
+            await index.search("Apple -estimates")
+        )
+
+    either, count, excluded = asyncio.run(scenario())
+
+    assert {article["url"].rsplit("/", 1)[1] for article in either} == {"apple", "msft"}
+    assert count == 2
+    assert excluded == []
+
+
+def test_search_window_and_paging(index):
+    async def scenario():
+        await index.ingest([_article(f"a{i}", f"Tesla update {i}", days_ago=i) for i in range(5)])
+        recent = await index.search("tesla", since=datetime.utcnow() - timedelta(days=2, hours=12))
+        first = await index.search("tesla", limit=2)
+        second = await index.search("tesla", limit=2, offset=2)
+        return recent, first, second
+
+    recent, first, second = asyncio.run(scenario())
+
+    assert len(recent) == 3
+    assert len(first) == len(second) == 2
+    assert not {article["url"] for article in first} & {article["url"] for article in second}
+
+
+def test_articles_are_stored_once_and_tagged(index):
+    async def scenario():
+        first = await index.ingest([_article("a", "Apple news", tickers=["aapl"])])
+        again = await index.ingest([
+            _article("a", "Apple news", tickers=["MSFT"]),
+            _article("b", "Microsoft news", tickers=["MSFT"])
+        ], refreshed_tickers=["msft"])
+        return first, again, await index.ticker_articles("MSFT")
+
+    first, again, (articles, refreshed_at) = asyncio.run(scenario())
+
+    assert (first, again) == (1, 1)
+    assert len(articles) == 2
+    assert refreshed_at is not None
+    assert index.stats() == {"enabled": True, "articles": 2, "stored": 2}
+
+
+def test_old_articles_are_pruned_when_opened(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_INDEX_RETENTION_DAYS", 30)
+    path = str(tmp_path / "news_index.db")
+    index = NewsIndex(path)
+
+    async def ingest():
+        await index.ingest([
+            _article("old", "Tesla recall", days_ago=45, tickers=["TSLA"]),
+            _article("new", "Tesla delivery", days_ago=1, tickers=["TSLA"])
+        ])
+
+    asyncio.run(ingest())
+    index.close()
+    # Nothing was old enough to drop when it was first opened
+    assert index.stats()["articles"] == 2
+
+    reopened = NewsIndex(path)
+    results, _ = asyncio.run(reopened.ticker_articles("TSLA"))
+    reopened.close()
+
+    assert [article["url"] for article in results] == ["https://example.com/new"]
+    assert reopened.stats()["articles"] == 1
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM article_tickers").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'recall'").fetchone()[0] == 0
+
+
+def test_ingest_prunes_once_per_interval(index, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_INDEX_RETENTION_DAYS", 30)
+    monkeypatch.setattr(settings, "NEWS_INDEX_PRUNE_INTERVAL_HOURS", 0)
+
+    async def scenario():
+        await index.ingest([_article("new", "Fresh news")])
+        await index.ingest([_article("old", "Old news", days_ago=60)])
+        return await index.search("news")
+
+    results = asyncio.run(scenario())
+
+    assert [article["url"] for article in results] == ["https://example.com/new"]
+    assert index.stats()["articles"] == 1
+
+
+def test_stats_do_not_open_the_index(index):
+    assert index.stats() == {"enabled": True, "articles": None, "stored": 0}
+    assert index._conn is None
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import news_ingestion as ingestion_module
+from app.services.news_ingestion import NewsIngestionWorker
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Stub NewsAPI fetches, watched tickers and index tagging; returns the recorded calls."""
+    calls = {"fetches": [], "refreshed": []}
+    remaining = {"quota": 1000}
+    headlines = {
+        "AAPL": {"title": "Apple unveiled a new phone", "url": "https://example.com/apple"},
+        "MSFT": {"title": "Oil prices fall", "url": "https://example.com/oil"}
+    }
+
+    async def most_watched_tickers(limit):
+        return ["MSFT", "AAPL"][:limit]
+
+    async def get_market_news(category, max_articles, refresh):
+        calls["fetches"].append(("headlines", category))
+        remaining["quota"] -= 1
+        return [{"title": "Markets open higher", "url": "https://example.com/markets"}]
+
+    async def get_stock_news(query, days_back, max_articles, refresh, sort_by):
+        ticker = "AAPL" if "AAPL" in query else "MSFT"
+        calls["fetches"].append(("tickers", ticker))
+        remaining["quota"] -= 1
+        return [headlines[ticker]]
+
+    async def retag(articles, refreshed_tickers=()):
+        calls["refreshed"] += list(refreshed_tickers)
+
+    monkeypatch.setattr(settings, "NEWS_INGEST_CATEGORIES", ["business"])
+    monkeypatch.setattr(settings, "NEWS_BATCH_MAX_TICKERS", 1)
+    monkeypatch.setattr(settings, "NEWS_API_QUOTA_RESERVE", 0)
+    monkeypatch.setattr(ingestion_module.insight_store, "most_watched_tickers", most_watched_tickers)
+    monkeypatch.setattr(ingestion_module.news_service, "get_market_news", get_market_news)
+    monkeypatch.setattr(ingestion_module.news_service, "get_stock_news", get_stock_news)
+    monkeypatch.setattr(ingestion_module.news_service.quota, "remaining", lambda: remaining["quota"])
+    monkeypatch.setattr(ingestion_module.news_index, "retag", retag)
+    return calls
+
+
+def test_cycle_budget_spreads_the_quota_share(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_API_DAILY_QUOTA", 1000)
+    monkeypatch.setattr(settings, "NEWS_INGEST_QUOTA_SHARE", 0.5)
+    monkeypatch.setattr(settings, "NEWS_INGEST_INTERVAL_MINUTES", 60)
+    assert NewsIngestionWorker().cycle_budget() == 20
+
+
+def test_cycles_continue_where_the_last_one_stopped(upstream, monkeypatch):
+    worker = NewsIngestionWorker()
+    monkeypatch.setattr(worker, "cycle_budget", lambda: 2)
+
+    async def scenario():
+        return await worker.run_once(), await worker.run_once()
+
+    first, second = asyncio.run(scenario())
+
+    assert upstream["fetches"] == [
+        ("headlines", "business"), ("tickers", "AAPL"),
+        ("tickers", "MSFT"), ("headlines", "business")
+    ]
+    assert first["requests"] == second["requests"] == 2
+    assert worker.stats()["cycles"] == 2
+
+
+def test_only_tickers_the_results_mention_are_refreshed(upstream, monkeypatch):
+    worker = NewsIngestionWorker()
+    monkeypatch.setattr(worker, "cycle_budget", lambda: 3)
+
+    asyncio.run(worker.run_once())
+
+    assert upstream["refreshed"] == ["AAPL"]
+
+
+def test_cycle_ends_at_the_quota_reserve(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_API_QUOTA_RESERVE", 999)
+    worker = NewsIngestionWorker()
+    monkeypatch.setattr(worker, "cycle_budget", lambda: 3)
+
+    stats = asyncio.run(worker.run_once())
+
+    assert stats["requests"] == 1
+    assert upstream["fetches"] == [("headlines", "business")]
@@ -0,0 +1,68 @@
+import pytest
+
+from app.services.news_pagination import (
+    InvalidCursorError, decode_cursor, encode_cursor, page_from_window, paginate, query_fingerprint, source_window
+)
+
+
+def _articles(*names):
+    return [{"title": name, "url": f"https://example.com/{name}"} for name in names]
+
+
+def test_cursor_round_trip():
+    fingerprint = query_fingerprint("search", "tesla", 7)
+    cursor = encode_cursor(fingerprint, 20, "abc123")
+    assert decode_cursor(cursor, fingerprint) == (20, "abc123")
+
+
+def test_cursor_from_another_query_is_rejected():
+    cursor = encode_cursor(query_fingerprint("search", "tesla", 7), 20, None)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, query_fingerprint("search", "ford", 7))
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "e30"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "fingerprint")
+
+
+def test_pages_cover_results_once():
+    articles = _articles(*"abcdefg")
+    fingerprint = query_fingerprint("topics")
+    seen, cursor = [], None
+    while True:
+        page, cursor = paginate(articles, fingerprint, cursor, 3)
+        seen += page
+        if cursor is None:
+            break
+    assert seen == articles
+
+
+def test_next_page_resumes_after_anchor_when_results_shift():
+    fingerprint = query_fingerprint("topics")
+    first, cursor = paginate(_articles(*"abcdef"), fingerprint, None, 3)
+
+    # Two newer articles arrive before the next request
+    second, _ = paginate(_articles("y", "z", *"abcdef"), fingerprint, cursor, 3)
+
+    assert [a["title"] for a in first] == ["a", "b", "c"]
+    assert [a["title"] for a in second] == ["d", "e", "f"]
+
+
+def test_window_page_matches_full_paging():
+    articles = _articles(*"abcdefg")
+    fingerprint = query_fingerprint("search")
+    _, cursor = paginate(articles, fingerprint, None, 3)
+
+    start, count = source_window(cursor, fingerprint, 3)
+    assert page_from_window(articles[start:start + count], fingerprint, cursor, 3) == paginate(articles, fingerprint, cursor, 3)
+
+
+def test_window_without_anchor_is_refused():
+    fingerprint = query_fingerprint("search")
+    _, cursor = paginate(_articles(*"abcdef"), fingerprint, None, 3)
+
+    shifted = _articles("z", *"abcdef")
+    start, count = source_window(cursor, fingerprint, 3)
+    assert page_from_window(shifted[start:start + count], fingerprint, cursor, 3) is None
@@ -0,0 +1,114 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.news_planner import NewsFetchPlanner, batch_query, plan_queries, split_by_ticker
+
+ARTICLES = {
+    "apple": {"title": "Apple unveiled a new phone", "url": "https://example.com/apple"},
+    "microsoft": {"title": "Microsoft cloud revenue grows", "url": "https://example.com/msft"},
+    "both": {"title": "Microsoft and Nvidia rally", "url": "https://example.com/both"}
+}
+
+
+class Upstream:
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    async def __call__(self, query, days_back, page_size, sort_by):
+        self.queries.append((query, page_size, sort_by))
+        for marker, articles in self.results.items():
+            if query.startswith(marker):
+                return [dict(article) for article in articles]
+        return []
+
+
+def test_plan_queries_packs_known_tickers(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_BATCH_MAX_TICKERS", 2)
+    monkeypatch.setattr(settings, "NEWS_API_MAX_QUERY_LENGTH", 500)
+    assert plan_queries(["NVDA", "MSFT", "AAPL", "ZZZZQ", "AAPL"]) == [["AAPL", "MSFT"], ["ZZZZQ"], ["NVDA"]]
+
+
+def test_plan_queries_respects_the_query_length(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_BATCH_MAX_TICKERS", 10)
+    monkeypatch.setattr(settings, "NEWS_API_MAX_QUERY_LENGTH", len(batch_query(["AAPL", "MSFT"])))
+    groups = plan_queries(["AAPL", "MSFT", "NVDA"])
+    assert groups == [["AAPL", "MSFT"], ["NVDA"]]
+    assert all(len(batch_query(group)) <= settings.NEWS_API_MAX_QUERY_LENGTH for group in groups)
+
+
+def test_batch_query_ors_each_tickers_query():
+    assert batch_query(["AAPL", "MSFT"]) == 'AAPL OR "Apple" OR MSFT OR "Microsoft"'
+
+
+def test_split_by_ticker_uses_entity_matches():
+    split = split_by_ticker(list(ARTICLES.values()), ["AAPL", "MSFT", "NVDA", "ZZZZQ"])
+
+    assert [article["url"] for article in split["AAPL"]] == ["https://example.com/apple"]
+    assert len(split["MSFT"]) == 2
+    assert [article["url"] for article in split["NVDA"]] == ["https://example.com/both"]
+    # Unknown tickers cannot be matched, so they keep every article
+    assert len(split["ZZZZQ"]) == 3
+    assert all("ZZZZQ" in article["tickers"] for article in split["ZZZZQ"])
+
+
+def test_concurrent_requests_share_one_query():
+    upstream = Upstream({"AAPL OR": [ARTICLES["apple"], ARTICLES["microsoft"], ARTICLES["both"]]})
+    planner = NewsFetchPlanner(upstream)
+
+    async def scenario():
+        return await asyncio.gather(
+            planner.fetch("AAPL", 7, 5),
+            planner.fetch("msft", 7, 1),
+            planner.fetch("MSFT", 7, 5)
+        )
+
+    aapl, msft_first, msft = asyncio.run(scenario())
+
+    assert upstream.queries == [(batch_query(["AAPL", "MSFT"]), 10, "publishedAt")]
+    assert [article["url"] for article in aapl] == ["https://example.com/apple"]
+    assert len(msft_first) == 1
+    assert len(msft) == 2
+    assert planner.stats()["requests_per_query"] == 3.0
+
+
+def test_starved_ticker_is_fetched_on_its_own():
+    upstream = Upstream({
+        "AAPL OR": [ARTICLES["apple"]],
+        "MSFT OR": [ARTICLES["microsoft"]]
+    })
+    planner = NewsFetchPlanner(upstream)
+
+    async def scenario():
+        return await asyncio.gather(planner.fetch("AAPL", 7, 5), planner.fetch("MSFT", 7, 5))
+
+    aapl, msft = asyncio.run(scenario())
+
+    assert [query for query, _, _ in upstream.queries] == [batch_query(["AAPL", "MSFT"]), 'MSFT OR "Microsoft"']
+    assert upstream.queries[1][2] == "relevancy"
+    assert len(aapl) == len(msft) == 1
+    assert planner.stats()["followups"] == 1
+
+
+def test_different_windows_are_not_batched():
+    upstream = Upstream({})
+    planner = NewsFetchPlanner(upstream)
+
+    async def scenario():
+        await asyncio.gather(planner.fetch("AAPL", 7, 5), planner.fetch("MSFT", 1, 5))
+
+    asyncio.run(scenario())
+    assert sorted(query for query, _, _ in upstream.queries) == ['AAPL OR "Apple"', 'MSFT OR "Microsoft"']
+
+
+def test_fetch_errors_reach_every_waiter():
+    async def failing(query, days_back, page_size, sort_by):
+        raise RuntimeError("NewsAPI down")
+
+    planner = NewsFetchPlanner(failing)
+
+    async def scenario():
+        return await asyncio.gather(planner.fetch("AAPL", 7, 5), planner.fetch("MSFT", 7, 5), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
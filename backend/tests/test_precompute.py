@@ -0,0 +1,111 @@
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import Watchlist
+from app.schemas.market import AgentInsight
+from app.services import precompute as precompute_module
+from app.services.insight_store import insight_store, ANALYSIS_MARKET, ANALYSIS_NEWS
+from app.services.precompute import InsightPrecomputeScheduler
+
+
+def _insight(**details):
+    return AgentInsight(agent_name="Agent", confidence=0.8, summary="ok", details=details, reasoning="r")
+
+
+def _stub_analyses(monkeypatch, market=None, news=None):
+    calls = []
+
+    def analysis(analysis_type, make):
+        async def analyze(ticker, use_cache=True):
+            calls.append((ticker, analysis_type))
+            return make(ticker) if make else _insight(ticker=ticker, article_count=3)
+        return analyze
+
+    service = precompute_module.agent_orchestration_service
+    monkeypatch.setattr(service, "analyze_market_ticker", analysis(ANALYSIS_MARKET, market))
+    monkeypatch.setattr(service, "analyze_news_ticker", analysis(ANALYSIS_NEWS, news))
+    return calls
+
+
+def _watched(monkeypatch, *tickers):
+    async def most_watched_tickers(limit):
+        return list(tickers)[:limit]
+
+    monkeypatch.setattr(insight_store, "most_watched_tickers", most_watched_tickers)
+    return InsightPrecomputeScheduler()
+
+
+def test_offpeak_slot(monkeypatch):
+    monkeypatch.setattr(settings, "PRECOMPUTE_OFFPEAK_HOURS_UTC", [1, 2])
+    scheduler = InsightPrecomputeScheduler()
+    assert scheduler.in_offpeak_slot(datetime(2024, 1, 1, 2, 30))
+    assert not scheduler.in_offpeak_slot(datetime(2024, 1, 1, 14, 0))
+
+
+def test_most_watched_tickers(run_in_db):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            for user_id, ticker in [(1, "AAPL"), (2, "AAPL"), (3, "AAPL"), (1, "MSFT"), (2, "MSFT"), (1, "NVDA")]:
+                db.add(Watchlist(user_id=user_id, ticker=ticker))
+            await db.commit()
+        return await insight_store.most_watched_tickers(2)
+
+    assert run_in_db(scenario()) == ["AAPL", "MSFT"]
+
+
+def test_run_stores_insights_and_skips_fresh_ones(run_in_db, monkeypatch):
+    calls = _stub_analyses(monkeypatch)
+    scheduler = _watched(monkeypatch, "AAPL", "MSFT")
+
+    async def scenario():
+        await insight_store.save("MSFT", ANALYSIS_MARKET, _insight(ticker="MSFT"))
+        stats = await scheduler.run_once()
+        stored = await insight_store.get_fresh("AAPL", ANALYSIS_NEWS)
+        return stats, stored
+
+    stats, stored = run_in_db(scenario())
+
+    assert stats == {"computed": 3, "skipped": 1, "degraded": 0}
+    assert ("MSFT", ANALYSIS_MARKET) not in calls
+    assert stored.details["precomputed"] is True
+
+
+def test_run_stops_at_the_llm_budget(run_in_db, monkeypatch):
+    monkeypatch.setattr(settings, "PRECOMPUTE_LLM_BUDGET", 3)
+    calls = _stub_analyses(monkeypatch)
+    scheduler = _watched(monkeypatch, "AAPL", "MSFT", "NVDA")
+
+    stats = run_in_db(scheduler.run_once())
+
+    assert len(calls) == 3
+    assert stats["computed"] == 3
+
+
+def test_run_stops_when_agents_degrade(run_in_db, monkeypatch):
+    calls = _stub_analyses(monkeypatch, market=lambda ticker: _insight(ticker=ticker, degraded=True))
+    scheduler = _watched(monkeypatch, "AAPL", "MSFT")
+
+    async def scenario():
+        stats = await scheduler.run_once()
+        return stats, await insight_store.get("AAPL", ANALYSIS_MARKET)
+
+    stats, stored = run_in_db(scenario())
+
+    assert calls == [("AAPL", ANALYSIS_MARKET)]
+    assert stats == {"computed": 0, "skipped": 0, "degraded": 1}
+    assert stored is None
+
+
+def test_news_without_articles_is_not_stored(run_in_db, monkeypatch):
+    _stub_analyses(monkeypatch, news=lambda ticker: _insight(ticker=ticker, article_count=0))
+    scheduler = _watched(monkeypatch, "AAPL")
+
+    async def scenario():
+        stats = await scheduler.run_once()
+        return stats, await insight_store.get("AAPL", ANALYSIS_NEWS)
+
+    stats, stored = run_in_db(scenario())
+
+    assert stats["computed"] == 1
+    assert stored is None
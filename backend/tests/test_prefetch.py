@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime
+
+from app.core.config import settings
+from app.schemas.market import StockPrice
+from app.services import prefetch as prefetch_module
+from app.services.prefetch import WatchlistPrefetcher
+from app.services.stock_stream import StockStreamManager
+
+
+class FakeProvider:
+    def __init__(self):
+        self.fetches = []
+
+    async def get_latest_quote(self, ticker):
+        self.fetches.append(ticker)
+        return StockPrice(
+            ticker=ticker, price=100.0, volume=1000, timestamp=datetime.utcnow(),
+            change=0.0, change_percent=0.0, open=100.0, high=100.0, low=100.0
+        )
+
+
+def _manager():
+    manager = StockStreamManager()
+    manager.provider = FakeProvider()
+    return manager
+
+
+def test_quote_is_cached_for_the_default_ttl(monkeypatch):
+    monkeypatch.setattr(settings, "QUOTE_CACHE_TTL_SECONDS", 60.0)
+    manager = _manager()
+
+    async def scenario():
+        await manager.get_quote("AAPL")
+        await manager.get_quote("AAPL")
+
+    asyncio.run(scenario())
+    assert manager.provider.fetches == ["AAPL"]
+
+
+def test_prefetched_quote_outlives_the_default_ttl(monkeypatch):
+    monkeypatch.setattr(settings, "QUOTE_CACHE_TTL_SECONDS", 0.0)
+    manager = _manager()
+
+    async def scenario():
+        await manager.get_quote("AAPL", ttl=60.0)
+        await manager.get_quote("AAPL")
+        await manager.get_quote("MSFT")
+        await manager.get_quote("MSFT")
+
+    asyncio.run(scenario())
+    assert manager.provider.fetches == ["AAPL", "MSFT", "MSFT"]
+
+
+def _prefetcher(monkeypatch, release=None):
+    manager = _manager()
+    analyzed = []
+
+    async def get_ticker_news(ticker, days_back, max_articles):
+        if release:
+            await release.wait()
+        return []
+
+    async def analyze_market_ticker(ticker):
+        analyzed.append(ticker)
+
+    monkeypatch.setattr(settings, "QUOTE_CACHE_TTL_SECONDS", 0.0)
+    monkeypatch.setattr(prefetch_module, "stock_stream_manager", manager)
+    monkeypatch.setattr(prefetch_module.news_service, "get_ticker_news", get_ticker_news)
+    monkeypatch.setattr(prefetch_module.agent_orchestration_service, "analyze_market_ticker", analyze_market_ticker)
+    return WatchlistPrefetcher(), manager, analyzed
+
+
+def test_prefetch_warms_the_quote_for_the_dashboard(monkeypatch):
+    prefetcher, manager, analyzed = _prefetcher(monkeypatch)
+
+    async def scenario():
+        assert prefetcher.schedule("aapl")
+        await asyncio.gather(*prefetcher._tasks.values())
+        return await manager.get_quote("AAPL")
+
+    quote = asyncio.run(scenario())
+
+    assert quote.ticker == "AAPL"
+    assert manager.provider.fetches == ["AAPL"]
+    assert analyzed == ["AAPL"]
+    assert prefetcher.stats()["completed"] == 1
+
+
+def test_duplicate_and_excess_prefetches_are_dropped(monkeypatch):
+    monkeypatch.setattr(settings, "PREFETCH_MAX_PENDING", 2)
+
+    async def scenario():
+        release = asyncio.Event()
+        prefetcher, _, _ = _prefetcher(monkeypatch, release)
+        scheduled = [prefetcher.schedule(ticker) for ticker in ("AAPL", "AAPL", "MSFT", "NVDA")]
+        stats = prefetcher.stats()
+        release.set()
+        await prefetcher.stop()
+        return scheduled, stats
+
+    scheduled, stats = asyncio.run(scenario())
+
+    assert scheduled == [True, False, True, False]
+    assert stats["in_flight"] == 2
+    assert stats["dropped"] == 1
@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+
+import pytest
+
+from app.services import resilience
+from app.services.resilience import CircuitBreaker, CircuitOpenError, call_with_deadline
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def _breaker(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock.monotonic)
+    return CircuitBreaker(name="test", failure_threshold=2, reset_timeout=30.0), clock
+
+
+def test_opens_after_consecutive_failures(monkeypatch):
+    breaker, _ = _breaker(monkeypatch)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_the_failure_count(monkeypatch):
+    breaker, _ = _breaker(monkeypatch)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_trial_that_closes_on_success(monkeypatch):
+    breaker, clock = _breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now += 30.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_trial_reopens(monkeypatch):
+    breaker, clock = _breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now += 30.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 29.0
+    assert not breaker.allow_request()
+    clock.now += 1.0
+    assert breaker.allow_request()
+
+
+def test_released_trial_can_be_retried(monkeypatch):
+    breaker, clock = _breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now += 30.0
+    assert breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.allow_request()
+
+
+def test_missed_deadline_holds_the_call_until_its_thread_returns():
+    unblock = threading.Event()
+    finished = []
+
+    async def scenario():
+        breaker = CircuitBreaker(name="test", failure_threshold=1, reset_timeout=30.0)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(asyncio.TimeoutError):
+                await call_with_deadline(
+                    breaker, unblock.wait, timeout=0.05, executor=executor, on_finished=lambda: finished.append("stalled")
+                )
+            assert breaker.state == CircuitBreaker.OPEN
+            assert finished == []
+
+            unblock.set()
+            for _ in range(100):
+                if finished:
+                    break
+                await asyncio.sleep(0.01)
+        assert finished == ["stalled"]
+
+    asyncio.run(scenario())
+
+
+def test_call_still_queued_at_the_deadline_is_dropped():
+    unblock = threading.Event()
+    ran, finished = [], []
+
+    async def scenario():
+        breaker = CircuitBreaker(name="test", failure_threshold=5, reset_timeout=30.0)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(unblock.wait)
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await call_with_deadline(
+                        breaker, ran.append, "queued", timeout=0.05, executor=executor, on_finished=lambda: finished.append(1)
+                    )
+                await asyncio.sleep(0.01)
+                assert finished == [1]
+            finally:
+                unblock.set()
+        assert ran == []
+
+    asyncio.run(scenario())
+
+
+def test_open_breaker_finishes_without_running(monkeypatch):
+    breaker, _ = _breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+    finished = []
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(CircuitOpenError):
+                await call_with_deadline(breaker, print, timeout=1, executor=executor, on_finished=lambda: finished.append(1))
+
+    asyncio.run(scenario())
+    assert finished == [1]
@@ -0,0 +1,42 @@
+import pytest
+
+from app.core.config import settings
+from app.services.sentiment import LexiconSentimentEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_NEGATION_WINDOW", 3)
+    lexicon = tmp_path / "lexicon.csv"
+    lexicon.write_text("word,polarity\ngain,positive\ngains,positive\nloss,negative\nrisk,negative\n")
+    return LexiconSentimentEngine(str(lexicon))
+
+
+def test_positive_word(engine):
+    result = engine.score("Quarterly gains beat estimates")
+    assert (result["positive_mentions"], result["negative_mentions"]) == (1, 0)
+    assert result["score"] > 0
+
+
+def test_negated_positive_word_counts_as_negative(engine):
+    result = engine.score("The company did not gain market share")
+    assert (result["positive_mentions"], result["negative_mentions"]) == (0, 1)
+    assert result["score"] < 0
+
+
+def test_negation_stops_at_clause_end(engine):
+    result = engine.score("Not a great quarter, but gains held")
+    assert (result["positive_mentions"], result["negative_mentions"]) == (1, 0)
+
+
+def test_negation_window(engine):
+    assert engine.score("no sign at all of any gain")["positive_mentions"] == 1
+
+
+def test_whole_words_only(engine):
+    assert engine.score("A brisk session")["negative_mentions"] == 0
+
+
+def test_batch_matches_single_scores(engine):
+    texts = ["Quarterly gains", "did not gain", "", "risk of loss"]
+    assert engine.score_batch(texts) == [engine.score(text) for text in texts]
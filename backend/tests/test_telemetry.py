@@ -0,0 +1,82 @@
+import asyncio
+
+from app.services.telemetry import Counter, Histogram, MetricsRegistry, Telemetry
+
+
+def test_counter_renders_labelled_series():
+    counter = Counter("calls_total", "Calls", ("agent",))
+    counter.inc(agent="news")
+    counter.inc(2, agent="news")
+    counter.inc(agent="market")
+
+    assert counter.render() == [
+        "# HELP calls_total Calls",
+        "# TYPE calls_total counter",
+        'calls_total{agent="market"} 1',
+        'calls_total{agent="news"} 3'
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 3.65" in lines
+    assert "latency_seconds_count 4" in lines
+
+
+def test_registry_returns_the_existing_metric():
+    registry = MetricsRegistry()
+    first = registry.counter("jobs_total", "Jobs")
+    assert registry.counter("jobs_total", "Jobs") is first
+
+    first.inc()
+    assert "jobs_total 1" in registry.render()
+
+
+def test_request_summary_aggregates_calls_fetches_and_admission():
+    telemetry = Telemetry()
+
+    with telemetry.collect() as request:
+        call = telemetry.agent_call("news", "AAPL")
+        call.record_llm("fast-model", 0.2, 1.5, {"input_tokens": 100, "output_tokens": 20})
+        call.finish()
+        telemetry.agent_call("market", "AAPL").finish(TimeoutError())
+        telemetry.cache_hit("market", "MSFT")
+        with telemetry.fetch("news"):
+            pass
+        telemetry.admission("interactive", 0.5, admitted=True)
+
+    outside = telemetry.agent_call("news")
+    outside.finish()
+    summary = request.summary()
+
+    assert len(summary["calls"]) == 3
+    assert summary["llm_ms"] == 1500.0
+    assert summary["queue_wait_ms"] == 200.0
+    assert summary["admission_wait_ms"] == 500.0
+    assert set(summary["fetch_ms"]) == {"news"}
+    assert (summary["prompt_tokens"], summary["completion_tokens"]) == (100, 20)
+    assert (summary["cache_hits"], summary["cache_misses"]) == (1, 2)
+    assert summary["errors"] == {"TimeoutError": 1}
+
+
+def test_child_tasks_report_to_the_request():
+    telemetry = Telemetry()
+
+    async def analyze(ticker):
+        telemetry.cache_hit("market", ticker)
+
+    async def scenario():
+        with telemetry.collect() as request:
+            await asyncio.gather(analyze("AAPL"), analyze("MSFT"))
+        return request
+
+    request = asyncio.run(scenario())
+    assert sorted(call["ticker"] for call in request.summary()["calls"]) == ["AAPL", "MSFT"]
@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.ticker_index import TickerIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    return TickerIndex()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Shares of $F rose after earnings", ["F"]),
+    ("Ford Motor (NYSE: F) raised its outlook", ["F"]),
+    ("Ford Motor (NYSE:F) raised its outlook", ["F"]),
+    ("Grade F for the quarter", []),
+    ("Section F of the filing", []),
+    ("Analysts cut their rating on AAPL", ["AAPL"]),
+    ("Apple unveiled a new phone", ["AAPL"]),
+    ("an apple a day", []),
+    ("SNAPPLE shipped a new flavor", [])
+])
+def test_extract(index, text, expected):
+    assert index.extract(text) == expected
+
+
+def test_ambiguous_symbol_is_not_searched_bare(index):
+    query = index.news_query("F")
+    assert '"Ford Motor"' in query
+    assert "F OR" not in query and not query.startswith("F ")
+
+
+def test_tag_keeps_existing_tickers(index):
+    articles = index.tag([
+        {"title": "$F recalls trucks"},
+        {"title": "Apple news", "tickers": ["MSFT"]}
+    ])
+    assert articles[0]["tickers"] == ["F"]
+    assert articles[1]["tickers"] == ["MSFT"]
@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.routes.news import _etag_matches, _feed_response
+from app.services import topic_feeds as topic_feeds_module
+from app.services.article_clustering import story_entries
+from app.services.topic_feeds import TOPIC_QUERIES, TopicFeed, TopicFeedMaterializer
+
+RECALL = "Tesla recalls 2 million vehicles over Autopilot defect"
+
+
+def _article(title, source, description=""):
+    return {"title": title, "source": source, "description": description, "url": f"https://{source.lower()}.example/{title}"}
+
+
+ARTICLES = [
+    _article(RECALL, "Reuters"),
+    _article("Federal Reserve holds interest rates steady", "Reuters"),
+    _article(RECALL, "Bloomberg", description="A longer description makes this version the lead"),
+    _article("Oil prices fall on demand worries", "CNBC"),
+    _article(RECALL, "CNBC")
+]
+
+
+@pytest.mark.parametrize("max_articles", [1, 2, 3, 4, 5, 50])
+def test_story_views_match_grouping_the_requested_articles(max_articles):
+    feed = TopicFeed("tech", ARTICLES)
+    items, encoded = feed.view(max_articles, stories=True)
+
+    assert items == story_entries(ARTICLES[:max_articles])
+    assert len(encoded) == len(items)
+
+
+def test_views_do_not_group_stories_on_request(monkeypatch):
+    feed = TopicFeed("tech", ARTICLES)
+
+    def fail(articles):
+        raise AssertionError("stories grouped while serving")
+
+    monkeypatch.setattr(topic_feeds_module, "cluster_stories", fail)
+
+    items, _ = feed.view(3, stories=True)
+    articles, encoded = feed.view(2, stories=False)
+
+    assert [item["story_size"] for item in items] == [2, 1]
+    assert articles == ARTICLES[:2]
+    assert len(encoded) == 2
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Stub NewsAPI and the local index; returns the topics fetched from each."""
+    fetched = {"upstream": [], "local": [], "local_results": 20, "remaining": 100}
+    queries = {query: topic for topic, query in TOPIC_QUERIES.items()}
+
+    async def get_stock_news(query, days_back, max_articles, refresh):
+        assert refresh
+        fetched["upstream"].append(queries[query])
+        return [_article(f"{query} upstream", "Reuters")]
+
+    async def search(query, since, limit):
+        fetched["local"].append(queries[query])
+        return [_article(f"{query} local {i}", "Reuters") for i in range(fetched["local_results"])]
+
+    monkeypatch.setattr(settings, "NEWS_API_QUOTA_RESERVE", 10)
+    monkeypatch.setattr(settings, "NEWS_INDEX_MIN_RESULTS", 10)
+    monkeypatch.setattr(topic_feeds_module.news_service, "get_stock_news", get_stock_news)
+    monkeypatch.setattr(topic_feeds_module.news_service.quota, "remaining", lambda: fetched["remaining"])
+    monkeypatch.setattr(topic_feeds_module.news_index, "search", search)
+    return fetched
+
+
+def test_topics_take_turns_within_the_cycle_budget(sources, monkeypatch):
+    materializer = TopicFeedMaterializer()
+    monkeypatch.setattr(materializer, "cycle_budget", lambda: 1.5)
+    topics = list(TOPIC_QUERIES)
+
+    async def scenario():
+        return [await materializer.run_once() for _ in range(3)]
+
+    runs = asyncio.run(scenario())
+
+    assert [run["requests"] for run in runs] == [1, 2, 1]
+    assert sources["upstream"] == topics[:4]
+    assert all(run["builds"] + run["unchanged"] == len(topics) for run in runs)
+
+
+def test_cycle_budget_spreads_the_quota_share(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_API_DAILY_QUOTA", 480)
+    monkeypatch.setattr(settings, "TOPIC_FEED_QUOTA_SHARE", 0.25)
+    monkeypatch.setattr(settings, "TOPIC_FEED_REFRESH_MINUTES", 30)
+    assert TopicFeedMaterializer().cycle_budget() == 2.5
+
+
+def test_no_requests_at_the_quota_reserve(sources, monkeypatch):
+    sources["remaining"] = 10
+    materializer = TopicFeedMaterializer()
+    monkeypatch.setattr(materializer, "cycle_budget", lambda: 5)
+
+    stats = asyncio.run(materializer.run_once())
+
+    assert stats["requests"] == 0
+    assert sources["upstream"] == []
+    assert stats["builds"] == len(TOPIC_QUERIES)
+
+
+def test_thin_local_results_keep_the_existing_feed(sources, monkeypatch):
+    materializer = TopicFeedMaterializer()
+    monkeypatch.setattr(materializer, "cycle_budget", lambda: 0)
+
+    async def scenario():
+        await materializer.run_once()
+        sources["local_results"] = 3
+        return await materializer.run_once()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["skipped"] == len(TOPIC_QUERIES)
+    feed = materializer.get("tech", settings.TOPIC_FEED_DAYS_BACK, 10)
+    assert len(feed.articles) == 20
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"abcd"', False),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"ab"', False),
+])
+def test_etag_matches(header, matches):
+    assert _etag_matches(header, '"abc"') is matches
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+def test_feed_response_answers_a_matching_etag_with_304():
+    feed = TopicFeed("tech", ARTICLES)
+
+    first = _feed_response(_request(), feed, "fp", None, 5, 5, "json", False)
+    repeat = _feed_response(_request(first.headers["etag"]), feed, "fp", None, 5, 5, "json", False)
+    other_page = _feed_response(_request(first.headers["etag"]), feed, "fp", None, 5, 2, "json", False)
+
+    assert first.status_code == 200
+    assert repeat.status_code == 304
+    assert repeat.body == b""
+    assert other_page.status_code == 200
+
+
+def test_feed_etag_changes_with_the_content():
+    feed = TopicFeed("tech", ARTICLES)
+    changed = TopicFeed("tech", ARTICLES[1:])
+
+    first = _feed_response(_request(), feed, "fp", None, 5, 5, "json", False)
+    after = _feed_response(_request(first.headers["etag"]), changed, "fp", None, 5, 5, "json", False)
+
+    assert after.status_code == 200
+    assert after.headers["etag"] != first.headers["etag"]
@@ -1,8 +1,10 @@
 import streamlit as st
 import requests
+import time
 import os
 
 API_BASE_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+JOB_POLL_INTERVAL_SECONDS = 1.5
 
 
 def get_headers() -> dict:
@@ -12,25 +14,53 @@ def get_headers() -> dict:
     return {}
 
 
-def request_ai_analysis(tickers: list, query_type: str, additional_context: str = None):
-    """Request AI analysis from backend."""
+def request_ai_analysis(tickers: list, query_type: str, additional_context: str = None, depth: str = "standard"):
+    """Submit an AI analysis job to the backend and poll until it finishes."""
     try:
         response = requests.post(
-            f"{API_BASE_URL}/api/insights/analyze",
+            f"{API_BASE_URL}/api/insights/jobs",
             headers=get_headers(),
             json={
                 "tickers": tickers,
                 "query_type": query_type,
-                "additional_context": additional_context
+                "additional_context": additional_context,
+                "depth": depth
             }
         )
 
-        if response.status_code == 200:
-            return response.json()
-        else:
+        if response.status_code != 202:
             st.error(f"Analysis failed: {response.json().get('detail', 'Unknown error')}")
             return None
 
+        job = response.json()
+        progress_bar = st.progress(0.0, text="🤖 Analysis queued...")
+
+        while job["status"] not in ("completed", "failed"):
+            time.sleep(JOB_POLL_INTERVAL_SECONDS)
+            response = requests.get(
+                f"{API_BASE_URL}/api/insights/jobs/{job['job_id']}",
+                headers=get_headers()
+            )
+            if response.status_code != 200:
+                st.error(f"Analysis failed: {response.json().get('detail', 'Unknown error')}")
+                return None
+
+            job = response.json()
+            total = job.get("progress_total") or len(tickers)
+            completed = job.get("progress_completed", 0)
+            progress_bar.progress(
+                min(completed / total, 1.0),
+                text=f"🤖 AI agents are analyzing... {completed}/{total} tickers"
+            )
+
+        progress_bar.empty()
+
+        if job["status"] == "failed":
+            st.error(f"Analysis failed: {job.get('error') or 'Unknown error'}")
+            return None
+
+        return job["result"]
+
     except Exception as e:
         st.error(f"Error requesting analysis: {e}")
         return None
@@ -73,6 +103,15 @@ def render_insights():
             format_func=lambda x: x.replace("_", " ").title()
         )
 
+    depth = st.radio(
+        "Analysis Depth",
+        ["quick", "standard", "deep"],
+        index=1,
+        horizontal=True,
+        format_func=str.title,
+        help="Quick uses the fastest model; deep uses the most capable model when it is responsive"
+    )
+
     additional_context = st.text_area(
         "Additional Context (Optional)",
         placeholder="Any specific questions or context for the analysis..."
@@ -91,12 +130,14 @@ def render_insights():
             st.warning("Maximum 10 tickers allowed")
             return
 
-        with st.spinner("🤖 AI agents are analyzing... This may take 30-60 seconds..."):
-            result = request_ai_analysis(tickers, query_type, additional_context)
+        result = request_ai_analysis(tickers, query_type, additional_context, depth)
 
         if result:
             st.success("✅ Analysis Complete!")
 
+            if result.get("degraded"):
+                st.warning("⚡ AI agents were slow or unavailable; some insights come from the fast local analyzer.")
+
             st.markdown("### 📊 Analysis Summary")
 
             col1, col2, col3 = st.columns(3)
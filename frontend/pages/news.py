@@ -1,18 +1,29 @@
 import streamlit as st
 import requests
 from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
+import json
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app import API_BASE_URL, get_headers
 
+NEWS_PAGE_SIZE = 10  # Articles per streamed page
+
 
 def render_news():
     """Render financial news page."""
     st.title("📰 Financial News")
     st.markdown("### Real-time Financial & Market News")
 
+    group_stories = st.checkbox(
+        "Group coverage of the same story",
+        value=True,
+        key="news_group_stories",
+        help="Show one article per story, with other outlets' versions listed under it"
+    )
+
     # Create tabs for different news sections
     tab1, tab2, tab3 = st.tabs(["📊 Top Financial News", "🔍 Search News", "📂 Topics"])
 
@@ -31,10 +42,10 @@ def render_news():
             max_articles = st.slider("Articles", 10, 50, 30, key="news_max")
 
         if st.button("🔄 Refresh News", type="primary"):
-            fetch_and_display_financial_news(category, max_articles)
+            fetch_and_display_financial_news(category, max_articles, group_stories)
         else:
             # Auto-load on page open
-            fetch_and_display_financial_news(category, max_articles)
+            fetch_and_display_financial_news(category, max_articles, group_stories)
 
     # Tab 2: Search News
     with tab2:
@@ -51,7 +62,7 @@ def render_news():
             days_back = st.selectbox("Time Range", [7, 14, 30], key="news_days_back")
 
         if st.button("🔍 Search", type="primary") and search_query:
-            fetch_and_display_search_results(search_query, days_back)
+            fetch_and_display_search_results(search_query, days_back, group_stories)
 
     # Tab 3: Topic Categories
     with tab3:
@@ -103,87 +114,101 @@ def render_news():
 
         if selected_topic:
             st.markdown(f"### News for: **{selected_topic.upper()}**")
-            fetch_and_display_topic_news(selected_topic)
+            fetch_and_display_topic_news(selected_topic, group_stories)
+
+
+def stream_news_articles(path: str, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield articles from a news endpoint as they arrive.
+
+    Pages are requested as NDJSON streams and followed by cursor until the
+    last page, so the first articles can be shown before the rest are sent.
+    Unless ``params`` sets ``stories`` to False, articles come grouped into
+    stories: one lead article per story, with the other outlets' versions
+    under ``alternates``.
+    """
+    cursor: Optional[str] = None
+    while True:
+        page_params = {"stories": True, **params, "limit": NEWS_PAGE_SIZE, "format": "ndjson"}
+        if cursor:
+            page_params["cursor"] = cursor
+
+        with requests.get(
+            f"{API_BASE_URL}{path}", headers=get_headers(), params=page_params, stream=True
+        ) as response:
+            response.raise_for_status()
+            cursor = None
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                item = json.loads(line)
+                if set(item) == {"next_cursor"}:
+                    cursor = item["next_cursor"]
+                else:
+                    yield item
 
+        if not cursor:
+            return
 
-def fetch_and_display_financial_news(category: str, max_articles: int):
+
+def fetch_and_display_financial_news(category: str, max_articles: int, stories: bool = True):
     """Fetch and display general financial news."""
     try:
-        with st.spinner("Fetching latest financial news..."):
-            response = requests.get(
-                f"{API_BASE_URL}/api/news/financial",
-                headers=get_headers(),
-                params={"category": category, "max_articles": max_articles}
-            )
-
-        if response.status_code == 200:
-            articles = response.json()
-
-            if articles:
-                st.success(f"✅ Found {len(articles)} articles")
-                display_news_articles(articles)
-            else:
-                st.warning("No articles found. Try refreshing or changing the category.")
-        else:
-            st.error(f"Error fetching news: {response.status_code}")
-
+        articles = stream_news_articles(
+            "/api/news/financial", {"category": category, "max_articles": max_articles, "stories": stories}
+        )
+        if not display_news_articles(articles, stories):
+            st.warning("No articles found. Try refreshing or changing the category.")
+
+    except requests.HTTPError as e:
+        st.error(f"Error fetching news: {e.response.status_code}")
     except Exception as e:
         st.error(f"Error: {str(e)}")
 
 
-def fetch_and_display_search_results(query: str, days_back: int):
+def fetch_and_display_search_results(query: str, days_back: int, stories: bool = True):
     """Fetch and display search results."""
     try:
-        with st.spinner(f"Searching for '{query}'..."):
-            response = requests.get(
-                f"{API_BASE_URL}/api/news/search",
-                headers=get_headers(),
-                params={"query": query, "days_back": days_back, "max_articles": 20}
-            )
-
-        if response.status_code == 200:
-            articles = response.json()
-
-            if articles:
-                st.success(f"✅ Found {len(articles)} articles for '{query}'")
-                display_news_articles(articles)
-            else:
-                st.warning(f"No articles found for '{query}'. Try a different search term.")
-        else:
-            st.error(f"Error searching news: {response.status_code}")
-
+        articles = stream_news_articles(
+            "/api/news/search", {"query": query, "days_back": days_back, "max_articles": 20, "stories": stories}
+        )
+        if not display_news_articles(articles, stories):
+            st.warning(f"No articles found for '{query}'. Try a different search term.")
+
+    except requests.HTTPError as e:
+        st.error(f"Error searching news: {e.response.status_code}")
     except Exception as e:
         st.error(f"Error: {str(e)}")
 
 
-def fetch_and_display_topic_news(topic: str):
+def fetch_and_display_topic_news(topic: str, stories: bool = True):
     """Fetch and display news for a specific topic."""
     try:
-        with st.spinner(f"Loading {topic} news..."):
-            response = requests.get(
-                f"{API_BASE_URL}/api/news/topics/{topic}",
-                headers=get_headers(),
-                params={"days_back": 7, "max_articles": 20}
-            )
-
-        if response.status_code == 200:
-            articles = response.json()
-
-            if articles:
-                st.success(f"✅ Found {len(articles)} articles")
-                display_news_articles(articles)
-            else:
-                st.warning(f"No articles found for {topic}.")
-        else:
-            st.error(f"Error fetching topic news: {response.status_code}")
-
+        articles = stream_news_articles(
+            f"/api/news/topics/{topic}", {"days_back": 7, "max_articles": 20, "stories": stories}
+        )
+        if not display_news_articles(articles, stories):
+            st.warning(f"No articles found for {topic}.")
+
+    except requests.HTTPError as e:
+        st.error(f"Error fetching topic news: {e.response.status_code}")
     except Exception as e:
         st.error(f"Error: {str(e)}")
 
 
-def display_news_articles(articles: list):
-    """Display news articles in a nice format."""
-    for i, article in enumerate(articles):
+def display_news_articles(articles: Iterable[Dict[str, Any]], stories: bool = True) -> int:
+    """
+    Display news articles in a nice format, each as soon as it arrives.
+
+    Args:
+        articles: Articles, or story leads when ``stories`` is set
+        stories: Whether the articles are grouped into stories
+
+    Returns:
+        Number of articles (stories) displayed
+    """
+    count = 0
+    for count, article in enumerate(articles, 1):
         with st.container():
             # Create article card
             st.markdown("---")
@@ -222,12 +247,24 @@ def display_news_articles(articles: list):
             if url:
                 st.markdown(f"[🔗 Read full article]({url})")
 
+            # Same story from other outlets
+            alternates = article.get("alternates") or []
+            if alternates:
+                links = [
+                    f"[{alternate.get('source') or 'Unknown'}]({alternate['url']})" if alternate.get("url")
+                    else alternate.get("source") or "Unknown"
+                    for alternate in alternates
+                ]
+                st.caption(f"Also covered by: {' · '.join(links)}")
+
             # Add some spacing
             st.markdown("")
 
     # Show total count
-    st.markdown("---")
-    st.info(f"📊 Total articles displayed: {len(articles)}")
+    if count:
+        st.markdown("---")
+        st.info(f"📊 Total {'stories' if stories else 'articles'} displayed: {count}")
+    return count
 
 
 if __name__ == "__main__":